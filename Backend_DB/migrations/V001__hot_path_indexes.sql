@@ -0,0 +1,38 @@
+-- V001: secondary indexes for the app's hot access paths
+-- Apply with:  python -m adventureguard.migrations
+
+-- Dashboard "Latest Injuries": ORDER BY InjuryDate DESC LIMIT 5.
+-- (InjuryDate, ActivityID, Severity) + the PK (ParticipantID, InjuryName)
+-- covers every selected column, so it is a backwards index range read.
+CREATE INDEX idx_injury_date_recent
+    ON Injury (InjuryDate, ActivityID, Severity);
+
+-- Dashboard severity chart (GROUP BY Severity) and
+-- proc_list_injuries_by_severity (WHERE Severity = ?).
+CREATE INDEX idx_injury_severity
+    ON Injury (Severity);
+
+-- Dashboard "Recent Maintenance Logs": ORDER BY MaintDate DESC LIMIT 5,
+-- covering EquipmentID, Technician and Cost.
+CREATE INDEX idx_maint_date_recent
+    ON MaintenanceLog (MaintDate, EquipmentID, Technician, Cost);
+
+-- fn_total_maintenance_cost / proc_equipment_maintenance_summary and
+-- Complex Query 3: SUM(Cost) ... WHERE/JOIN EquipmentID.
+CREATE INDEX idx_maint_equipment_cost
+    ON MaintenanceLog (EquipmentID, Cost);
+
+-- Dashboard equipment status pie (GROUP BY Status).
+CREATE INDEX idx_equipment_status
+    ON Equipment (Status);
+
+-- fn_total_participants_in_activity and Complex Query 1:
+-- WHERE ActivityID = ? AND PaymentStatus = 'Yes'; ParticipantID rides
+-- along from the PK, so COUNT(ParticipantID) never touches the row.
+CREATE INDEX idx_registers_activity_paid
+    ON Registers (ActivityID, PaymentStatus);
+
+-- fn_average_instructor_rating and Complex Query 4:
+-- AVG(RatingValue) ... WHERE/JOIN InstructorID.
+CREATE INDEX idx_rating_instructor_value
+    ON Rating (InstructorID, RatingValue);
@@ -0,0 +1,371 @@
+-- V002: trigger-maintained aggregate tables behind the fn_* functions
+-- Apply with:  python -m adventureguard.migrations
+--
+-- fn_total_maintenance_cost, fn_average_instructor_rating,
+-- fn_total_participants_in_activity and fn_injury_count_for_participant used
+-- to rescan their base table on every call. They now read one row from a
+-- summary table that the triggers below keep in step on INSERT/UPDATE/DELETE.
+-- proc_check_aggregates(FALSE) reports drift; proc_check_aggregates(TRUE)
+-- also rebuilds the summaries from the base tables.
+
+CREATE TABLE EquipmentMaintenanceStats (
+    EquipmentID INT PRIMARY KEY,
+    TotalCost DECIMAL(14,2) NOT NULL DEFAULT 0,
+    LogCount INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (EquipmentID) REFERENCES Equipment(EquipmentID)
+);
+
+CREATE TABLE InstructorRatingStats (
+    InstructorID INT PRIMARY KEY,
+    RatingSum INT NOT NULL DEFAULT 0,
+    RatingCount INT NOT NULL DEFAULT 0,      -- non-NULL ratings only, like AVG()
+    FOREIGN KEY (InstructorID) REFERENCES Instructor(InstructorID)
+);
+
+CREATE TABLE ActivityParticipantStats (
+    ActivityID INT PRIMARY KEY,
+    PaidCount INT NOT NULL DEFAULT 0,
+    TotalCount INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (ActivityID) REFERENCES Activity(ActivityID)
+);
+
+CREATE TABLE ParticipantInjuryStats (
+    ParticipantID INT PRIMARY KEY,
+    InjuryCount INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (ParticipantID) REFERENCES Participant(ParticipantID)
+);
+
+
+-- Initial build
+INSERT INTO EquipmentMaintenanceStats (EquipmentID, TotalCost, LogCount)
+SELECT EquipmentID, IFNULL(SUM(Cost), 0), COUNT(*)
+FROM MaintenanceLog GROUP BY EquipmentID;
+
+INSERT INTO InstructorRatingStats (InstructorID, RatingSum, RatingCount)
+SELECT InstructorID, IFNULL(SUM(RatingValue), 0), COUNT(RatingValue)
+FROM Rating GROUP BY InstructorID;
+
+INSERT INTO ActivityParticipantStats (ActivityID, PaidCount, TotalCount)
+SELECT ActivityID, SUM(PaymentStatus = 'Yes'), COUNT(*)
+FROM Registers GROUP BY ActivityID;
+
+INSERT INTO ParticipantInjuryStats (ParticipantID, InjuryCount)
+SELECT ParticipantID, COUNT(*)
+FROM Injury GROUP BY ParticipantID;
+
+
+
+-- ======================================================
+-- MaintenanceLog -> EquipmentMaintenanceStats
+-- ======================================================
+DELIMITER $$
+
+CREATE TRIGGER trg_agg_maintenance_insert
+AFTER INSERT ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    INSERT INTO EquipmentMaintenanceStats (EquipmentID, TotalCost, LogCount)
+    VALUES (NEW.EquipmentID, IFNULL(NEW.Cost, 0), 1)
+    ON DUPLICATE KEY UPDATE
+        TotalCost = TotalCost + IFNULL(NEW.Cost, 0),
+        LogCount = LogCount + 1;
+END$$
+
+CREATE TRIGGER trg_agg_maintenance_update
+AFTER UPDATE ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.EquipmentID <=> NEW.EquipmentID AND OLD.Cost <=> NEW.Cost) THEN
+        UPDATE EquipmentMaintenanceStats
+        SET TotalCost = TotalCost - IFNULL(OLD.Cost, 0),
+            LogCount = LogCount - 1
+        WHERE EquipmentID = OLD.EquipmentID;
+
+        INSERT INTO EquipmentMaintenanceStats (EquipmentID, TotalCost, LogCount)
+        VALUES (NEW.EquipmentID, IFNULL(NEW.Cost, 0), 1)
+        ON DUPLICATE KEY UPDATE
+            TotalCost = TotalCost + IFNULL(NEW.Cost, 0),
+            LogCount = LogCount + 1;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_agg_maintenance_delete
+AFTER DELETE ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    UPDATE EquipmentMaintenanceStats
+    SET TotalCost = TotalCost - IFNULL(OLD.Cost, 0),
+        LogCount = LogCount - 1
+    WHERE EquipmentID = OLD.EquipmentID;
+END$$
+
+DELIMITER ;
+
+
+
+-- ======================================================
+-- Rating -> InstructorRatingStats
+-- ======================================================
+DELIMITER $$
+
+CREATE TRIGGER trg_agg_rating_insert
+AFTER INSERT ON Rating
+FOR EACH ROW
+BEGIN
+    INSERT INTO InstructorRatingStats (InstructorID, RatingSum, RatingCount)
+    VALUES (NEW.InstructorID, IFNULL(NEW.RatingValue, 0), NEW.RatingValue IS NOT NULL)
+    ON DUPLICATE KEY UPDATE
+        RatingSum = RatingSum + IFNULL(NEW.RatingValue, 0),
+        RatingCount = RatingCount + (NEW.RatingValue IS NOT NULL);
+END$$
+
+CREATE TRIGGER trg_agg_rating_update
+AFTER UPDATE ON Rating
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.InstructorID <=> NEW.InstructorID AND OLD.RatingValue <=> NEW.RatingValue) THEN
+        UPDATE InstructorRatingStats
+        SET RatingSum = RatingSum - IFNULL(OLD.RatingValue, 0),
+            RatingCount = RatingCount - (OLD.RatingValue IS NOT NULL)
+        WHERE InstructorID = OLD.InstructorID;
+
+        INSERT INTO InstructorRatingStats (InstructorID, RatingSum, RatingCount)
+        VALUES (NEW.InstructorID, IFNULL(NEW.RatingValue, 0), NEW.RatingValue IS NOT NULL)
+        ON DUPLICATE KEY UPDATE
+            RatingSum = RatingSum + IFNULL(NEW.RatingValue, 0),
+            RatingCount = RatingCount + (NEW.RatingValue IS NOT NULL);
+    END IF;
+END$$
+
+CREATE TRIGGER trg_agg_rating_delete
+AFTER DELETE ON Rating
+FOR EACH ROW
+BEGIN
+    UPDATE InstructorRatingStats
+    SET RatingSum = RatingSum - IFNULL(OLD.RatingValue, 0),
+        RatingCount = RatingCount - (OLD.RatingValue IS NOT NULL)
+    WHERE InstructorID = OLD.InstructorID;
+END$$
+
+DELIMITER ;
+
+
+
+-- ======================================================
+-- Registers -> ActivityParticipantStats
+-- ======================================================
+DELIMITER $$
+
+CREATE TRIGGER trg_agg_registers_insert
+AFTER INSERT ON Registers
+FOR EACH ROW
+BEGIN
+    INSERT INTO ActivityParticipantStats (ActivityID, PaidCount, TotalCount)
+    VALUES (NEW.ActivityID, NEW.PaymentStatus = 'Yes', 1)
+    ON DUPLICATE KEY UPDATE
+        PaidCount = PaidCount + (NEW.PaymentStatus = 'Yes'),
+        TotalCount = TotalCount + 1;
+END$$
+
+CREATE TRIGGER trg_agg_registers_update
+AFTER UPDATE ON Registers
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.ActivityID <=> NEW.ActivityID AND OLD.PaymentStatus <=> NEW.PaymentStatus) THEN
+        UPDATE ActivityParticipantStats
+        SET PaidCount = PaidCount - (OLD.PaymentStatus = 'Yes'),
+            TotalCount = TotalCount - 1
+        WHERE ActivityID = OLD.ActivityID;
+
+        INSERT INTO ActivityParticipantStats (ActivityID, PaidCount, TotalCount)
+        VALUES (NEW.ActivityID, NEW.PaymentStatus = 'Yes', 1)
+        ON DUPLICATE KEY UPDATE
+            PaidCount = PaidCount + (NEW.PaymentStatus = 'Yes'),
+            TotalCount = TotalCount + 1;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_agg_registers_delete
+AFTER DELETE ON Registers
+FOR EACH ROW
+BEGIN
+    UPDATE ActivityParticipantStats
+    SET PaidCount = PaidCount - (OLD.PaymentStatus = 'Yes'),
+        TotalCount = TotalCount - 1
+    WHERE ActivityID = OLD.ActivityID;
+END$$
+
+DELIMITER ;
+
+
+
+-- ======================================================
+-- Injury -> ParticipantInjuryStats
+-- ======================================================
+DELIMITER $$
+
+CREATE TRIGGER trg_agg_injury_insert
+AFTER INSERT ON Injury
+FOR EACH ROW
+BEGIN
+    INSERT INTO ParticipantInjuryStats (ParticipantID, InjuryCount)
+    VALUES (NEW.ParticipantID, 1)
+    ON DUPLICATE KEY UPDATE InjuryCount = InjuryCount + 1;
+END$$
+
+CREATE TRIGGER trg_agg_injury_update
+AFTER UPDATE ON Injury
+FOR EACH ROW
+BEGIN
+    IF OLD.ParticipantID <> NEW.ParticipantID THEN
+        UPDATE ParticipantInjuryStats
+        SET InjuryCount = InjuryCount - 1
+        WHERE ParticipantID = OLD.ParticipantID;
+
+        INSERT INTO ParticipantInjuryStats (ParticipantID, InjuryCount)
+        VALUES (NEW.ParticipantID, 1)
+        ON DUPLICATE KEY UPDATE InjuryCount = InjuryCount + 1;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_agg_injury_delete
+AFTER DELETE ON Injury
+FOR EACH ROW
+BEGIN
+    UPDATE ParticipantInjuryStats
+    SET InjuryCount = InjuryCount - 1
+    WHERE ParticipantID = OLD.ParticipantID;
+END$$
+
+DELIMITER ;
+
+
+
+-- ======================================================
+-- fn_* functions now read the summary tables: O(1) per call
+-- ======================================================
+DROP FUNCTION IF EXISTS fn_total_maintenance_cost;
+DROP FUNCTION IF EXISTS fn_average_instructor_rating;
+DROP FUNCTION IF EXISTS fn_total_participants_in_activity;
+DROP FUNCTION IF EXISTS fn_injury_count_for_participant;
+
+DELIMITER $$
+
+CREATE FUNCTION fn_total_maintenance_cost(p_equipment_id INT)
+RETURNS DECIMAL(10,2)
+DETERMINISTIC
+BEGIN
+    DECLARE v_total DECIMAL(10,2);
+
+    SELECT TotalCost
+    INTO v_total
+    FROM EquipmentMaintenanceStats
+    WHERE EquipmentID = p_equipment_id;
+
+    RETURN IFNULL(v_total, 0);
+END$$
+
+CREATE FUNCTION fn_average_instructor_rating(p_instructor_id INT)
+RETURNS DECIMAL(3,2)
+DETERMINISTIC
+BEGIN
+    DECLARE v_avg DECIMAL(3,2);
+    SELECT ROUND(RatingSum / NULLIF(RatingCount, 0), 2)
+    INTO v_avg
+    FROM InstructorRatingStats
+    WHERE InstructorID = p_instructor_id;
+    RETURN IFNULL(v_avg, 0);
+END$$
+
+CREATE FUNCTION fn_total_participants_in_activity(p_activity_id INT)
+RETURNS INT
+DETERMINISTIC
+BEGIN
+    DECLARE v_count INT;
+    SELECT PaidCount INTO v_count
+    FROM ActivityParticipantStats
+    WHERE ActivityID = p_activity_id;
+    RETURN IFNULL(v_count, 0);
+END$$
+
+CREATE FUNCTION fn_injury_count_for_participant(p_participant_id INT)
+RETURNS INT
+DETERMINISTIC
+BEGIN
+    DECLARE v_count INT;
+    SELECT InjuryCount INTO v_count
+    FROM ParticipantInjuryStats
+    WHERE ParticipantID = p_participant_id;
+    RETURN IFNULL(v_count, 0);
+END$$
+
+DELIMITER ;
+
+
+
+-- ======================================================
+-- Consistency check / repair
+-- ======================================================
+DELIMITER $$
+
+CREATE PROCEDURE proc_check_aggregates(IN p_repair BOOLEAN)
+BEGIN
+    -- Rows whose summary disagrees with a fresh GROUP BY over the base table
+    SELECT 'EquipmentMaintenanceStats' AS SummaryTable, COUNT(*) AS DriftedRows
+    FROM Equipment e
+    LEFT JOIN (SELECT EquipmentID, SUM(Cost) AS c, COUNT(*) AS n
+               FROM MaintenanceLog GROUP BY EquipmentID) t ON t.EquipmentID = e.EquipmentID
+    LEFT JOIN EquipmentMaintenanceStats s ON s.EquipmentID = e.EquipmentID
+    WHERE IFNULL(t.c, 0) <> IFNULL(s.TotalCost, 0) OR IFNULL(t.n, 0) <> IFNULL(s.LogCount, 0)
+    UNION ALL
+    SELECT 'InstructorRatingStats', COUNT(*)
+    FROM Instructor i
+    LEFT JOIN (SELECT InstructorID, SUM(RatingValue) AS v, COUNT(RatingValue) AS n
+               FROM Rating GROUP BY InstructorID) t ON t.InstructorID = i.InstructorID
+    LEFT JOIN InstructorRatingStats s ON s.InstructorID = i.InstructorID
+    WHERE IFNULL(t.v, 0) <> IFNULL(s.RatingSum, 0) OR IFNULL(t.n, 0) <> IFNULL(s.RatingCount, 0)
+    UNION ALL
+    SELECT 'ActivityParticipantStats', COUNT(*)
+    FROM Activity a
+    LEFT JOIN (SELECT ActivityID, SUM(PaymentStatus = 'Yes') AS paid, COUNT(*) AS n
+               FROM Registers GROUP BY ActivityID) t ON t.ActivityID = a.ActivityID
+    LEFT JOIN ActivityParticipantStats s ON s.ActivityID = a.ActivityID
+    WHERE IFNULL(t.paid, 0) <> IFNULL(s.PaidCount, 0) OR IFNULL(t.n, 0) <> IFNULL(s.TotalCount, 0)
+    UNION ALL
+    SELECT 'ParticipantInjuryStats', COUNT(*)
+    FROM Participant p
+    LEFT JOIN (SELECT ParticipantID, COUNT(*) AS n
+               FROM Injury GROUP BY ParticipantID) t ON t.ParticipantID = p.ParticipantID
+    LEFT JOIN ParticipantInjuryStats s ON s.ParticipantID = p.ParticipantID
+    WHERE IFNULL(t.n, 0) <> IFNULL(s.InjuryCount, 0);
+
+    IF p_repair THEN
+        START TRANSACTION;
+
+        DELETE FROM EquipmentMaintenanceStats;
+        INSERT INTO EquipmentMaintenanceStats (EquipmentID, TotalCost, LogCount)
+        SELECT EquipmentID, IFNULL(SUM(Cost), 0), COUNT(*)
+        FROM MaintenanceLog GROUP BY EquipmentID;
+
+        DELETE FROM InstructorRatingStats;
+        INSERT INTO InstructorRatingStats (InstructorID, RatingSum, RatingCount)
+        SELECT InstructorID, IFNULL(SUM(RatingValue), 0), COUNT(RatingValue)
+        FROM Rating GROUP BY InstructorID;
+
+        DELETE FROM ActivityParticipantStats;
+        INSERT INTO ActivityParticipantStats (ActivityID, PaidCount, TotalCount)
+        SELECT ActivityID, SUM(PaymentStatus = 'Yes'), COUNT(*)
+        FROM Registers GROUP BY ActivityID;
+
+        DELETE FROM ParticipantInjuryStats;
+        INSERT INTO ParticipantInjuryStats (ParticipantID, InjuryCount)
+        SELECT ParticipantID, COUNT(*)
+        FROM Injury GROUP BY ParticipantID;
+
+        COMMIT;
+
+        SELECT 'Aggregates rebuilt from base tables' AS Message;
+    END IF;
+END$$
+
+DELIMITER ;
@@ -0,0 +1,16 @@
+-- V003: name indexes for the Add Data entity pickers
+-- Apply with:  python -m adventureguard.migrations
+
+-- The pickers search with  WHERE <name> LIKE 'prefix%' ORDER BY <name> LIMIT n,
+-- which these turn into a short index range read instead of a full scan.
+CREATE INDEX idx_participant_name
+    ON Participant (Name);
+
+CREATE INDEX idx_instructor_name
+    ON Instructor (Name);
+
+CREATE INDEX idx_activity_name
+    ON Activity (ActivityName);
+
+CREATE INDEX idx_equipment_type
+    ON Equipment (EquipmentType);
@@ -0,0 +1,204 @@
+-- V004: change journal + incrementally refreshed report tables
+-- Apply with:  python -m adventureguard.migrations
+--
+-- Triggers on Registers, Injury, MaintenanceLog and Rating append the keys a
+-- change affects to ChangeJournal (append-only). adventureguard.report_refresh
+-- reads the journal past the watermark in ReportWatermark and recomputes only
+-- those keys in the Report* tables, so a refresh costs O(delta), not O(history).
+-- The Complex Queries page can read the Report* tables instead of the base
+-- tables (names are joined at read time, so renames need no refresh).
+
+CREATE TABLE ChangeJournal (
+    ChangeID BIGINT AUTO_INCREMENT PRIMARY KEY,
+    SourceTable VARCHAR(20) NOT NULL,
+    Op CHAR(1) NOT NULL,                     -- I / U / D
+    ParticipantID INT,
+    ActivityID INT,
+    InstructorID INT,
+    EquipmentID INT,
+    ChangedAt TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+);
+
+CREATE TABLE ReportWatermark (
+    Name VARCHAR(20) PRIMARY KEY,
+    LastChangeID BIGINT NOT NULL DEFAULT 0,
+    RefreshedAt TIMESTAMP(6) NULL
+);
+
+-- Per-key partials of the five Complex Queries (no FKs: the journal outlives
+-- deleted parents, and the read queries join the parent tables anyway)
+CREATE TABLE ReportActivityPaid (
+    ActivityID INT PRIMARY KEY,
+    PaidCount INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE ReportParticipantInjuries (
+    ParticipantID INT PRIMARY KEY,
+    InjuryCount INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE ReportActivityInjuries (
+    ActivityID INT PRIMARY KEY,
+    InjuryCount INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE ReportEquipmentCost (
+    EquipmentID INT PRIMARY KEY,
+    TotalCost DECIMAL(14,2) NOT NULL DEFAULT 0,
+    LogCount INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE ReportInstructorRatings (
+    InstructorID INT PRIMARY KEY,
+    RatingSum INT NOT NULL DEFAULT 0,
+    RatingCount INT NOT NULL DEFAULT 0       -- non-NULL ratings only, like AVG()
+);
+
+
+-- Initial build
+INSERT INTO ReportActivityPaid (ActivityID, PaidCount)
+SELECT ActivityID, COUNT(*) FROM Registers WHERE PaymentStatus = 'Yes' GROUP BY ActivityID;
+
+INSERT INTO ReportParticipantInjuries (ParticipantID, InjuryCount)
+SELECT ParticipantID, COUNT(*) FROM Injury GROUP BY ParticipantID;
+
+INSERT INTO ReportActivityInjuries (ActivityID, InjuryCount)
+SELECT ActivityID, COUNT(*) FROM Injury GROUP BY ActivityID;
+
+INSERT INTO ReportEquipmentCost (EquipmentID, TotalCost, LogCount)
+SELECT EquipmentID, IFNULL(SUM(Cost), 0), COUNT(*) FROM MaintenanceLog GROUP BY EquipmentID;
+
+INSERT INTO ReportInstructorRatings (InstructorID, RatingSum, RatingCount)
+SELECT InstructorID, IFNULL(SUM(RatingValue), 0), COUNT(RatingValue) FROM Rating GROUP BY InstructorID;
+
+INSERT INTO ReportWatermark (Name, LastChangeID, RefreshedAt) VALUES ('reports', 0, NOW(6));
+
+
+
+-- ======================================================
+-- Journal triggers (updates are journaled only when a
+-- column the reports use changes)
+-- ======================================================
+DELIMITER $$
+
+CREATE TRIGGER trg_journal_registers_insert
+AFTER INSERT ON Registers
+FOR EACH ROW
+BEGIN
+    INSERT INTO ChangeJournal (SourceTable, Op, ParticipantID, ActivityID)
+    VALUES ('Registers', 'I', NEW.ParticipantID, NEW.ActivityID);
+END$$
+
+CREATE TRIGGER trg_journal_registers_update
+AFTER UPDATE ON Registers
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.ActivityID <=> NEW.ActivityID AND OLD.PaymentStatus <=> NEW.PaymentStatus) THEN
+        INSERT INTO ChangeJournal (SourceTable, Op, ParticipantID, ActivityID)
+        VALUES ('Registers', 'U', NEW.ParticipantID, NEW.ActivityID);
+        IF NOT (OLD.ActivityID <=> NEW.ActivityID) THEN
+            INSERT INTO ChangeJournal (SourceTable, Op, ParticipantID, ActivityID)
+            VALUES ('Registers', 'U', OLD.ParticipantID, OLD.ActivityID);
+        END IF;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_journal_registers_delete
+AFTER DELETE ON Registers
+FOR EACH ROW
+BEGIN
+    INSERT INTO ChangeJournal (SourceTable, Op, ParticipantID, ActivityID)
+    VALUES ('Registers', 'D', OLD.ParticipantID, OLD.ActivityID);
+END$$
+
+
+CREATE TRIGGER trg_journal_injury_insert
+AFTER INSERT ON Injury
+FOR EACH ROW
+BEGIN
+    INSERT INTO ChangeJournal (SourceTable, Op, ParticipantID, ActivityID)
+    VALUES ('Injury', 'I', NEW.ParticipantID, NEW.ActivityID);
+END$$
+
+CREATE TRIGGER trg_journal_injury_update
+AFTER UPDATE ON Injury
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.ParticipantID <=> NEW.ParticipantID AND OLD.ActivityID <=> NEW.ActivityID) THEN
+        INSERT INTO ChangeJournal (SourceTable, Op, ParticipantID, ActivityID)
+        VALUES ('Injury', 'U', NEW.ParticipantID, NEW.ActivityID),
+               ('Injury', 'U', OLD.ParticipantID, OLD.ActivityID);
+    END IF;
+END$$
+
+CREATE TRIGGER trg_journal_injury_delete
+AFTER DELETE ON Injury
+FOR EACH ROW
+BEGIN
+    INSERT INTO ChangeJournal (SourceTable, Op, ParticipantID, ActivityID)
+    VALUES ('Injury', 'D', OLD.ParticipantID, OLD.ActivityID);
+END$$
+
+
+CREATE TRIGGER trg_journal_maintenance_insert
+AFTER INSERT ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    INSERT INTO ChangeJournal (SourceTable, Op, EquipmentID)
+    VALUES ('MaintenanceLog', 'I', NEW.EquipmentID);
+END$$
+
+CREATE TRIGGER trg_journal_maintenance_update
+AFTER UPDATE ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.EquipmentID <=> NEW.EquipmentID AND OLD.Cost <=> NEW.Cost) THEN
+        INSERT INTO ChangeJournal (SourceTable, Op, EquipmentID)
+        VALUES ('MaintenanceLog', 'U', NEW.EquipmentID);
+        IF NOT (OLD.EquipmentID <=> NEW.EquipmentID) THEN
+            INSERT INTO ChangeJournal (SourceTable, Op, EquipmentID)
+            VALUES ('MaintenanceLog', 'U', OLD.EquipmentID);
+        END IF;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_journal_maintenance_delete
+AFTER DELETE ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    INSERT INTO ChangeJournal (SourceTable, Op, EquipmentID)
+    VALUES ('MaintenanceLog', 'D', OLD.EquipmentID);
+END$$
+
+
+CREATE TRIGGER trg_journal_rating_insert
+AFTER INSERT ON Rating
+FOR EACH ROW
+BEGIN
+    INSERT INTO ChangeJournal (SourceTable, Op, ParticipantID, InstructorID)
+    VALUES ('Rating', 'I', NEW.ParticipantID, NEW.InstructorID);
+END$$
+
+CREATE TRIGGER trg_journal_rating_update
+AFTER UPDATE ON Rating
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.InstructorID <=> NEW.InstructorID AND OLD.RatingValue <=> NEW.RatingValue) THEN
+        INSERT INTO ChangeJournal (SourceTable, Op, ParticipantID, InstructorID)
+        VALUES ('Rating', 'U', NEW.ParticipantID, NEW.InstructorID);
+        IF NOT (OLD.InstructorID <=> NEW.InstructorID) THEN
+            INSERT INTO ChangeJournal (SourceTable, Op, ParticipantID, InstructorID)
+            VALUES ('Rating', 'U', OLD.ParticipantID, OLD.InstructorID);
+        END IF;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_journal_rating_delete
+AFTER DELETE ON Rating
+FOR EACH ROW
+BEGIN
+    INSERT INTO ChangeJournal (SourceTable, Op, ParticipantID, InstructorID)
+    VALUES ('Rating', 'D', OLD.ParticipantID, OLD.InstructorID);
+END$$
+
+DELIMITER ;
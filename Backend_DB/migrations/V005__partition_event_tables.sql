@@ -0,0 +1,216 @@
+-- V005: range-partition the event tables (Injury, MaintenanceLog) by month
+-- Apply with:  python -m adventureguard.migrations
+--
+-- Injury and MaintenanceLog only ever grow, and the Dashboard reads their
+-- newest rows. Monthly RANGE COLUMNS partitions on InjuryDate / MaintDate let
+-- a date-bounded query open only the partitions it needs, and let old months
+-- be dropped or exchanged out without a DELETE over the history.
+-- adventureguard.partitions keeps empty months ahead of today and retires
+-- old ones; p_history holds everything before the first monthly partition.
+--
+-- Partitioning rules force two schema changes:
+--   * every unique key must contain the partitioning column, so the primary
+--     keys become (ParticipantID, InjuryName, InjuryDate) and
+--     (MaintenanceID, MaintDate);
+--   * InnoDB partitioned tables cannot have or be the target of foreign
+--     keys, so Injury's and MaintenanceLog's are dropped.
+-- The triggers at the end enforce what those constraints used to: the
+-- referenced rows must exist, a participant cannot record the same injury
+-- name twice, and parents with injuries/maintenance logs cannot be deleted.
+
+
+-- Foreign keys were created unnamed; drop whatever the server called them
+DELIMITER $$
+
+CREATE PROCEDURE tmp_drop_foreign_keys(IN p_table VARCHAR(64))
+BEGIN
+    SET @drops = NULL;
+    SELECT GROUP_CONCAT(CONCAT('DROP FOREIGN KEY `', CONSTRAINT_NAME, '`'))
+    INTO @drops
+    FROM information_schema.REFERENTIAL_CONSTRAINTS
+    WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = p_table;
+
+    IF @drops IS NOT NULL THEN
+        SET @ddl = CONCAT('ALTER TABLE `', p_table, '` ', @drops);
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END$$
+
+DELIMITER ;
+
+CALL tmp_drop_foreign_keys('Injury');
+CALL tmp_drop_foreign_keys('MaintenanceLog');
+DROP PROCEDURE tmp_drop_foreign_keys;
+
+
+-- Primary keys must include the partitioning column
+ALTER TABLE Injury
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (ParticipantID, InjuryName, InjuryDate);
+
+ALTER TABLE MaintenanceLog
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (MaintenanceID, MaintDate);
+
+
+ALTER TABLE Injury
+PARTITION BY RANGE COLUMNS (InjuryDate) (
+    PARTITION p_history VALUES LESS THAN ('2025-01-01'),
+    PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+    PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+    PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+    PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+    PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+    PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+    PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+    PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+    PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+    PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+    PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+    PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+    PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+    PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+    PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+    PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+    PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+    PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+    PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+    PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+ALTER TABLE MaintenanceLog
+PARTITION BY RANGE COLUMNS (MaintDate) (
+    PARTITION p_history VALUES LESS THAN ('2025-01-01'),
+    PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+    PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+    PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+    PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+    PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+    PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+    PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+    PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+    PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+    PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+    PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+    PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+    PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+    PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+    PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+    PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+    PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+    PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+    PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+    PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+
+-- Referential integrity, formerly the foreign keys
+DELIMITER $$
+
+CREATE TRIGGER trg_injury_refs_insert
+BEFORE INSERT ON Injury
+FOR EACH ROW
+FOLLOWS trg_injury_severity_check
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM Participant WHERE ParticipantID = NEW.ParticipantID) THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Injury references a participant that does not exist!';
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM Activity WHERE ActivityID = NEW.ActivityID) THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Injury references an activity that does not exist!';
+    END IF;
+    -- (ParticipantID, InjuryName) is no longer the primary key on its own
+    IF EXISTS (SELECT 1 FROM Injury
+               WHERE ParticipantID = NEW.ParticipantID AND InjuryName = NEW.InjuryName) THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'This injury is already recorded for the participant!';
+    END IF;
+END$$
+
+CREATE TRIGGER trg_injury_refs_update
+BEFORE UPDATE ON Injury
+FOR EACH ROW
+BEGIN
+    IF NEW.ParticipantID <> OLD.ParticipantID
+       AND NOT EXISTS (SELECT 1 FROM Participant WHERE ParticipantID = NEW.ParticipantID) THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Injury references a participant that does not exist!';
+    END IF;
+    IF NEW.ActivityID <> OLD.ActivityID
+       AND NOT EXISTS (SELECT 1 FROM Activity WHERE ActivityID = NEW.ActivityID) THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Injury references an activity that does not exist!';
+    END IF;
+    IF (NEW.ParticipantID <> OLD.ParticipantID OR NEW.InjuryName <> OLD.InjuryName)
+       AND EXISTS (SELECT 1 FROM Injury
+                   WHERE ParticipantID = NEW.ParticipantID AND InjuryName = NEW.InjuryName) THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'This injury is already recorded for the participant!';
+    END IF;
+END$$
+
+CREATE TRIGGER trg_maintenance_refs_insert
+BEFORE INSERT ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM Equipment WHERE EquipmentID = NEW.EquipmentID) THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Maintenance log references equipment that does not exist!';
+    END IF;
+END$$
+
+CREATE TRIGGER trg_maintenance_refs_update
+BEFORE UPDATE ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    IF NEW.EquipmentID <> OLD.EquipmentID
+       AND NOT EXISTS (SELECT 1 FROM Equipment WHERE EquipmentID = NEW.EquipmentID) THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Maintenance log references equipment that does not exist!';
+    END IF;
+END$$
+
+CREATE TRIGGER trg_participant_restrict_delete
+BEFORE DELETE ON Participant
+FOR EACH ROW
+BEGIN
+    IF EXISTS (SELECT 1 FROM Injury WHERE ParticipantID = OLD.ParticipantID) THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Cannot delete a participant with recorded injuries!';
+    END IF;
+END$$
+
+CREATE TRIGGER trg_activity_restrict_delete
+BEFORE DELETE ON Activity
+FOR EACH ROW
+BEGIN
+    IF EXISTS (SELECT 1 FROM Injury WHERE ActivityID = OLD.ActivityID) THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Cannot delete an activity with recorded injuries!';
+    END IF;
+END$$
+
+CREATE TRIGGER trg_equipment_restrict_delete
+BEFORE DELETE ON Equipment
+FOR EACH ROW
+BEGIN
+    IF EXISTS (SELECT 1 FROM MaintenanceLog WHERE EquipmentID = OLD.EquipmentID) THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Cannot delete equipment with maintenance logs!';
+    END IF;
+END$$
+
+DELIMITER ;
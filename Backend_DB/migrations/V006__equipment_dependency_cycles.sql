@@ -0,0 +1,54 @@
+-- V006: reject cyclic equipment dependencies
+-- Apply with:  python -m adventureguard.migrations
+--
+-- Equipment.DependsOnEquipmentID must form a forest: adventureguard.equipment_graph
+-- walks it to find what an outage transitively impacts, and a loop would
+-- make every item on it depend on itself. Both triggers walk up the chain
+-- from the new DependsOnEquipmentID (one primary-key lookup per level) and
+-- refuse the row if the walk comes back to the row itself.
+
+DELIMITER $$
+
+CREATE PROCEDURE proc_check_equipment_dependency(IN p_equipment_id INT, IN p_depends_on INT)
+BEGIN
+    DECLARE v_current INT DEFAULT p_depends_on;
+    DECLARE v_steps INT DEFAULT 0;
+
+    WHILE v_current IS NOT NULL DO
+        IF v_current = p_equipment_id THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Equipment dependency would form a cycle!';
+        END IF;
+
+        SET v_steps = v_steps + 1;
+        IF v_steps > 100000 THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Equipment dependency chain is too deep (existing cycle?)';
+        END IF;
+
+        SET v_current = (SELECT DependsOnEquipmentID FROM Equipment WHERE EquipmentID = v_current);
+    END WHILE;
+END$$
+
+-- NEW.EquipmentID is 0 until AUTO_INCREMENT assigns it, so on insert this
+-- only catches explicit IDs (a brand-new item has no dependents yet)
+CREATE TRIGGER trg_equipment_no_cycle_insert
+BEFORE INSERT ON Equipment
+FOR EACH ROW
+BEGIN
+    IF NEW.DependsOnEquipmentID IS NOT NULL THEN
+        CALL proc_check_equipment_dependency(NEW.EquipmentID, NEW.DependsOnEquipmentID);
+    END IF;
+END$$
+
+CREATE TRIGGER trg_equipment_no_cycle_update
+BEFORE UPDATE ON Equipment
+FOR EACH ROW
+BEGIN
+    IF NEW.DependsOnEquipmentID IS NOT NULL
+       AND NOT (NEW.DependsOnEquipmentID <=> OLD.DependsOnEquipmentID) THEN
+        CALL proc_check_equipment_dependency(NEW.EquipmentID, NEW.DependsOnEquipmentID);
+    END IF;
+END$$
+
+DELIMITER ;
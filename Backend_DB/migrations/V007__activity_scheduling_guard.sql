@@ -0,0 +1,123 @@
+-- V007: reject invalid activity windows and double bookings
+-- Apply with:  python -m adventureguard.migrations
+--
+-- An activity must end after it starts, and neither its instructor nor any
+-- equipment linked to it through ActivityEquipment may be booked by another
+-- activity in an overlapping [StartDate, EndDate) window.
+--
+-- The checks lock the instructor / equipment row first (FOR UPDATE), so two
+-- concurrent bookings of the same resource are serialized, and then count
+-- clashes with a locking read (FOR SHARE), which sees the latest committed
+-- rows rather than the transaction's snapshot. The second of two racing
+-- inserts therefore always sees the first.
+
+CREATE INDEX idx_activity_instructor_window
+    ON Activity (InstructorID, StartDate, EndDate);
+
+DELIMITER $$
+
+CREATE PROCEDURE proc_check_activity_window(
+    IN p_activity_id INT, IN p_instructor_id INT, IN p_start DATETIME, IN p_end DATETIME)
+BEGIN
+    DECLARE v_locked INT;
+    DECLARE v_clashes INT DEFAULT 0;
+
+    IF p_end <= p_start THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Activity end time must be after its start time!';
+    END IF;
+
+    IF p_instructor_id IS NOT NULL THEN
+        SELECT InstructorID INTO v_locked FROM Instructor
+        WHERE InstructorID = p_instructor_id FOR UPDATE;
+
+        SELECT COUNT(*) INTO v_clashes FROM Activity
+        WHERE InstructorID = p_instructor_id
+          AND StartDate < p_end AND EndDate > p_start
+          AND ActivityID <> p_activity_id
+        FOR SHARE;
+
+        IF v_clashes > 0 THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Instructor is already booked for an overlapping activity!';
+        END IF;
+    END IF;
+
+    -- Equipment already linked to this activity (its window is being moved)
+    SELECT COUNT(*) INTO v_locked FROM Equipment
+    WHERE EquipmentID IN (SELECT EquipmentID FROM ActivityEquipment WHERE ActivityID = p_activity_id)
+    FOR UPDATE;
+
+    SELECT COUNT(*) INTO v_clashes
+    FROM ActivityEquipment mine
+    JOIN ActivityEquipment other ON other.EquipmentID = mine.EquipmentID AND other.ActivityID <> mine.ActivityID
+    JOIN Activity a ON a.ActivityID = other.ActivityID
+    WHERE mine.ActivityID = p_activity_id
+      AND a.StartDate < p_end AND a.EndDate > p_start
+    FOR SHARE;
+
+    IF v_clashes > 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Equipment for this activity is already booked for an overlapping activity!';
+    END IF;
+END$$
+
+CREATE PROCEDURE proc_check_equipment_booking(IN p_activity_id INT, IN p_equipment_id INT)
+BEGIN
+    DECLARE v_locked INT;
+    DECLARE v_clashes INT DEFAULT 0;
+
+    SELECT EquipmentID INTO v_locked FROM Equipment
+    WHERE EquipmentID = p_equipment_id FOR UPDATE;
+
+    SELECT COUNT(*) INTO v_clashes
+    FROM ActivityEquipment other
+    JOIN Activity a ON a.ActivityID = other.ActivityID
+    JOIN Activity mine ON mine.ActivityID = p_activity_id
+    WHERE other.EquipmentID = p_equipment_id
+      AND other.ActivityID <> p_activity_id
+      AND a.StartDate < mine.EndDate AND a.EndDate > mine.StartDate
+    FOR SHARE;
+
+    IF v_clashes > 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Equipment is already booked for an overlapping activity!';
+    END IF;
+END$$
+
+-- NEW.ActivityID is 0 until AUTO_INCREMENT assigns it, which matches no row
+CREATE TRIGGER trg_activity_window_insert
+BEFORE INSERT ON Activity
+FOR EACH ROW
+BEGIN
+    CALL proc_check_activity_window(NEW.ActivityID, NEW.InstructorID, NEW.StartDate, NEW.EndDate);
+END$$
+
+-- Only when the window or the instructor changes: TotalParticipants updates
+-- from trg_update_total_participants skip the check
+CREATE TRIGGER trg_activity_window_update
+BEFORE UPDATE ON Activity
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.StartDate <=> OLD.StartDate)
+       OR NOT (NEW.EndDate <=> OLD.EndDate)
+       OR NOT (NEW.InstructorID <=> OLD.InstructorID) THEN
+        CALL proc_check_activity_window(NEW.ActivityID, NEW.InstructorID, NEW.StartDate, NEW.EndDate);
+    END IF;
+END$$
+
+CREATE TRIGGER trg_activity_equipment_booking_insert
+BEFORE INSERT ON ActivityEquipment
+FOR EACH ROW
+BEGIN
+    CALL proc_check_equipment_booking(NEW.ActivityID, NEW.EquipmentID);
+END$$
+
+CREATE TRIGGER trg_activity_equipment_booking_update
+BEFORE UPDATE ON ActivityEquipment
+FOR EACH ROW
+BEGIN
+    CALL proc_check_equipment_booking(NEW.ActivityID, NEW.EquipmentID);
+END$$
+
+DELIMITER ;
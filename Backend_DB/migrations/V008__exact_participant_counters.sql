@@ -0,0 +1,80 @@
+-- V008: exact Activity.TotalParticipants and set-based batch registration
+-- Apply with:  python -m adventureguard.migrations
+--
+-- trg_update_total_participants only counted paid registrations on INSERT,
+-- so the counter drifted when a payment flipped to 'Yes' later or a
+-- registration was deleted. The new UPDATE/DELETE triggers keep it exact.
+--
+-- adventureguard.enrollment registers many participants in one transaction
+-- with @batch_enrollment = 1 set. The per-row counter triggers skip those
+-- rows, and it applies the deltas itself instead: one grouped UPDATE of
+-- Activity and one multi-row upsert of ActivityParticipantStats per batch,
+-- rather than one row update (and lock) per registration.
+
+DROP TRIGGER IF EXISTS trg_update_total_participants;
+DROP TRIGGER IF EXISTS trg_agg_registers_insert;
+
+DELIMITER $$
+
+CREATE TRIGGER trg_update_total_participants
+AFTER INSERT ON Registers
+FOR EACH ROW
+BEGIN
+    IF @batch_enrollment IS NULL AND NEW.PaymentStatus = 'Yes' THEN
+        UPDATE Activity
+        SET TotalParticipants = TotalParticipants + 1
+        WHERE ActivityID = NEW.ActivityID;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_agg_registers_insert
+AFTER INSERT ON Registers
+FOR EACH ROW
+BEGIN
+    IF @batch_enrollment IS NULL THEN
+        INSERT INTO ActivityParticipantStats (ActivityID, PaidCount, TotalCount)
+        VALUES (NEW.ActivityID, NEW.PaymentStatus = 'Yes', 1)
+        ON DUPLICATE KEY UPDATE
+            PaidCount = PaidCount + (NEW.PaymentStatus = 'Yes'),
+            TotalCount = TotalCount + 1;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_total_participants_update
+AFTER UPDATE ON Registers
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.ActivityID <=> NEW.ActivityID AND OLD.PaymentStatus <=> NEW.PaymentStatus) THEN
+        IF OLD.PaymentStatus = 'Yes' THEN
+            UPDATE Activity
+            SET TotalParticipants = TotalParticipants - 1
+            WHERE ActivityID = OLD.ActivityID;
+        END IF;
+        IF NEW.PaymentStatus = 'Yes' THEN
+            UPDATE Activity
+            SET TotalParticipants = TotalParticipants + 1
+            WHERE ActivityID = NEW.ActivityID;
+        END IF;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_total_participants_delete
+AFTER DELETE ON Registers
+FOR EACH ROW
+BEGIN
+    IF OLD.PaymentStatus = 'Yes' THEN
+        UPDATE Activity
+        SET TotalParticipants = TotalParticipants - 1
+        WHERE ActivityID = OLD.ActivityID;
+    END IF;
+END$$
+
+DELIMITER ;
+
+
+-- Start from exact counters (the same statement as enrollment.reconcile)
+UPDATE Activity
+SET TotalParticipants = (
+    SELECT COUNT(*) FROM Registers r
+    WHERE r.ActivityID = Activity.ActivityID AND r.PaymentStatus = 'Yes'
+);
@@ -0,0 +1,184 @@
+-- V009: global search index (FULLTEXT over one document per searchable row)
+-- Apply with:  python -m adventureguard.migrations
+--
+-- Injury and MaintenanceLog are partitioned (V005), and InnoDB cannot put a
+-- FULLTEXT index on a partitioned table, so the searchable text of all four
+-- entities is copied into SearchDocument, one row per source row, and
+-- indexed there. adventureguard.search runs one
+-- MATCH ... AGAINST (... IN BOOLEAN MODE) over it: a ranked, typed result
+-- from the full-text index instead of LIKE '%x%' scans of four tables.
+--
+--   Participant  Title = Name            Body = ContactNumber, EmergencyContactName/Number
+--   Instructor   Title = Name            Body = Expertise
+--   Injury       Title = InjuryName      Body = Treatment
+--   Maintenance  Title = Technician      Body = Description
+--
+-- Detail is what the search page shows under a hit (for a participant, the
+-- emergency contact), so a lookup needs no second query.
+-- The AFTER INSERT/UPDATE/DELETE triggers below keep it in step.
+
+CREATE TABLE SearchDocument (
+    EntityType ENUM('Participant','Instructor','Injury','Maintenance') NOT NULL,
+    EntityKey VARCHAR(160) NOT NULL,        -- source primary key, '|'-joined
+    EntityID INT NOT NULL,                  -- ParticipantID / InstructorID / ParticipantID / MaintenanceID
+    Title VARCHAR(200) NOT NULL,
+    Body TEXT,
+    Detail VARCHAR(255),
+    PRIMARY KEY (EntityType, EntityKey),
+    FULLTEXT KEY ft_search_document (Title, Body)
+);
+
+
+-- Initial build
+INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+SELECT 'Participant', ParticipantID, ParticipantID, Name,
+       CONCAT_WS(' ', ContactNumber, EmergencyContactName, EmergencyContactNumber),
+       CONCAT('Emergency: ', EmergencyContactName, ' ', EmergencyContactNumber, ' · Contact: ', ContactNumber)
+FROM Participant;
+
+INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+SELECT 'Instructor', InstructorID, InstructorID, Name, Expertise,
+       CONCAT('Contact: ', ContactNumber, ' · ', ExperienceYears, ' yrs')
+FROM Instructor;
+
+INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+SELECT 'Injury', CONCAT_WS('|', ParticipantID, InjuryName, InjuryDate), ParticipantID, InjuryName, Treatment,
+       CONCAT(Severity, ' · ', InjuryDate, ' · participant #', ParticipantID, ' · activity #', ActivityID)
+FROM Injury;
+
+INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+SELECT 'Maintenance', MaintenanceID, MaintenanceID, IFNULL(Technician, ''), Description,
+       CONCAT(MaintDate, ' · equipment #', EquipmentID, ' · ', Status)
+FROM MaintenanceLog;
+
+
+
+DELIMITER $$
+
+-- ======================================================
+-- Participant
+-- ======================================================
+CREATE TRIGGER trg_search_participant_insert
+AFTER INSERT ON Participant
+FOR EACH ROW
+BEGIN
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Participant', NEW.ParticipantID, NEW.ParticipantID, NEW.Name,
+            CONCAT_WS(' ', NEW.ContactNumber, NEW.EmergencyContactName, NEW.EmergencyContactNumber),
+            CONCAT('Emergency: ', NEW.EmergencyContactName, ' ', NEW.EmergencyContactNumber,
+                   ' · Contact: ', NEW.ContactNumber));
+END$$
+
+CREATE TRIGGER trg_search_participant_update
+AFTER UPDATE ON Participant
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument WHERE EntityType = 'Participant' AND EntityKey = CAST(OLD.ParticipantID AS CHAR);
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Participant', NEW.ParticipantID, NEW.ParticipantID, NEW.Name,
+            CONCAT_WS(' ', NEW.ContactNumber, NEW.EmergencyContactName, NEW.EmergencyContactNumber),
+            CONCAT('Emergency: ', NEW.EmergencyContactName, ' ', NEW.EmergencyContactNumber,
+                   ' · Contact: ', NEW.ContactNumber));
+END$$
+
+CREATE TRIGGER trg_search_participant_delete
+AFTER DELETE ON Participant
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument WHERE EntityType = 'Participant' AND EntityKey = CAST(OLD.ParticipantID AS CHAR);
+END$$
+
+-- ======================================================
+-- Instructor
+-- ======================================================
+CREATE TRIGGER trg_search_instructor_insert
+AFTER INSERT ON Instructor
+FOR EACH ROW
+BEGIN
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Instructor', NEW.InstructorID, NEW.InstructorID, NEW.Name, NEW.Expertise,
+            CONCAT('Contact: ', NEW.ContactNumber, ' · ', NEW.ExperienceYears, ' yrs'));
+END$$
+
+CREATE TRIGGER trg_search_instructor_update
+AFTER UPDATE ON Instructor
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument WHERE EntityType = 'Instructor' AND EntityKey = CAST(OLD.InstructorID AS CHAR);
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Instructor', NEW.InstructorID, NEW.InstructorID, NEW.Name, NEW.Expertise,
+            CONCAT('Contact: ', NEW.ContactNumber, ' · ', NEW.ExperienceYears, ' yrs'));
+END$$
+
+CREATE TRIGGER trg_search_instructor_delete
+AFTER DELETE ON Instructor
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument WHERE EntityType = 'Instructor' AND EntityKey = CAST(OLD.InstructorID AS CHAR);
+END$$
+
+-- ======================================================
+-- Injury
+-- ======================================================
+CREATE TRIGGER trg_search_injury_insert
+AFTER INSERT ON Injury
+FOR EACH ROW
+BEGIN
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Injury', CONCAT_WS('|', NEW.ParticipantID, NEW.InjuryName, NEW.InjuryDate), NEW.ParticipantID,
+            NEW.InjuryName, NEW.Treatment,
+            CONCAT(NEW.Severity, ' · ', NEW.InjuryDate, ' · participant #', NEW.ParticipantID,
+                   ' · activity #', NEW.ActivityID));
+END$$
+
+CREATE TRIGGER trg_search_injury_update
+AFTER UPDATE ON Injury
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument
+    WHERE EntityType = 'Injury' AND EntityKey = CONCAT_WS('|', OLD.ParticipantID, OLD.InjuryName, OLD.InjuryDate);
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Injury', CONCAT_WS('|', NEW.ParticipantID, NEW.InjuryName, NEW.InjuryDate), NEW.ParticipantID,
+            NEW.InjuryName, NEW.Treatment,
+            CONCAT(NEW.Severity, ' · ', NEW.InjuryDate, ' · participant #', NEW.ParticipantID,
+                   ' · activity #', NEW.ActivityID));
+END$$
+
+CREATE TRIGGER trg_search_injury_delete
+AFTER DELETE ON Injury
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument
+    WHERE EntityType = 'Injury' AND EntityKey = CONCAT_WS('|', OLD.ParticipantID, OLD.InjuryName, OLD.InjuryDate);
+END$$
+
+-- ======================================================
+-- MaintenanceLog
+-- ======================================================
+CREATE TRIGGER trg_search_maintenance_insert
+AFTER INSERT ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Maintenance', NEW.MaintenanceID, NEW.MaintenanceID, IFNULL(NEW.Technician, ''), NEW.Description,
+            CONCAT(NEW.MaintDate, ' · equipment #', NEW.EquipmentID, ' · ', NEW.Status));
+END$$
+
+CREATE TRIGGER trg_search_maintenance_update
+AFTER UPDATE ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument WHERE EntityType = 'Maintenance' AND EntityKey = CAST(OLD.MaintenanceID AS CHAR);
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Maintenance', NEW.MaintenanceID, NEW.MaintenanceID, IFNULL(NEW.Technician, ''), NEW.Description,
+            CONCAT(NEW.MaintDate, ' · equipment #', NEW.EquipmentID, ' · ', NEW.Status));
+END$$
+
+CREATE TRIGGER trg_search_maintenance_delete
+AFTER DELETE ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument WHERE EntityType = 'Maintenance' AND EntityKey = CAST(OLD.MaintenanceID AS CHAR);
+END$$
+
+DELIMITER ;
@@ -0,0 +1,16 @@
+-- V010: exactly-once apply for the Add Data write-behind queue
+-- Apply with:  python -m adventureguard.migrations
+--
+-- adventureguard.write_queue journals form INSERTs in a local SQLite file and
+-- applies them in group commits. Each commit also records the journal
+-- tickets it applied here, in the same transaction. If the app dies between
+-- the commit and marking the tickets done in the journal, the worker finds
+-- them here on restart instead of inserting the rows a second time. Markers
+-- are deleted once the journal has caught up, so the table stays tiny.
+
+CREATE TABLE AppliedWrite (
+    Origin CHAR(32) NOT NULL,               -- journal file id
+    Ticket BIGINT NOT NULL,
+    AppliedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Origin, Ticket)
+);
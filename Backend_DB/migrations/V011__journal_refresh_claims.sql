@@ -0,0 +1,19 @@
+-- V011: report refresh claims journal entries instead of trusting a watermark
+-- Apply with:  python -m adventureguard.migrations
+--
+-- V004's refresh applied every entry up to MAX(ChangeID) once it was a few
+-- seconds old. ChangeIDs are handed out at insert time, not at commit, so an
+-- entry written by a transaction that stayed open past that delay became
+-- visible below the watermark and was never applied. Each entry now records
+-- the refresh that applied it: adventureguard.report_refresh tags the
+-- untagged entries it can lock (FOR UPDATE SKIP LOCKED passes over rows of
+-- transactions that have not committed yet) and recomputes just their keys.
+
+ALTER TABLE ChangeJournal
+    ADD COLUMN RefreshID BIGINT NULL,       -- NULL = not applied yet
+    ADD INDEX idx_journal_refresh (RefreshID, SourceTable);
+
+-- Everything up to the old watermark has been applied already
+UPDATE ChangeJournal
+SET RefreshID = ChangeID
+WHERE ChangeID <= (SELECT LastChangeID FROM ReportWatermark WHERE Name = 'reports');
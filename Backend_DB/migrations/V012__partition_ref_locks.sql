@@ -0,0 +1,165 @@
+-- V012: race-free reference and uniqueness checks on the partitioned tables
+-- Apply with:  python -m adventureguard.migrations
+--
+-- The V005 triggers that replaced the foreign keys (and the former
+-- (ParticipantID, InjuryName) primary key) checked with plain reads, which
+-- see the transaction's snapshot: two concurrent inserts of the same injury
+-- both passed, and a parent could be deleted while a child referencing it
+-- was being inserted. They are recreated the way V007 checks bookings:
+--
+--   * an Injury write locks its participant FOR UPDATE, so writes for one
+--     participant (and its deletion) are serialized, and its activity
+--     FOR SHARE, which blocks deleting the activity until it commits;
+--   * a MaintenanceLog write locks its equipment FOR SHARE;
+--   * the duplicate and restrict-delete checks count with a locking read
+--     (FOR SHARE), which sees the latest committed rows.
+
+DROP TRIGGER IF EXISTS trg_injury_refs_insert;
+DROP TRIGGER IF EXISTS trg_injury_refs_update;
+DROP TRIGGER IF EXISTS trg_maintenance_refs_insert;
+DROP TRIGGER IF EXISTS trg_maintenance_refs_update;
+DROP TRIGGER IF EXISTS trg_participant_restrict_delete;
+DROP TRIGGER IF EXISTS trg_activity_restrict_delete;
+DROP TRIGGER IF EXISTS trg_equipment_restrict_delete;
+
+DELIMITER $$
+
+CREATE TRIGGER trg_injury_refs_insert
+BEFORE INSERT ON Injury
+FOR EACH ROW
+FOLLOWS trg_injury_severity_check
+BEGIN
+    DECLARE v_found INT DEFAULT 0;
+
+    SELECT COUNT(*) INTO v_found FROM Participant
+    WHERE ParticipantID = NEW.ParticipantID FOR UPDATE;
+    IF v_found = 0 THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Injury references a participant that does not exist!';
+    END IF;
+
+    SELECT COUNT(*) INTO v_found FROM Activity
+    WHERE ActivityID = NEW.ActivityID FOR SHARE;
+    IF v_found = 0 THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Injury references an activity that does not exist!';
+    END IF;
+
+    -- (ParticipantID, InjuryName) is no longer the primary key on its own
+    SELECT COUNT(*) INTO v_found FROM Injury
+    WHERE ParticipantID = NEW.ParticipantID AND InjuryName = NEW.InjuryName
+    FOR SHARE;
+    IF v_found > 0 THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'This injury is already recorded for the participant!';
+    END IF;
+END$$
+
+CREATE TRIGGER trg_injury_refs_update
+BEFORE UPDATE ON Injury
+FOR EACH ROW
+BEGIN
+    DECLARE v_found INT DEFAULT 0;
+
+    IF NEW.ParticipantID <> OLD.ParticipantID OR NEW.InjuryName <> OLD.InjuryName THEN
+        SELECT COUNT(*) INTO v_found FROM Participant
+        WHERE ParticipantID = NEW.ParticipantID FOR UPDATE;
+        IF v_found = 0 THEN
+            SIGNAL SQLSTATE '23000'
+            SET MESSAGE_TEXT = 'Injury references a participant that does not exist!';
+        END IF;
+
+        SELECT COUNT(*) INTO v_found FROM Injury
+        WHERE ParticipantID = NEW.ParticipantID AND InjuryName = NEW.InjuryName
+        FOR SHARE;
+        IF v_found > 0 THEN
+            SIGNAL SQLSTATE '23000'
+            SET MESSAGE_TEXT = 'This injury is already recorded for the participant!';
+        END IF;
+    END IF;
+
+    IF NEW.ActivityID <> OLD.ActivityID THEN
+        SELECT COUNT(*) INTO v_found FROM Activity
+        WHERE ActivityID = NEW.ActivityID FOR SHARE;
+        IF v_found = 0 THEN
+            SIGNAL SQLSTATE '23000'
+            SET MESSAGE_TEXT = 'Injury references an activity that does not exist!';
+        END IF;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_maintenance_refs_insert
+BEFORE INSERT ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    DECLARE v_found INT DEFAULT 0;
+
+    SELECT COUNT(*) INTO v_found FROM Equipment
+    WHERE EquipmentID = NEW.EquipmentID FOR SHARE;
+    IF v_found = 0 THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Maintenance log references equipment that does not exist!';
+    END IF;
+END$$
+
+CREATE TRIGGER trg_maintenance_refs_update
+BEFORE UPDATE ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    DECLARE v_found INT DEFAULT 0;
+
+    IF NEW.EquipmentID <> OLD.EquipmentID THEN
+        SELECT COUNT(*) INTO v_found FROM Equipment
+        WHERE EquipmentID = NEW.EquipmentID FOR SHARE;
+        IF v_found = 0 THEN
+            SIGNAL SQLSTATE '23000'
+            SET MESSAGE_TEXT = 'Maintenance log references equipment that does not exist!';
+        END IF;
+    END IF;
+END$$
+
+-- The row being deleted is already locked FOR UPDATE by the DELETE, so child
+-- inserts waiting on it see it gone; the counts below see committed children
+CREATE TRIGGER trg_participant_restrict_delete
+BEFORE DELETE ON Participant
+FOR EACH ROW
+BEGIN
+    DECLARE v_refs INT DEFAULT 0;
+
+    SELECT COUNT(*) INTO v_refs FROM Injury
+    WHERE ParticipantID = OLD.ParticipantID FOR SHARE;
+    IF v_refs > 0 THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Cannot delete a participant with recorded injuries!';
+    END IF;
+END$$
+
+CREATE TRIGGER trg_activity_restrict_delete
+BEFORE DELETE ON Activity
+FOR EACH ROW
+BEGIN
+    DECLARE v_refs INT DEFAULT 0;
+
+    SELECT COUNT(*) INTO v_refs FROM Injury
+    WHERE ActivityID = OLD.ActivityID FOR SHARE;
+    IF v_refs > 0 THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Cannot delete an activity with recorded injuries!';
+    END IF;
+END$$
+
+CREATE TRIGGER trg_equipment_restrict_delete
+BEFORE DELETE ON Equipment
+FOR EACH ROW
+BEGIN
+    DECLARE v_refs INT DEFAULT 0;
+
+    SELECT COUNT(*) INTO v_refs FROM MaintenanceLog
+    WHERE EquipmentID = OLD.EquipmentID FOR SHARE;
+    IF v_refs > 0 THEN
+        SIGNAL SQLSTATE '23000'
+        SET MESSAGE_TEXT = 'Cannot delete equipment with maintenance logs!';
+    END IF;
+END$$
+
+DELIMITER ;
@@ -0,0 +1,37 @@
+-- V013: drop the foreign keys of the V002 summary tables
+-- Apply with:  python -m adventureguard.migrations
+--
+-- The delete triggers only decrement a summary row, so a zero row outlives
+-- the last child. With a foreign key to the parent, that row then blocked
+-- deleting any equipment, instructor, activity or participant that had ever
+-- been referenced (error 1451), even after its children were gone. Like the
+-- Report* tables (V004) the summaries carry no foreign keys: the functions
+-- look them up by key, and proc_check_aggregates(TRUE) rebuilds them.
+
+-- Foreign keys were created unnamed; drop whatever the server called them
+DELIMITER $$
+
+CREATE PROCEDURE tmp_drop_foreign_keys(IN p_table VARCHAR(64))
+BEGIN
+    SET @drops = NULL;
+    SELECT GROUP_CONCAT(CONCAT('DROP FOREIGN KEY `', CONSTRAINT_NAME, '`'))
+    INTO @drops
+    FROM information_schema.REFERENTIAL_CONSTRAINTS
+    WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = p_table;
+
+    IF @drops IS NOT NULL THEN
+        SET @ddl = CONCAT('ALTER TABLE `', p_table, '` ', @drops);
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END$$
+
+DELIMITER ;
+
+CALL tmp_drop_foreign_keys('EquipmentMaintenanceStats');
+CALL tmp_drop_foreign_keys('InstructorRatingStats');
+CALL tmp_drop_foreign_keys('ActivityParticipantStats');
+CALL tmp_drop_foreign_keys('ParticipantInjuryStats');
+DROP PROCEDURE tmp_drop_foreign_keys;
+
@@ -0,0 +1,439 @@
+-- ADVENTURE schema for the embedded SQLite engine (config.DB_ENGINE = "sqlite").
+-- Translated from DataBase_SQL_Code plus the V001/V003 indexes; loaded by
+-- adventureguard.sqlite_backend when the database file is empty.
+--
+-- ENUM columns become CHECK constraints, SIGNAL becomes RAISE(ABORT), and
+-- the stored functions are Python UDFs registered on every connection.
+-- Stored procedures have no SQLite equivalent and are not ported.
+
+PRAGMA foreign_keys = ON;
+
+-- Participant Table
+CREATE TABLE Participant (
+    ParticipantID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Name VARCHAR(100) NOT NULL,
+    DOB DATE NOT NULL,
+    ContactNumber VARCHAR(10) NOT NULL,
+    EmergencyContactName VARCHAR(100) NOT NULL,
+    EmergencyContactNumber VARCHAR(10) NOT NULL
+);
+
+CREATE TABLE Instructor (
+    InstructorID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Name VARCHAR(100) NOT NULL,
+    ContactNumber VARCHAR(10) NOT NULL,
+    ExperienceYears INT DEFAULT 0,
+    Expertise VARCHAR(200)
+);
+
+-- Activity Table
+CREATE TABLE Activity (
+    ActivityID INTEGER PRIMARY KEY AUTOINCREMENT,
+    ActivityName VARCHAR(100) NOT NULL,
+    ActivityType VARCHAR(50),
+    StartDate DATETIME NOT NULL,
+    EndDate DATETIME NOT NULL,
+    Fees DECIMAL(10,2) DEFAULT 0,
+    InstructorID INT,
+    TotalParticipants INT DEFAULT 0,
+    FOREIGN KEY (InstructorID) REFERENCES Instructor(InstructorID)
+);
+
+-- Equipment Table
+CREATE TABLE Equipment (
+    EquipmentID INTEGER PRIMARY KEY AUTOINCREMENT,
+    EquipmentType VARCHAR(100) NOT NULL,
+    Status VARCHAR(20) DEFAULT 'Working'
+        CHECK (Status IN ('Working','Under Maintenance','Broken')),
+    LastMaintenanceDate DATE,
+    WarrantyExpiry DATE,
+    DependsOnEquipmentID INT,
+    FOREIGN KEY (DependsOnEquipmentID) REFERENCES Equipment(EquipmentID)
+);
+
+-- Maintenance Log Table
+CREATE TABLE MaintenanceLog (
+    MaintenanceID INTEGER PRIMARY KEY AUTOINCREMENT,
+    EquipmentID INT NOT NULL,
+    MaintDate DATE NOT NULL,
+    Description TEXT,
+    Technician VARCHAR(100),
+    Cost DECIMAL(10,2) DEFAULT 0,
+    Status VARCHAR(10) DEFAULT 'Ongoing' CHECK (Status IN ('Ongoing','Completed')),
+    FOREIGN KEY (EquipmentID) REFERENCES Equipment(EquipmentID)
+);
+
+-- Registers Table (Participants <-> Activities)
+CREATE TABLE Registers (
+    ParticipantID INT NOT NULL,
+    ActivityID INT NOT NULL,
+    RegistrationDate DATE DEFAULT (CURRENT_DATE),
+    PaymentStatus VARCHAR(3) DEFAULT 'No' CHECK (PaymentStatus IN ('Yes','No')),
+    PRIMARY KEY (ParticipantID, ActivityID),
+    FOREIGN KEY (ParticipantID) REFERENCES Participant(ParticipantID),
+    FOREIGN KEY (ActivityID) REFERENCES Activity(ActivityID)
+);
+
+-- Injury Table (Weak Entity)
+CREATE TABLE Injury (
+    ParticipantID INT NOT NULL,
+    ActivityID INT NOT NULL,
+    InjuryName VARCHAR(100) NOT NULL,
+    InjuryDate DATE NOT NULL,
+    Severity VARCHAR(10) NOT NULL CHECK (Severity IN ('Low','Medium','High','Critical')),
+    Treatment VARCHAR(100),
+    PRIMARY KEY (ParticipantID, InjuryName),
+    FOREIGN KEY (ParticipantID) REFERENCES Participant(ParticipantID),
+    FOREIGN KEY (ActivityID) REFERENCES Activity(ActivityID)
+);
+
+-- Rating Table (Participant → Instructor)
+CREATE TABLE Rating (
+    ParticipantID INT NOT NULL,
+    InstructorID INT NOT NULL,
+    RatingValue INT,
+    Comments VARCHAR(255),
+    PRIMARY KEY (ParticipantID, InstructorID),
+    FOREIGN KEY (ParticipantID) REFERENCES Participant(ParticipantID),
+    FOREIGN KEY (InstructorID) REFERENCES Instructor(InstructorID)
+);
+
+-- ActivityEquipment Table (Activity → Equipment)
+CREATE TABLE ActivityEquipment (
+    ActivityID INT NOT NULL,
+    EquipmentID INT NOT NULL,
+    PRIMARY KEY (ActivityID, EquipmentID),
+    FOREIGN KEY (ActivityID) REFERENCES Activity(ActivityID),
+    FOREIGN KEY (EquipmentID) REFERENCES Equipment(EquipmentID)
+);
+
+
+-- Hot-path, picker and scheduling indexes (V001, V003, V007)
+CREATE INDEX idx_injury_date_recent ON Injury (InjuryDate, ActivityID, Severity);
+CREATE INDEX idx_injury_severity ON Injury (Severity);
+CREATE INDEX idx_maint_date_recent ON MaintenanceLog (MaintDate, EquipmentID, Technician, Cost);
+CREATE INDEX idx_maint_equipment_cost ON MaintenanceLog (EquipmentID, Cost);
+CREATE INDEX idx_equipment_status ON Equipment (Status);
+CREATE INDEX idx_registers_activity_paid ON Registers (ActivityID, PaymentStatus);
+CREATE INDEX idx_rating_instructor_value ON Rating (InstructorID, RatingValue);
+CREATE INDEX idx_participant_name ON Participant (Name);
+CREATE INDEX idx_instructor_name ON Instructor (Name);
+CREATE INDEX idx_activity_name ON Activity (ActivityName);
+CREATE INDEX idx_equipment_type ON Equipment (EquipmentType);
+CREATE INDEX idx_activity_instructor_window ON Activity (InstructorID, StartDate, EndDate);
+
+
+CREATE TRIGGER trg_update_equipment_status
+AFTER INSERT ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    UPDATE Equipment
+    SET Status = 'Under Maintenance',
+        LastMaintenanceDate = NEW.MaintDate
+    WHERE EquipmentID = NEW.EquipmentID;
+END;
+
+CREATE TRIGGER trg_update_total_participants
+AFTER INSERT ON Registers
+FOR EACH ROW
+WHEN NEW.PaymentStatus = 'Yes'
+BEGIN
+    UPDATE Activity
+    SET TotalParticipants = TotalParticipants + 1
+    WHERE ActivityID = NEW.ActivityID;
+END;
+
+CREATE TRIGGER trg_injury_severity_check
+BEFORE INSERT ON Injury
+FOR EACH ROW
+BEGIN
+    -- Check for invalid severity
+    SELECT RAISE(ABORT, 'Invalid injury severity level!')
+    WHERE UPPER(NEW.Severity) NOT IN ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL');
+
+    -- Logical constraint: injury date cannot be before activity start date
+    SELECT RAISE(ABORT, 'Injury date cannot be before the activity start date!')
+    WHERE DATE(NEW.InjuryDate) < (SELECT DATE(StartDate) FROM Activity WHERE ActivityID = NEW.ActivityID);
+END;
+
+CREATE TRIGGER trg_validate_rating
+BEFORE INSERT ON Rating
+FOR EACH ROW
+WHEN NEW.RatingValue < 1 OR NEW.RatingValue > 5
+BEGIN
+    SELECT RAISE(ABORT, 'Rating value must be between 1 and 5');
+END;
+
+CREATE TRIGGER trg_set_equipment_working_after_maintenance
+AFTER UPDATE ON MaintenanceLog
+FOR EACH ROW
+WHEN NEW.Status = 'Completed'
+BEGIN
+    UPDATE Equipment
+    SET Status = 'Working'
+    WHERE EquipmentID = NEW.EquipmentID;
+END;
+
+-- V006: equipment dependencies must not form a cycle
+CREATE TRIGGER trg_equipment_no_cycle_insert
+BEFORE INSERT ON Equipment
+FOR EACH ROW
+WHEN NEW.DependsOnEquipmentID IS NOT NULL AND NEW.EquipmentID IS NOT NULL
+BEGIN
+    SELECT RAISE(ABORT, 'Equipment dependency would form a cycle!')
+    WHERE NEW.EquipmentID IN (
+        WITH RECURSIVE up(id) AS (
+            SELECT NEW.DependsOnEquipmentID
+            UNION
+            SELECT e.DependsOnEquipmentID FROM Equipment e JOIN up ON e.EquipmentID = up.id
+            WHERE e.DependsOnEquipmentID IS NOT NULL
+        )
+        SELECT id FROM up
+    );
+END;
+
+CREATE TRIGGER trg_equipment_no_cycle_update
+BEFORE UPDATE OF DependsOnEquipmentID ON Equipment
+FOR EACH ROW
+WHEN NEW.DependsOnEquipmentID IS NOT NULL
+BEGIN
+    SELECT RAISE(ABORT, 'Equipment dependency would form a cycle!')
+    WHERE NEW.EquipmentID IN (
+        WITH RECURSIVE up(id) AS (
+            SELECT NEW.DependsOnEquipmentID
+            UNION
+            SELECT e.DependsOnEquipmentID FROM Equipment e JOIN up ON e.EquipmentID = up.id
+            WHERE e.DependsOnEquipmentID IS NOT NULL
+        )
+        SELECT id FROM up
+    );
+END;
+
+-- V007: activities must end after they start and must not double-book an
+-- instructor or equipment (SQLite has one writer at a time, so no locking)
+CREATE TRIGGER trg_activity_window_insert
+BEFORE INSERT ON Activity
+FOR EACH ROW
+BEGIN
+    SELECT RAISE(ABORT, 'Activity end time must be after its start time!')
+    WHERE NEW.EndDate <= NEW.StartDate;
+
+    SELECT RAISE(ABORT, 'Instructor is already booked for an overlapping activity!')
+    WHERE EXISTS (
+        SELECT 1 FROM Activity
+        WHERE InstructorID = NEW.InstructorID
+          AND StartDate < NEW.EndDate AND EndDate > NEW.StartDate
+    );
+END;
+
+CREATE TRIGGER trg_activity_window_update
+BEFORE UPDATE OF StartDate, EndDate, InstructorID ON Activity
+FOR EACH ROW
+BEGIN
+    SELECT RAISE(ABORT, 'Activity end time must be after its start time!')
+    WHERE NEW.EndDate <= NEW.StartDate;
+
+    SELECT RAISE(ABORT, 'Instructor is already booked for an overlapping activity!')
+    WHERE EXISTS (
+        SELECT 1 FROM Activity
+        WHERE InstructorID = NEW.InstructorID AND ActivityID <> NEW.ActivityID
+          AND StartDate < NEW.EndDate AND EndDate > NEW.StartDate
+    );
+
+    SELECT RAISE(ABORT, 'Equipment for this activity is already booked for an overlapping activity!')
+    WHERE EXISTS (
+        SELECT 1
+        FROM ActivityEquipment mine
+        JOIN ActivityEquipment other ON other.EquipmentID = mine.EquipmentID AND other.ActivityID <> mine.ActivityID
+        JOIN Activity a ON a.ActivityID = other.ActivityID
+        WHERE mine.ActivityID = NEW.ActivityID
+          AND a.StartDate < NEW.EndDate AND a.EndDate > NEW.StartDate
+    );
+END;
+
+CREATE TRIGGER trg_activity_equipment_booking_insert
+BEFORE INSERT ON ActivityEquipment
+FOR EACH ROW
+BEGIN
+    SELECT RAISE(ABORT, 'Equipment is already booked for an overlapping activity!')
+    WHERE EXISTS (
+        SELECT 1
+        FROM ActivityEquipment other
+        JOIN Activity a ON a.ActivityID = other.ActivityID
+        JOIN Activity mine ON mine.ActivityID = NEW.ActivityID
+        WHERE other.EquipmentID = NEW.EquipmentID AND other.ActivityID <> NEW.ActivityID
+          AND a.StartDate < mine.EndDate AND a.EndDate > mine.StartDate
+    );
+END;
+
+CREATE TRIGGER trg_activity_equipment_booking_update
+BEFORE UPDATE ON ActivityEquipment
+FOR EACH ROW
+BEGIN
+    SELECT RAISE(ABORT, 'Equipment is already booked for an overlapping activity!')
+    WHERE EXISTS (
+        SELECT 1
+        FROM ActivityEquipment other
+        JOIN Activity a ON a.ActivityID = other.ActivityID
+        JOIN Activity mine ON mine.ActivityID = NEW.ActivityID
+        WHERE other.EquipmentID = NEW.EquipmentID AND other.ActivityID <> NEW.ActivityID
+          AND a.StartDate < mine.EndDate AND a.EndDate > mine.StartDate
+    );
+END;
+
+-- V008: keep TotalParticipants exact when a payment flips or a registration
+-- is deleted (batch registration needs no trigger change here: SQLite has
+-- no row locks to save)
+CREATE TRIGGER trg_total_participants_update
+AFTER UPDATE OF ActivityID, PaymentStatus ON Registers
+FOR EACH ROW
+BEGIN
+    UPDATE Activity
+    SET TotalParticipants = TotalParticipants - 1
+    WHERE ActivityID = OLD.ActivityID AND OLD.PaymentStatus = 'Yes';
+
+    UPDATE Activity
+    SET TotalParticipants = TotalParticipants + 1
+    WHERE ActivityID = NEW.ActivityID AND NEW.PaymentStatus = 'Yes';
+END;
+
+CREATE TRIGGER trg_total_participants_delete
+AFTER DELETE ON Registers
+FOR EACH ROW
+WHEN OLD.PaymentStatus = 'Yes'
+BEGIN
+    UPDATE Activity
+    SET TotalParticipants = TotalParticipants - 1
+    WHERE ActivityID = OLD.ActivityID;
+END;
+
+-- V009: global search index. SQLite's FTS5 stands in for the MySQL FULLTEXT
+-- table; the columns and the triggers that fill it are the same.
+CREATE VIRTUAL TABLE SearchDocument USING fts5(
+    EntityType UNINDEXED, EntityKey UNINDEXED, EntityID UNINDEXED, Title, Body, Detail UNINDEXED,
+    prefix = '2 3 4'
+);
+
+CREATE TRIGGER trg_search_participant_insert
+AFTER INSERT ON Participant
+FOR EACH ROW
+BEGIN
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Participant', CAST(NEW.ParticipantID AS TEXT), NEW.ParticipantID, NEW.Name,
+            NEW.ContactNumber || ' ' || NEW.EmergencyContactName || ' ' || NEW.EmergencyContactNumber,
+            'Emergency: ' || NEW.EmergencyContactName || ' ' || NEW.EmergencyContactNumber
+                || ' · Contact: ' || NEW.ContactNumber);
+END;
+
+CREATE TRIGGER trg_search_participant_update
+AFTER UPDATE ON Participant
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument WHERE EntityType = 'Participant' AND EntityKey = CAST(OLD.ParticipantID AS TEXT);
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Participant', CAST(NEW.ParticipantID AS TEXT), NEW.ParticipantID, NEW.Name,
+            NEW.ContactNumber || ' ' || NEW.EmergencyContactName || ' ' || NEW.EmergencyContactNumber,
+            'Emergency: ' || NEW.EmergencyContactName || ' ' || NEW.EmergencyContactNumber
+                || ' · Contact: ' || NEW.ContactNumber);
+END;
+
+CREATE TRIGGER trg_search_participant_delete
+AFTER DELETE ON Participant
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument WHERE EntityType = 'Participant' AND EntityKey = CAST(OLD.ParticipantID AS TEXT);
+END;
+
+CREATE TRIGGER trg_search_instructor_insert
+AFTER INSERT ON Instructor
+FOR EACH ROW
+BEGIN
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Instructor', CAST(NEW.InstructorID AS TEXT), NEW.InstructorID, NEW.Name, NEW.Expertise,
+            'Contact: ' || NEW.ContactNumber || ' · ' || IFNULL(NEW.ExperienceYears, 0) || ' yrs');
+END;
+
+CREATE TRIGGER trg_search_instructor_update
+AFTER UPDATE ON Instructor
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument WHERE EntityType = 'Instructor' AND EntityKey = CAST(OLD.InstructorID AS TEXT);
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Instructor', CAST(NEW.InstructorID AS TEXT), NEW.InstructorID, NEW.Name, NEW.Expertise,
+            'Contact: ' || NEW.ContactNumber || ' · ' || IFNULL(NEW.ExperienceYears, 0) || ' yrs');
+END;
+
+CREATE TRIGGER trg_search_instructor_delete
+AFTER DELETE ON Instructor
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument WHERE EntityType = 'Instructor' AND EntityKey = CAST(OLD.InstructorID AS TEXT);
+END;
+
+CREATE TRIGGER trg_search_injury_insert
+AFTER INSERT ON Injury
+FOR EACH ROW
+BEGIN
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Injury', NEW.ParticipantID || '|' || NEW.InjuryName || '|' || NEW.InjuryDate, NEW.ParticipantID,
+            NEW.InjuryName, NEW.Treatment,
+            NEW.Severity || ' · ' || NEW.InjuryDate || ' · participant #' || NEW.ParticipantID
+                || ' · activity #' || NEW.ActivityID);
+END;
+
+CREATE TRIGGER trg_search_injury_update
+AFTER UPDATE ON Injury
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument
+    WHERE EntityType = 'Injury' AND EntityKey = OLD.ParticipantID || '|' || OLD.InjuryName || '|' || OLD.InjuryDate;
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Injury', NEW.ParticipantID || '|' || NEW.InjuryName || '|' || NEW.InjuryDate, NEW.ParticipantID,
+            NEW.InjuryName, NEW.Treatment,
+            NEW.Severity || ' · ' || NEW.InjuryDate || ' · participant #' || NEW.ParticipantID
+                || ' · activity #' || NEW.ActivityID);
+END;
+
+CREATE TRIGGER trg_search_injury_delete
+AFTER DELETE ON Injury
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument
+    WHERE EntityType = 'Injury' AND EntityKey = OLD.ParticipantID || '|' || OLD.InjuryName || '|' || OLD.InjuryDate;
+END;
+
+CREATE TRIGGER trg_search_maintenance_insert
+AFTER INSERT ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Maintenance', CAST(NEW.MaintenanceID AS TEXT), NEW.MaintenanceID, IFNULL(NEW.Technician, ''),
+            NEW.Description,
+            NEW.MaintDate || ' · equipment #' || NEW.EquipmentID || ' · ' || IFNULL(NEW.Status, 'Ongoing'));
+END;
+
+CREATE TRIGGER trg_search_maintenance_update
+AFTER UPDATE ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument WHERE EntityType = 'Maintenance' AND EntityKey = CAST(OLD.MaintenanceID AS TEXT);
+    INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail)
+    VALUES ('Maintenance', CAST(NEW.MaintenanceID AS TEXT), NEW.MaintenanceID, IFNULL(NEW.Technician, ''),
+            NEW.Description,
+            NEW.MaintDate || ' · equipment #' || NEW.EquipmentID || ' · ' || IFNULL(NEW.Status, 'Ongoing'));
+END;
+
+CREATE TRIGGER trg_search_maintenance_delete
+AFTER DELETE ON MaintenanceLog
+FOR EACH ROW
+BEGIN
+    DELETE FROM SearchDocument WHERE EntityType = 'Maintenance' AND EntityKey = CAST(OLD.MaintenanceID AS TEXT);
+END;
+
+-- V010: tickets applied by the write-behind queue, for exactly-once recovery
+CREATE TABLE AppliedWrite (
+    Origin TEXT NOT NULL,
+    Ticket INTEGER NOT NULL,
+    AppliedAt TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Origin, Ticket)
+);
@@ -1,55 +1,16 @@
 import streamlit as st
-import pandas as pd
-import mysql.connector
-import config
+from adventureguard import layout
+from adventureguard.snapshot import EMPTY_SNAPSHOT, get_snapshot
 
 # ===========================================
 # MUST BE FIRST STREAMLIT COMMAND
 # ===========================================
-st.set_page_config(
-    page_title="AdventureGuard",
-    page_icon="🎽",
-    layout="wide"
-)
+layout.setup("AdventureGuard", "🎽", name="Home")
 
 # ===========================================
 # DARK MODE + SIDEBAR CSS
 # ===========================================
-dark_mode_css = """
-<style>
-
-    .stApp {
-        background-color: #0E1117 !important;
-        color: white !important;
-    }
-
-    section[data-testid="stSidebar"] {
-        background-color: #111418 !important;
-        padding-top: 10px !important;
-        padding-left: 18px !important;
-        padding-right: 12px !important;
-    }
-
-    section[data-testid="stSidebar"] p,
-    section[data-testid="stSidebar"] li,
-    section[data-testid="stSidebar"] div {
-        margin-bottom: 6px !important;
-        line-height: 1.35 !important;
-        font-size: 0.95rem !important;
-        color: #FFFFFF !important;
-    }
-
-    section[data-testid="stSidebar"] h2,
-    section[data-testid="stSidebar"] h3,
-    section[data-testid="stSidebar"] h4 {
-        margin-top: 12px !important;
-        margin-bottom: 6px !important;
-        color: white !important;
-    }
-
-</style>
-"""
-st.markdown(dark_mode_css, unsafe_allow_html=True)
+layout.apply_theme()
 
 
 # ===========================================
@@ -84,6 +45,7 @@ st.sidebar.markdown("""
 - 🛠 Maintenance Logs  
 - ⭐ Ratings  
 - 📈 Analytics & Reports  
+- 🔍 Search  
 """)
 
 st.sidebar.header("ℹ️ About")
@@ -97,38 +59,14 @@ st.sidebar.caption("Developed by **Shreya Gupta** | BITS Pilani Hyderabad Campus
 
 
 # ===========================================
-# DATABASE CONNECTION (YOUR VERSION)
+# DATABASE ACCESS (shared pool, see adventureguard/db.py)
 # ===========================================
-def get_db_connection():
-    try:
-        conn = mysql.connector.connect(
-            host=config.DB_HOST,
-            user=config.DB_USER,
-            password=config.DB_PASSWORD,
-            database=config.DB_NAME,
-            port=config.DB_PORT
-        )
-        return conn
-    except mysql.connector.Error as err:
-        st.error(f"Database connection failed: {err}")
-        return None
-
-
-conn = get_db_connection()
-
-
-
-
-# Helper to get values
-def get_value(sql):
+# Helper to get all tile counts in one round trip
+def load_snapshot():
     try:
-        cur = conn.cursor()
-        cur.execute(sql)
-        row = cur.fetchone()
-        cur.close()
-        return row[0] if row else 0
+        return get_snapshot(ttl=60)
     except:
-        return 0
+        return EMPTY_SNAPSHOT
 
 
 
@@ -205,11 +143,13 @@ st.header("📊 System Performance Snapshot")
 
 col1, col2, col3, col4, col5 = st.columns(5)
 
-col1.metric("Participants", get_value("SELECT COUNT(*) FROM Participant"))
-col2.metric("Activities", get_value("SELECT COUNT(*) FROM Activity"))
-col3.metric("Instructors", get_value("SELECT COUNT(*) FROM Instructor"))
-col4.metric("Equipment Items", get_value("SELECT COUNT(*) FROM Equipment"))
-col5.metric("Injuries Logged", get_value("SELECT COUNT(*) FROM Injury"))
+snap = load_snapshot()
+
+col1.metric("Participants", snap.participants)
+col2.metric("Activities", snap.activities)
+col3.metric("Instructors", snap.instructors)
+col4.metric("Equipment Items", snap.equipment)
+col5.metric("Injuries Logged", snap.injuries)
 
 st.caption("(Counts live from MySQL — growth numbers hidden for accuracy.)")
 
@@ -0,0 +1 @@
+"""Shared helpers for the AdventureGuard Streamlit pages."""
@@ -0,0 +1,362 @@
+"""
+Bulk CSV / Parquet import for the Add Data page.
+
+The uploaded file is streamed in chunks. Each chunk is validated with the
+same rules as the single-row forms and the validation triggers (10-digit
+contacts, ENUM domains, injury date not before the activity start, rating
+1-5), vectorized in pandas, before anything is sent to MySQL. Valid rows are
+inserted with ``executemany`` (which mysql.connector rewrites into multi-row
+VALUES) in one transaction per batch. If the server rejects a batch, that
+batch is retried row by row so every failing row is reported, not just the
+first.
+"""
+
+import datetime
+from typing import NamedTuple
+
+from adventureguard import db
+from adventureguard import enrollment
+from adventureguard.cache import tables_written
+from adventureguard.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+# Deadlock, lost connection: the server rolled back the whole transaction,
+# not just the failed statement, so the batch is retried from scratch
+TRANSACTION_LOST_ERRNOS = {1213, 2006, 2013, 2055}
+BATCH_ATTEMPTS = 3
+
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+EQUIPMENT_STATUSES = ["Working", "Under Maintenance", "Broken"]
+
+# Per-table import rules, mirroring Backend_DB/DataBase_SQL_Code and the forms
+TABLE_SPECS = {
+    "Participant": {
+        "columns": ["Name", "DOB", "ContactNumber", "EmergencyContactName", "EmergencyContactNumber"],
+        "required": ["Name", "DOB", "ContactNumber", "EmergencyContactName", "EmergencyContactNumber"],
+        "dates": ["DOB"],
+        "contacts": ["ContactNumber", "EmergencyContactNumber"],
+    },
+    "Instructor": {
+        "columns": ["Name", "ContactNumber", "ExperienceYears", "Expertise"],
+        "required": ["Name", "ContactNumber"],
+        "contacts": ["ContactNumber"],
+        "ints": ["ExperienceYears"],
+        "defaults": {"ExperienceYears": 0},
+    },
+    "Activity": {
+        "columns": ["ActivityName", "ActivityType", "StartDate", "EndDate", "Fees", "InstructorID"],
+        "required": ["ActivityName", "StartDate", "EndDate"],
+        "datetimes": ["StartDate", "EndDate"],
+        "numbers": ["Fees"],
+        "ints": ["InstructorID"],
+        "defaults": {"Fees": 0},
+    },
+    "Equipment": {
+        "columns": ["EquipmentType", "Status", "WarrantyExpiry", "DependsOnEquipmentID"],
+        "required": ["EquipmentType"],
+        "dates": ["WarrantyExpiry"],
+        "ints": ["DependsOnEquipmentID"],
+        "enums": {"Status": EQUIPMENT_STATUSES},
+        "defaults": {"Status": "Working"},
+    },
+    "MaintenanceLog": {
+        "columns": ["EquipmentID", "MaintDate", "Description", "Technician", "Cost"],
+        "required": ["EquipmentID", "MaintDate"],
+        "dates": ["MaintDate"],
+        "numbers": ["Cost"],
+        "ints": ["EquipmentID"],
+        "defaults": {"Cost": 0},
+    },
+    "Registers": {
+        "columns": ["ParticipantID", "ActivityID", "RegistrationDate", "PaymentStatus"],
+        "required": ["ParticipantID", "ActivityID"],
+        "dates": ["RegistrationDate"],
+        "ints": ["ParticipantID", "ActivityID"],
+        "enums": {"PaymentStatus": ["Yes", "No"]},
+        "defaults": {"PaymentStatus": "No", "RegistrationDate": datetime.date.today},
+    },
+    "Injury": {
+        "columns": ["ParticipantID", "ActivityID", "InjuryName", "InjuryDate", "Severity", "Treatment"],
+        "required": ["ParticipantID", "ActivityID", "InjuryName", "InjuryDate", "Severity"],
+        "dates": ["InjuryDate"],
+        "ints": ["ParticipantID", "ActivityID"],
+        "enums": {"Severity": SEVERITIES},
+    },
+    "Rating": {
+        "columns": ["ParticipantID", "InstructorID", "RatingValue", "Comments"],
+        "required": ["ParticipantID", "InstructorID", "RatingValue"],
+        "ints": ["ParticipantID", "InstructorID", "RatingValue"],
+        "ranges": {"RatingValue": (1, 5)},
+    },
+    "ActivityEquipment": {
+        "columns": ["ActivityID", "EquipmentID"],
+        "required": ["ActivityID", "EquipmentID"],
+        "ints": ["ActivityID", "EquipmentID"],
+    },
+}
+
+
+class ImportReport(NamedTuple):
+    inserted: int
+    rejects: "pd.DataFrame"  # Row, Reason + the offending input columns
+
+
+def insert_sql(table):
+    cols = TABLE_SPECS[table]["columns"]
+    return (
+        f"INSERT INTO {table} ({', '.join(cols)}) "
+        f"VALUES ({', '.join(['%s'] * len(cols))})"
+    )
+
+
+# ======================================================
+# READING
+# ======================================================
+def read_chunks(file, fmt, chunk_size=5000):
+    """Yield DataFrames of at most ``chunk_size`` rows, all columns as text."""
+    if fmt == "csv":
+        yield from pd.read_csv(
+            file, chunksize=chunk_size, dtype=str,
+            keep_default_na=False, na_values=[""], skipinitialspace=True,
+        )
+    elif fmt == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet import needs the 'pyarrow' package.")
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_size):
+            df = batch.to_pandas()
+            yield df.astype(object).where(df.notna(), None).map(
+                lambda v: v if v is None else str(v)
+            )
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+# ======================================================
+# VALIDATION (vectorized)
+# ======================================================
+def _activity_starts(activity_ids):
+    """``{ActivityID: start date}`` for the given ids (one query per chunk)."""
+    ids = sorted({int(a) for a in activity_ids})
+    if not ids:
+        return {}
+    rows = db.fetch_all(
+        f"SELECT ActivityID, DATE(StartDate) FROM Activity "
+        f"WHERE ActivityID IN ({', '.join(['%s'] * len(ids))})",
+        tuple(ids),
+    )
+    return {aid: start for aid, start in rows}
+
+
+def validate(table, chunk):
+    """
+    Split ``chunk`` into ``(clean, rejects)``.
+
+    ``clean`` has exactly the table's columns converted to Python/DB types;
+    ``rejects`` keeps the raw input plus a ``Reason`` column.
+    """
+    spec = TABLE_SPECS[table]
+    df = chunk.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+    reasons = pd.Series("", index=df.index)
+
+    def reject(mask, reason):
+        reasons[mask] += reason + "; "
+
+    for col in spec["columns"]:
+        if col not in df.columns:
+            df[col] = None
+        else:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str).str.strip())
+            df[col] = df[col].replace("", None)
+        default = spec.get("defaults", {}).get(col)
+        if default is not None:
+            df[col] = df[col].fillna(default() if callable(default) else default)
+
+    for col in spec.get("required", []):
+        reject(df[col].isna(), f"{col} is required")
+
+    for col in spec.get("contacts", []):
+        bad = df[col].notna() & ~df[col].astype(str).str.fullmatch(r"\d{10}")
+        reject(bad, f"{col} must be 10 digits")
+
+    for col in spec.get("dates", []):
+        parsed = pd.to_datetime(df[col], errors="coerce")
+        reject(df[col].notna() & parsed.isna(), f"{col} is not a valid date")
+        df[col] = parsed.dt.date
+
+    for col in spec.get("datetimes", []):
+        parsed = pd.to_datetime(df[col], errors="coerce")
+        reject(df[col].notna() & parsed.isna(), f"{col} is not a valid date/time")
+        df[col] = parsed
+
+    for col in spec.get("numbers", []) + spec.get("ints", []):
+        parsed = pd.to_numeric(df[col], errors="coerce")
+        reject(df[col].notna() & parsed.isna(), f"{col} is not a number")
+        if col in spec.get("ints", []):
+            reject(parsed.notna() & (parsed % 1 != 0), f"{col} must be a whole number")
+        if col in spec.get("numbers", []):
+            reject(parsed < 0, f"{col} cannot be negative")
+        df[col] = parsed
+
+    for col, allowed in spec.get("enums", {}).items():
+        # Case-insensitive like the trigger's UPPER() check, stored canonically
+        canonical = {a.upper(): a for a in allowed}
+        upper = df[col].astype(str).str.upper()
+        reject(df[col].notna() & ~upper.isin(list(canonical)), f"{col} must be one of {', '.join(allowed)}")
+        df[col] = upper.map(canonical).where(df[col].notna(), None)
+
+    for col, (low, high) in spec.get("ranges", {}).items():
+        reject(df[col].notna() & ((df[col] < low) | (df[col] > high)), f"{col} must be between {low} and {high}")
+
+    if table == "Injury":
+        # trg_injury_severity_check: injury date cannot precede the activity start
+        ok_ids = df["ActivityID"].notna() & (reasons == "")
+        starts = _activity_starts(df.loc[ok_ids, "ActivityID"])
+        start = pd.to_datetime(df["ActivityID"].map(lambda a: starts.get(int(a)) if pd.notna(a) else None))
+        reject(ok_ids & start.isna(), "ActivityID does not exist")
+        reject(
+            ok_ids & (pd.to_datetime(df["InjuryDate"]) < start),
+            "InjuryDate cannot be before the activity start date",
+        )
+
+    if table == "Activity":
+        reject(df["EndDate"] <= df["StartDate"], "EndDate must be after StartDate")
+
+    bad = reasons != ""
+    rejects = chunk.loc[bad].copy()
+    rejects.insert(0, "Reason", reasons[bad].str.rstrip("; "))
+    return df.loc[~bad, spec["columns"]], rejects
+
+
+# ======================================================
+# INSERTING
+# ======================================================
+def _to_rows(df):
+    def py(v):
+        if v is None or (not isinstance(v, str) and pd.isna(v)):
+            return None
+        if isinstance(v, pd.Timestamp):
+            return v.to_pydatetime()
+        if hasattr(v, "item"):
+            v = v.item()
+        if isinstance(v, float) and v.is_integer():
+            return int(v)
+        return v
+    return [tuple(py(v) for v in row) for row in df.itertuples(index=False, name=None)]
+
+
+def _transaction_lost(err):
+    return getattr(err, "errno", None) in TRANSACTION_LOST_ERRNOS
+
+
+def _rollback(conn):
+    try:
+        conn.rollback()
+    except db.Error:
+        pass  # the connection is gone; the server has rolled back already
+
+
+def _insert_rows(conn, sql, df, rows):
+    """
+    Insert row by row in one transaction, collecting the rows that fail.
+    Raises if an error lost the transaction: nothing of it is committed.
+    """
+    inserted, failures = 0, []
+    cur = conn.cursor()
+    try:
+        for idx, row in zip(df.index, rows):
+            try:
+                cur.execute(sql, row)
+                inserted += 1
+            except db.Error as e:
+                if _transaction_lost(e):
+                    raise
+                failures.append((idx, getattr(e, "msg", None) or str(e)))
+        conn.commit()
+    except Exception:
+        _rollback(conn)
+        raise
+    finally:
+        cur.close()
+    return inserted, failures
+
+
+def insert_batch(table, df):
+    """
+    Insert ``df`` in one transaction. Returns ``(inserted, failures)`` where
+    ``failures`` is ``[(index, message), ...]`` from a row-by-row retry if
+    the batch as a whole was rejected.
+    """
+    sql = insert_sql(table)
+    rows = _to_rows(df)
+    if not rows:
+        return 0, []
+
+    with db.connection() as conn:
+        cur = conn.cursor()
+        try:
+            with db.track("bulk", sql) as t:
+                if table == "Registers":
+                    # Counter deltas as one grouped UPDATE (migration V008)
+                    enrollment.insert_registrations(cur, rows)
+                else:
+                    cur.executemany(sql, rows)
+                conn.commit()
+                t.rows = len(rows)
+            return len(rows), []
+        except db.Error:
+            _rollback(conn)
+        finally:
+            cur.close()
+
+    # Isolate the offending rows; a failed statement only rolls back itself,
+    # unless it lost the whole transaction: then start the batch over
+    for _ in range(BATCH_ATTEMPTS):
+        try:
+            with db.track("bulk-retry", sql) as t, db.connection() as conn:
+                inserted, failures = _insert_rows(conn, sql, df, rows)
+                t.rows = inserted
+            return inserted, failures
+        except db.Error as e:
+            if not _transaction_lost(e):
+                raise
+            lost = getattr(e, "msg", None) or str(e)
+    return 0, [(idx, f"Batch rolled back: {lost}") for idx in df.index]
+
+
+def import_file(table, file, fmt, chunk_size=5000, batch_size=1000, progress=None):
+    """
+    Stream ``file`` into ``table``. ``progress(rows_seen, inserted)`` is called
+    after every batch. Returns an ``ImportReport``.
+    """
+    inserted, seen, reject_frames = 0, 0, []
+    try:
+        for chunk in read_chunks(file, fmt, chunk_size):
+            # 1-based data row numbers in the source file
+            chunk.index = range(seen + 1, seen + 1 + len(chunk))
+            seen += len(chunk)
+
+            clean, rejects = validate(table, chunk)
+            reject_frames.append(rejects)
+
+            for start in range(0, len(clean), batch_size):
+                batch = clean.iloc[start:start + batch_size]
+                n, failures = insert_batch(table, batch)
+                inserted += n
+                if failures:
+                    idx, msgs = zip(*failures)
+                    failed = chunk.loc[list(idx)].copy()
+                    failed.insert(0, "Reason", list(msgs))
+                    reject_frames.append(failed)
+                if progress:
+                    progress(seen, inserted)
+    finally:
+        db.get_query_cache().invalidate(tables_written(insert_sql(table)))
+        db.mark_written()
+
+    rejects = pd.concat(reject_frames) if reject_frames else pd.DataFrame(columns=["Reason"])
+    rejects.index.name = "Row"
+    return ImportReport(inserted, rejects.reset_index())
@@ -0,0 +1,137 @@
+"""
+In-memory query-result cache shared by all sessions of the app.
+
+Entries are keyed by SQL text + parameters, expire after a per-query TTL, are
+evicted least-recently-used once ``QUERY_CACHE_MAX_ENTRIES`` is reached, and
+are dropped per table whenever ``db.execute`` writes to that table.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import config
+
+
+# Tables a statement reads from / writes to. Good enough for the hand-written
+# SQL in this app; callers can always pass ``tables=`` explicitly.
+_READ_TABLES_RE = re.compile(r"\b(?:FROM|JOIN)\s+`?(\w+)`?", re.IGNORECASE)
+_WRITE_TABLE_RE = re.compile(
+    r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)`?",
+    re.IGNORECASE,
+)
+
+# Writes to these tables also change other tables through triggers
+# (see Backend_DB/DataBase_SQL_Code and Backend_DB/migrations).
+TRIGGER_SIDE_EFFECTS = {
+    "maintenancelog": {"equipment", "equipmentmaintenancestats", "changejournal", "searchdocument"},  # trg_update_equipment_status, trg_agg_maintenance_*, trg_journal_*, trg_search_*
+    "registers": {"activity", "activityparticipantstats", "changejournal"},         # trg_update_total_participants, trg_agg_registers_*, trg_journal_*
+    "rating": {"instructorratingstats", "changejournal"},                           # trg_agg_rating_*, trg_journal_*
+    "injury": {"participantinjurystats", "changejournal", "searchdocument"},        # trg_agg_injury_*, trg_journal_*, trg_search_*
+    "participant": {"searchdocument"},                                              # trg_search_*
+    "instructor": {"searchdocument"},                                               # trg_search_*
+}
+
+
+def tables_read(sql):
+    """Lower-cased names of the tables a SELECT reads."""
+    return {name.lower() for name in _READ_TABLES_RE.findall(sql)}
+
+
+def tables_written(sql):
+    """Lower-cased names of the tables a write statement changes, incl. trigger targets."""
+    match = _WRITE_TABLE_RE.match(sql)
+    if not match:
+        return set()
+    table = match.group(1).lower()
+    return {table} | TRIGGER_SIDE_EFFECTS.get(table, set())
+
+
+class QueryCache:
+    """Thread-safe TTL + LRU cache with per-table invalidation."""
+
+    def __init__(self, max_entries=256, default_ttl=60):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()     # key -> (expires_at, tables, value)
+        self._by_table = {}               # table -> set(keys)
+        self._versions = {}               # table -> write counter
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(sql, params=None):
+        return (" ".join(sql.split()), tuple(params) if params else ())
+
+    def get(self, key):
+        """Return ``(True, value)`` on a fresh hit, else ``(False, None)``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            expires_at, _, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key, value, tables, ttl=None, versions=None):
+        """
+        Store ``value``. With ``versions`` (``{table: version}`` taken before
+        the read), skip it if any of those tables was written meanwhile: the
+        value may predate the write.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            if versions and any(self.version(t) != v for t, v in versions.items()):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, frozenset(tables), value)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tables):
+        """Drop every entry that read from any of ``tables`` and bump their versions."""
+        with self._lock:
+            for table in tables:
+                table = table.lower()
+                self._versions[table] = self._versions.get(table, 0) + 1
+                for key in list(self._by_table.get(table, ())):
+                    self._remove(key)
+
+    def version(self, table):
+        """Counter that changes whenever ``table`` is written through the app."""
+        return self._versions.get(table.lower(), 0)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        _, tables, _ = self._entries.pop(key)
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+
+def new_query_cache():
+    return QueryCache(
+        max_entries=config.QUERY_CACHE_MAX_ENTRIES,
+        default_ttl=config.QUERY_CACHE_TTL,
+    )
@@ -0,0 +1,60 @@
+"""
+Cached Plotly figures for the Dashboard charts.
+
+A figure is cached under a digest of the aggregated frame it is drawn from,
+so a rerun with unchanged counts skips the Plotly Express build (and its
+validation) entirely. The cached object is a ``go.Figure``: handing
+``st.plotly_chart`` a figure rather than a dict spec lets Streamlit skip
+re-validating it and go straight to serialization. Categorical charts are
+capped at ``config.CHART_MAX_CATEGORIES`` bars (the rest folded into one
+"Other" bar) so thousands of activities never reach the browser.
+"""
+
+import hashlib
+
+import streamlit as st
+
+import config
+from adventureguard.cache import QueryCache
+from adventureguard.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    """Process-wide ``(chart, frame digest) -> go.Figure`` cache."""
+    return QueryCache(config.FIGURE_CACHE_MAX_ENTRIES, config.FIGURE_CACHE_TTL)
+
+
+def frame_digest(df):
+    """Stable hash of a frame's columns, dtypes and values."""
+    h = hashlib.sha1()
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def top_n(df, label, value, n=None, other="Other"):
+    """
+    Keep the ``n - 1`` largest rows by ``value`` and fold the rest into a
+    single ``other`` row (labelled with how many rows it stands for).
+    """
+    n = n or config.CHART_MAX_CATEGORIES
+    if len(df) <= n:
+        return df
+    ranked = df.sort_values(value, ascending=False)
+    head, tail = ranked.iloc[: n - 1], ranked.iloc[n - 1:]
+    rest = pd.DataFrame({label: [f"{other} ({len(tail):,} more)"], value: [tail[value].sum()]})
+    return pd.concat([head[[label, value]], rest], ignore_index=True)
+
+
+def cached_figure(name, df, build):
+    """``build(df)`` for chart ``name``, reused while ``df`` has the same content."""
+    cache = get_figure_cache()
+    key = (name, frame_digest(df))
+    hit, fig = cache.get(key)
+    if not hit:
+        fig = build(df)
+        cache.put(key, fig, ())
+    return fig
@@ -0,0 +1,379 @@
+"""
+Shared, pooled database access for every AdventureGuard page.
+
+Streamlit reruns each page script on every widget interaction, so opening a
+connection at module level means a new TCP + auth handshake per click. The
+pool below is created once per server process (``st.cache_resource``) and
+connections are always handed back to it when a ``with connection()`` block
+exits.
+
+Read helpers accept ``ttl=`` to serve results from the shared query cache
+(see ``adventureguard/cache.py``); ``execute`` invalidates the tables it
+writes. Every statement is timed and recorded by ``adventureguard/instrument.py``.
+
+Reads go to a healthy read replica when ``config.DB_REPLICAS`` lists any
+(see ``adventureguard/router.py``); writes always go to the primary, and a
+session that just wrote reads from the primary (bypassing the query cache)
+for ``config.READ_YOUR_WRITES_WINDOW`` seconds.
+
+With ``config.DB_ENGINE = "sqlite"`` the same helpers run against an
+embedded SQLite database instead (see ``adventureguard/sqlite_backend.py``);
+catch ``db.Error`` to handle a failed statement on either engine.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import NamedTuple
+
+import streamlit as st
+
+import config
+from adventureguard import sqlite_backend
+from adventureguard.cache import new_query_cache, tables_read, tables_written
+from adventureguard.instrument import Tracker, current_page, new_query_log
+from adventureguard.lazy import lazy_import
+from adventureguard.router import ReplicaRouter, replica_lag
+
+# Imported on first use (see adventureguard/lazy.py)
+pd = lazy_import("pandas")
+mysql = lazy_import("mysql")
+pooling = lazy_import("mysql.connector.pooling")
+
+
+def _errors():
+    return (mysql.connector.Error, sqlite_backend.Error)
+
+
+def __getattr__(name):
+    # ``db.Error`` is resolved when an ``except`` clause needs it, so
+    # importing this module does not load mysql.connector
+    if name == "Error":
+        return _errors()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ======================================================
+# POOL
+# ======================================================
+def is_sqlite():
+    return config.DB_ENGINE == "sqlite"
+
+
+def server_config(replica=None):
+    """Connection arguments for the primary, or for replica number ``replica``."""
+    server = dict(
+        host=config.DB_HOST,
+        user=config.DB_USER,
+        password=config.DB_PASSWORD,
+        database=config.DB_NAME,
+        port=config.DB_PORT,
+    )
+    if replica is not None:
+        server.update(config.DB_REPLICAS[replica])
+    return server
+
+
+@st.cache_resource(show_spinner=False)
+def get_pool():
+    """Create the process-wide connection pool (cached across reruns)."""
+    if is_sqlite():
+        return sqlite_backend.Pool(config.SQLITE_PATH, config.DB_POOL_SIZE, config.SQLITE_SAMPLE_DATA)
+    return pooling.MySQLConnectionPool(
+        pool_name=config.DB_POOL_NAME,
+        pool_size=config.DB_POOL_SIZE,
+        pool_reset_session=True,
+        **server_config(),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_replica_pool(index):
+    """Process-wide pool for read replica ``index``."""
+    return pooling.MySQLConnectionPool(
+        pool_name=f"{config.DB_POOL_NAME}-r{index}",
+        pool_size=config.DB_POOL_SIZE,
+        pool_reset_session=True,
+        **server_config(index),
+    )
+
+
+def _probe_replica(index):
+    conn = _checkout(get_replica_pool(index))
+    try:
+        conn.ping(reconnect=True, attempts=1, delay=0)
+        return replica_lag(conn)
+    finally:
+        conn.close()
+
+
+@st.cache_resource(show_spinner=False)
+def get_router():
+    """Process-wide replica health tracker."""
+    return ReplicaRouter(len(config.DB_REPLICAS), _probe_replica,
+                         config.REPLICA_MAX_LAG, config.REPLICA_HEALTH_INTERVAL)
+
+
+def _checkout(pool):
+    """Borrow a connection, waiting up to DB_POOL_TIMEOUT if the pool is exhausted."""
+    deadline = time.monotonic() + config.DB_POOL_TIMEOUT
+    while True:
+        try:
+            return pool.get_connection()
+        except (pooling.PoolError, sqlite_backend.PoolError):
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+
+# ======================================================
+# ROUTING (primary vs read replicas)
+# ======================================================
+_STICKY_KEY = "_db_primary_until"
+
+
+class Route(NamedTuple):
+    pool: object
+    replica: int = None         # None = primary
+    router: object = None
+
+
+def primary_route():
+    return Route(get_pool())
+
+
+def mark_written():
+    """Pin this session's reads to the primary for READ_YOUR_WRITES_WINDOW seconds."""
+    try:
+        st.session_state[_STICKY_KEY] = time.monotonic() + config.READ_YOUR_WRITES_WINDOW
+    except Exception:
+        pass  # no session (CLI / worker thread)
+
+
+def reads_pinned():
+    """True while this session must read its own writes from the primary."""
+    try:
+        return st.session_state.get(_STICKY_KEY, 0) > time.monotonic()
+    except Exception:
+        return False
+
+
+def read_route():
+    """Where the next read should go: a healthy replica, else the primary."""
+    if not config.DB_REPLICAS or is_sqlite() or reads_pinned():
+        return primary_route()
+    router = get_router()
+    index = router.choose()
+    if index is None:
+        return primary_route()
+    return Route(get_replica_pool(index), index, router)
+
+
+def _open(route):
+    try:
+        conn = _checkout(route.pool)
+    except pooling.PoolError:
+        if route.replica is None:
+            raise
+        return _open(primary_route())   # replica pool busy, not down
+    except mysql.connector.Error:
+        if route.replica is None:
+            raise
+        route.router.mark_down(route.replica)
+        return _open(primary_route())
+    try:
+        conn.ping(reconnect=True, attempts=3, delay=0)
+    except mysql.connector.Error:
+        conn.close()
+        if route.replica is None:
+            raise
+        route.router.mark_down(route.replica)
+        return _open(primary_route())
+    return conn
+
+
+@contextmanager
+def connection(route=None, read=False):
+    """
+    Yield a live pooled connection and always return it to the pool.
+
+    The connection is pinged (and transparently reconnected) on checkout so a
+    server-side idle timeout never surfaces as a failed page render. With
+    ``read=True`` it may come from a replica; an unreachable replica falls
+    back to the primary. Worker threads pass the ``route`` they were handed
+    instead of resolving one themselves.
+    """
+    route = route or (read_route() if read else primary_route())
+    conn = _open(route)
+    try:
+        yield conn
+    finally:
+        # close() on a pooled connection resets the session and puts it back
+        conn.close()
+
+
+@st.cache_resource(show_spinner=False)
+def get_query_cache():
+    """Process-wide query-result cache (shared across sessions and pages)."""
+    return new_query_cache()
+
+
+@st.cache_resource(show_spinner=False)
+def get_query_log():
+    """Process-wide ring buffer of query timings (see the Performance page)."""
+    return new_query_log()
+
+
+def set_page(name):
+    """Tag every query issued for the rest of this script run with ``name``."""
+    current_page.set(name)
+
+
+def track(kind, sql):
+    """Context manager that times and records one statement."""
+    return Tracker(get_query_log(), kind, sql)
+
+
+def _server_at(host, port):
+    """Connection arguments for whichever configured server is ``host:port``."""
+    for index in range(len(config.DB_REPLICAS)):
+        server = server_config(index)
+        if (server["host"], server["port"]) == (host, port):
+            return server
+    return server_config()
+
+
+def kill_query(connection_id, host=None, port=None):
+    """
+    Abort the statement running on ``connection_id`` of the server at
+    ``host:port`` (default: the primary); the connection itself stays open.
+    Uses a fresh, unpooled connection so a cancel never waits behind the busy
+    pool.
+    """
+    sql = f"KILL QUERY {int(connection_id)}"
+    with track("kill", sql):
+        if is_sqlite():
+            get_pool().interrupt(connection_id)
+            return
+        conn = mysql.connector.connect(**(_server_at(host, port) if host else server_config()))
+        try:
+            cur = conn.cursor()
+            cur.execute(sql)
+            cur.close()
+        finally:
+            conn.close()
+
+
+def ensure_connection():
+    """Show an error and stop the page if the database is unreachable."""
+    try:
+        with connection():
+            pass
+    except _errors() as err:
+        st.error(f"Database connection failed: {err}")
+        st.stop()
+
+
+# ======================================================
+# QUERY HELPERS
+# ======================================================
+def _run(kind, sql, params, ttl, tables, load):
+    """
+    Run ``load()`` through the instrumentation, serving it from the query
+    cache when a ``ttl`` is given.
+    """
+    with track(kind, sql) as t:
+        if ttl is None:
+            t.result = load()
+            return t.result
+        cache = get_query_cache()
+        key = (kind,) + cache.make_key(sql, params)
+        # A session reading its own writes must not see an older cached result
+        hit, value = (False, None) if reads_pinned() else cache.get(key)
+        t.cache = "hit" if hit else "miss"
+        if not hit:
+            tables = tables or tables_read(sql)
+            # A write invalidated while load() ran: put() drops the possibly stale result
+            versions = {table: cache.version(table) for table in tables}
+            value = load()
+            cache.put(key, value, tables, ttl, versions)
+        t.result = value
+        return value
+
+
+def read_sql(sql, params=None, ttl=None, tables=None):
+    """
+    Run a SELECT and return the result as a DataFrame.
+
+    With ``ttl`` (seconds) the result is cached until it expires or one of
+    ``tables`` (parsed from the SQL by default) is written.
+    """
+    def load():
+        with connection(read=True) as conn:
+            return pd.read_sql(sql, conn, params=params)
+
+    df = _run("df", sql, params, ttl, tables, load)
+    # Callers may modify the frame; never hand out the cached object itself
+    return df.copy() if ttl is not None else df
+
+
+def fetch_all(sql, params=None, dictionary=False, route=None):
+    """
+    Run a statement and return all rows (tuples, or dicts if requested).
+    ``route=primary_route()`` reads on the primary even when the session is
+    not pinned to it.
+    """
+    def load():
+        with connection(route, read=True) as conn:
+            cur = conn.cursor(dictionary=dictionary)
+            try:
+                cur.execute(sql, params)
+                return cur.fetchall()
+            finally:
+                cur.close()
+
+    return _run("rows", sql, params, None, None, load)
+
+
+def fetch_one(sql, params=None, dictionary=False, ttl=None, tables=None):
+    """Run a statement and return its first row, or None."""
+    def load():
+        with connection(read=True) as conn:
+            cur = conn.cursor(buffered=True, dictionary=dictionary)
+            try:
+                cur.execute(sql, params)
+                return cur.fetchone()
+            finally:
+                cur.close()
+
+    kind = "dict" if dictionary else "row"
+    return _run(kind, sql, params, ttl, tables, load)
+
+
+def fetch_value(sql, params=None, default=0, ttl=None, tables=None):
+    """Return the first column of the first row, or ``default``."""
+    row = fetch_one(sql, params, ttl=ttl, tables=tables)
+    return row[0] if row else default
+
+
+def list_tables():
+    """Names of the tables in the database."""
+    sql = sqlite_backend.LIST_TABLES if is_sqlite() else "SHOW TABLES"
+    return [row[0] for row in fetch_all(sql)]
+
+
+def execute(sql, params=None):
+    """Run a single write statement, commit it and invalidate cached reads of its table."""
+    with track("write", sql) as t, connection() as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute(sql, params)
+            conn.commit()
+            t.rows = cur.rowcount
+            return cur.rowcount
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+            get_query_cache().invalidate(tables_written(sql))
+            mark_written()
@@ -0,0 +1,182 @@
+"""
+Batch registration with exact ``Activity.TotalParticipants`` counters (migration V008).
+
+``enroll`` registers many participants, across any number of activities, in
+one transaction. It first locks the batch's Activity rows ``FOR UPDATE`` in
+ActivityID order: otherwise each insert's foreign-key check takes a shared
+lock on its activity, the grouped UPDATE then needs an exclusive one, and
+two concurrent batches on the same activity deadlock. The rows go in with
+one multi-row ``executemany`` while ``@batch_enrollment`` is set, which
+makes the per-row counter triggers skip them; the deltas are then applied
+once per batch:
+
+* one grouped ``UPDATE Activity ... CASE ActivityID`` for the paid counts,
+  touching each activity once;
+* one multi-row upsert of the V002 ``ActivityParticipantStats`` summary.
+
+On SQLite the per-row triggers simply run: there are no row locks to save.
+
+``reconcile`` recomputes every counter from ``Registers`` set-wise, reports
+the activities that had drifted and optionally corrects them:
+
+    python -m adventureguard.enrollment            # report drift
+    python -m adventureguard.enrollment --fix      # report and correct it
+"""
+
+import argparse
+import datetime
+from collections import Counter
+from typing import NamedTuple
+
+from adventureguard import db
+from adventureguard.cache import tables_written
+from adventureguard.migrations import connect
+
+# Column order of bulk_import.TABLE_SPECS["Registers"]
+INSERT = (
+    "INSERT INTO Registers (ParticipantID, ActivityID, RegistrationDate, PaymentStatus) "
+    "VALUES (%s, %s, %s, %s)"
+)
+
+DRIFT = """
+    SELECT a.ActivityID, a.ActivityName, a.TotalParticipants, COALESCE(c.Paid, 0) AS Paid
+    FROM Activity a
+    LEFT JOIN (
+        SELECT ActivityID, COUNT(*) AS Paid FROM Registers
+        WHERE PaymentStatus = 'Yes' GROUP BY ActivityID
+    ) c ON c.ActivityID = a.ActivityID
+    WHERE a.TotalParticipants IS NULL OR a.TotalParticipants <> COALESCE(c.Paid, 0)
+    ORDER BY a.ActivityID
+"""
+
+RECOMPUTE = """
+    UPDATE Activity
+    SET TotalParticipants = (
+        SELECT COUNT(*) FROM Registers r
+        WHERE r.ActivityID = Activity.ActivityID AND r.PaymentStatus = 'Yes'
+    )
+    WHERE ActivityID IN ({ids})
+"""
+
+
+class Drift(NamedTuple):
+    activity: int
+    name: str
+    stored: int                 # TotalParticipants before the fix (None if NULL)
+    actual: int                 # paid registrations
+
+
+def _lock_activities(cur, ids):
+    """Take the exclusive locks the counter update needs, in ActivityID order."""
+    cur.execute(
+        f"SELECT ActivityID FROM Activity WHERE ActivityID IN ({', '.join(['%s'] * len(ids))}) "
+        "ORDER BY ActivityID FOR UPDATE",
+        tuple(ids),
+    )
+    cur.fetchall()
+
+
+def _grouped_counter_update(cur, paid):
+    """Add ``{activity: n}`` to TotalParticipants in one statement."""
+    ids = sorted(paid)
+    cases = " ".join("WHEN %s THEN %s" for _ in ids)
+    cur.execute(
+        f"UPDATE Activity SET TotalParticipants = IFNULL(TotalParticipants, 0) + CASE ActivityID {cases} END "
+        f"WHERE ActivityID IN ({', '.join(['%s'] * len(ids))})",
+        tuple(v for a in ids for v in (a, paid[a])) + tuple(ids),
+    )
+
+
+def _grouped_stats_upsert(cur, paid, total):
+    ids = sorted(total)
+    cur.execute(
+        "INSERT INTO ActivityParticipantStats (ActivityID, PaidCount, TotalCount) "
+        f"VALUES {', '.join(['(%s, %s, %s)'] * len(ids))} "
+        "ON DUPLICATE KEY UPDATE PaidCount = PaidCount + VALUES(PaidCount), "
+        "TotalCount = TotalCount + VALUES(TotalCount)",
+        tuple(v for a in ids for v in (a, paid.get(a, 0), total[a])),
+    )
+
+
+def insert_registrations(cur, rows):
+    """
+    Insert ``(ParticipantID, ActivityID, RegistrationDate, PaymentStatus)``
+    rows and apply their counter deltas, inside the caller's transaction.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    if db.is_sqlite():
+        cur.executemany(INSERT, rows)
+        return len(rows)
+
+    paid = Counter(row[1] for row in rows if row[3] == "Yes")
+    total = Counter(row[1] for row in rows)
+    _lock_activities(cur, sorted(total))
+    cur.execute("SET @batch_enrollment = 1")
+    try:
+        cur.executemany(INSERT, rows)
+    finally:
+        cur.execute("SET @batch_enrollment = NULL")
+    if paid:
+        _grouped_counter_update(cur, paid)
+    _grouped_stats_upsert(cur, paid, total)
+    return len(rows)
+
+
+def enroll(registrations, registration_date=None):
+    """
+    Register ``(participant, activity[, payment_status])`` pairs in one
+    transaction; all or nothing. Returns the number of rows inserted.
+    """
+    day = registration_date or datetime.date.today()
+    rows = [(int(r[0]), int(r[1]), day, r[2] if len(r) > 2 else "No") for r in registrations]
+    with db.track("write", INSERT) as t, db.connection() as conn:
+        cur = conn.cursor()
+        try:
+            t.rows = insert_registrations(cur, rows)
+            conn.commit()
+            return t.rows
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+            db.get_query_cache().invalidate(tables_written(INSERT))
+            db.mark_written()
+
+
+def reconcile(conn, fix=False, log=print):
+    """The activities whose TotalParticipants drifted; with ``fix``, recompute them."""
+    cur = conn.cursor()
+    try:
+        cur.execute(DRIFT)
+        drift = [Drift(int(a), name, None if stored is None else int(stored), int(paid))
+                 for a, name, stored, paid in cur.fetchall()]
+        if fix and drift:
+            cur.execute(RECOMPUTE.format(ids=", ".join(["%s"] * len(drift))),
+                        tuple(d.activity for d in drift))
+            conn.commit()
+            log(f"Recomputed TotalParticipants for {len(drift):,} activities.")
+    finally:
+        cur.close()
+    return drift
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report (and fix) drift in Activity.TotalParticipants.")
+    parser.add_argument("--fix", action="store_true", help="recompute the drifted counters")
+    args = parser.parse_args()
+
+    conn = connect()
+    try:
+        drift = reconcile(conn, args.fix)
+        for d in drift:
+            print(f"#{d.activity:<6} {d.name:<30} stored {d.stored!s:>6}  actual {d.actual:>6}")
+        print(f"{len(drift):,} activities drifted")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
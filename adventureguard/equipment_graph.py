@@ -0,0 +1,201 @@
+"""
+Equipment dependency graph: what else goes down when an item does.
+
+``Equipment.DependsOnEquipmentID`` makes the fleet a forest (each item
+depends on at most one other). ``DependencyGraph`` holds it in memory as
+parent/children maps plus the equipment each activity needs
+(``ActivityEquipment``), so "what is transitively impacted by X" is a walk
+over X's dependents only and "which activities are blocked" a lookup per
+impacted item: both cost the size of the answer, not of the fleet.
+
+One graph is kept per server process and brought up to date before use:
+
+* new equipment (IDs past the highest loaded one) is appended, and the
+  status of every item that is not Working is re-read through
+  ``idx_equipment_status``, whenever the app wrote Equipment (its
+  ``QueryCache.version`` changed, which includes the maintenance triggers);
+* ``ActivityEquipment`` is reloaded when it was written;
+* everything is reloaded after ``config.EQUIPMENT_GRAPH_TTL`` seconds, to
+  pick up changes made outside the app (e.g. a re-pointed dependency).
+
+``would_cycle`` rejects a dependency that would close a loop; migration V006
+enforces the same rule in the database.
+"""
+
+import threading
+import time
+
+import streamlit as st
+
+import config
+from adventureguard import db
+
+EQUIPMENT = "SELECT EquipmentID, DependsOnEquipmentID, Status FROM Equipment"
+NEW_EQUIPMENT = EQUIPMENT + " WHERE EquipmentID > %s ORDER BY EquipmentID"
+NOT_WORKING = "SELECT EquipmentID, Status FROM Equipment WHERE Status <> 'Working'"
+ACTIVITY_EQUIPMENT = "SELECT ActivityID, EquipmentID FROM ActivityEquipment"
+
+
+class DependencyGraph:
+    """Equipment dependencies, statuses and the activities that use each item."""
+
+    def __init__(self):
+        self.parent = {}            # equipment -> equipment it depends on, or None
+        self.children = {}          # equipment -> [equipment that depends on it]
+        self.status = {}            # equipment -> Status
+        self.down = set()           # equipment whose own Status is not Working
+        self.activities = {}        # equipment -> {activity, ...}
+        self.max_id = 0
+        self._unusable = None       # memoized unusable()
+
+    def add(self, equipment, parent=None, status="Working"):
+        """Add (or update) one item."""
+        if equipment in self.parent:
+            self.set_parent(equipment, parent)
+        else:
+            self.parent[equipment] = parent
+            if parent is not None:
+                self.children.setdefault(parent, []).append(equipment)
+            self.max_id = max(self.max_id, equipment)
+        self.set_status(equipment, status)
+
+    def set_parent(self, equipment, parent):
+        if parent is not None and self.would_cycle(equipment, parent):
+            raise ValueError(f"Equipment {equipment} cannot depend on {parent}: that would form a cycle.")
+        old = self.parent.get(equipment)
+        if old == parent:
+            return
+        if old is not None:
+            self.children[old].remove(equipment)
+        if parent is not None:
+            self.children.setdefault(parent, []).append(equipment)
+        self.parent[equipment] = parent
+        self._unusable = None
+
+    def set_status(self, equipment, status):
+        if self.status.get(equipment) == status:
+            return
+        self.status[equipment] = status
+        if status == "Working":
+            self.down.discard(equipment)
+        else:
+            self.down.add(equipment)
+        self._unusable = None
+
+    def set_down(self, statuses):
+        """Replace the set of non-Working items with ``{equipment: status}``."""
+        for equipment in self.down - statuses.keys():
+            self.set_status(equipment, "Working")
+        for equipment, status in statuses.items():
+            if equipment in self.status:
+                self.set_status(equipment, status)
+
+    def link(self, activity, equipment):
+        self.activities.setdefault(equipment, set()).add(activity)
+
+    def would_cycle(self, equipment, parent):
+        """True if making ``equipment`` depend on ``parent`` would close a loop."""
+        node, steps = parent, 0
+        while node is not None:
+            if node == equipment:
+                return True
+            node = self.parent.get(node)
+            steps += 1
+            if steps > len(self.parent):
+                return True         # the chain above already loops
+        return False
+
+    def impacted(self, equipment):
+        """Equipment that transitively depends on ``equipment`` (not including it)."""
+        out, seen = [], {equipment}
+        stack = list(self.children.get(equipment, ()))
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            out.append(node)
+            stack.extend(self.children.get(node, ()))
+        return out
+
+    def blocked_activities(self, equipment):
+        """Activities that need ``equipment`` or anything depending on it."""
+        blocked = set(self.activities.get(equipment, ()))
+        for node in self.impacted(equipment):
+            blocked.update(self.activities.get(node, ()))
+        return blocked
+
+    def unusable(self):
+        """``{equipment: cause}``: every item that is down or depends on one that is."""
+        if self._unusable is None:
+            result = {}
+            for cause in list(self.down):
+                result[cause] = cause
+                for node in self.impacted(cause):
+                    result.setdefault(node, cause)
+            self._unusable = result
+        return self._unusable
+
+    def blocked_now(self):
+        """``{activity: [unusable equipment it needs]}`` under the current statuses."""
+        blocked = {}
+        for equipment in self.unusable():
+            for activity in self.activities.get(equipment, ()):
+                blocked.setdefault(activity, []).append(equipment)
+        return blocked
+
+
+def build(equipment_rows, activity_rows):
+    """A graph from ``(id, depends_on, status)`` and ``(activity, equipment)`` rows."""
+    graph = DependencyGraph()
+    for equipment, parent, status in equipment_rows:
+        graph.parent[int(equipment)] = None if parent is None else int(parent)
+        graph.status[int(equipment)] = status
+        if status != "Working":
+            graph.down.add(int(equipment))
+    for equipment, parent in graph.parent.items():
+        if parent is not None:
+            graph.children.setdefault(parent, []).append(equipment)
+    graph.max_id = max(graph.parent, default=0)
+    for activity, equipment in activity_rows:
+        graph.link(int(activity), int(equipment))
+    return graph
+
+
+# ======================================================
+# PROCESS-WIDE GRAPH
+# ======================================================
+@st.cache_resource(show_spinner=False)
+def _graph_store():
+    """Process-wide ``{"graph": (graph, built_at, versions)}`` plus its lock."""
+    return {}, threading.Lock()
+
+
+def _versions():
+    cache = db.get_query_cache()
+    return cache.version("Equipment"), cache.version("ActivityEquipment")
+
+
+def get_graph():
+    """The up-to-date process-wide ``DependencyGraph``."""
+    store, lock = _graph_store()
+    with lock:
+        graph, built_at, (eq_version, ae_version) = store.get("graph", (None, 0, (None, None)))
+        now = _versions()
+        # A new version means a write on the primary that a replica may not have yet
+        primary = db.primary_route()
+        if graph is None or time.monotonic() - built_at >= config.EQUIPMENT_GRAPH_TTL:
+            graph = build(db.fetch_all(EQUIPMENT, route=primary),
+                          db.fetch_all(ACTIVITY_EQUIPMENT, route=primary))
+            built_at = time.monotonic()
+        else:
+            if now[0] != eq_version:
+                for equipment, parent, status in db.fetch_all(NEW_EQUIPMENT, (graph.max_id,), route=primary):
+                    graph.add(int(equipment), None if parent is None else int(parent), status)
+                graph.set_down({int(e): s for e, s in db.fetch_all(NOT_WORKING, route=primary)})
+            if now[1] != ae_version:
+                graph.activities = {}
+                for activity, equipment in db.fetch_all(ACTIVITY_EQUIPMENT, route=primary):
+                    graph.link(int(activity), int(equipment))
+        store["graph"] = (graph, built_at, now)
+        return graph
@@ -0,0 +1,311 @@
+"""
+Constant-memory CSV / Parquet / NDJSON export of any table or report.
+
+``stream`` runs the query on an unbuffered cursor, so rows stay on the
+server until fetched, and pulls them ``config.EXPORT_CHUNK_ROWS`` at a time.
+Each chunk is encoded and yielded as bytes before the next is fetched:
+
+* CSV: a header line, then one block of lines per chunk;
+* NDJSON: one JSON object per row;
+* Parquet: one row group per chunk, written through ``pq.ParquetWriter``
+  into a sink that is drained after every group. The schema comes from the
+  first chunk, widened so later chunks fit (INT -> int64, DECIMAL ->
+  decimal128(38, s), all-NULL -> string).
+
+Memory is therefore bounded by one chunk whatever the table size, and the
+first bytes are out after the first round trip. Tables are read in
+primary-key order (see ``table_browser.select_sql``); reports run their SQL
+as is. Exports read from a replica when one is configured.
+
+An abandoned stream (client gone, download cancelled) ``KILL QUERY``s its
+statement so the pooled connection is not left draining millions of rows.
+
+Streamlit's ``download_button`` holds its payload in memory, so the pages
+stream to a file under ``config.EXPORT_DIR`` and only offer a browser
+download up to ``config.EXPORT_DOWNLOAD_MAX_MB``. For anything bigger, use
+the CLI, which streams straight to a file or stdout:
+
+    python -m adventureguard.export Registers --format parquet -o registers.parquet
+    python -m adventureguard.export paid_participants --format csv -o - | gzip > paid.csv.gz
+"""
+
+import argparse
+import csv
+import datetime
+import decimal
+import io
+import json
+import os
+import sys
+import uuid
+
+import streamlit as st
+
+import config
+from adventureguard import db
+from adventureguard import queries
+from adventureguard import table_browser
+from adventureguard.migrations import connect
+
+# format -> (MIME type, file extension)
+FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "ndjson": ("application/x-ndjson", ".ndjson"),
+}
+
+
+# ======================================================
+# ENCODERS (one chunk of rows -> bytes)
+# ======================================================
+class CsvEncoder:
+    def __init__(self, columns):
+        self.columns = columns
+
+    def _lines(self, rows):
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerows(rows)
+        return buf.getvalue().encode("utf-8")
+
+    def header(self):
+        return self._lines([self.columns])
+
+    def encode(self, rows):
+        return self._lines(rows)
+
+    def finish(self):
+        return b""
+
+
+def _json_value(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)               # keep the exact DECIMAL digits
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", "replace")
+    return str(value)
+
+
+class NdjsonEncoder(CsvEncoder):
+    def header(self):
+        return b""
+
+    def encode(self, rows):
+        return "".join(
+            json.dumps(dict(zip(self.columns, row)), default=_json_value, ensure_ascii=False) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last ``drain``."""
+
+    def __init__(self):
+        self._parts = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self):
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+class ParquetEncoder:
+    def __init__(self, columns):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs the 'pyarrow' package.")
+        self.pa, self.pq = pa, pq
+        self.columns = columns
+        self.schema = None
+        self.writer = None
+        self.sink = _Sink()
+
+    def _infer(self, rows):
+        pa = self.pa
+        fields = []
+        for i, name in enumerate(self.columns):
+            inferred = pa.array([row[i] for row in rows]).type
+            if pa.types.is_null(inferred):
+                inferred = pa.string()
+            elif pa.types.is_integer(inferred):
+                inferred = pa.int64()
+            elif pa.types.is_decimal(inferred):
+                inferred = pa.decimal128(38, inferred.scale)
+            fields.append(pa.field(name, inferred))
+        return pa.schema(fields)
+
+    def _open(self, schema):
+        self.schema = schema
+        self.writer = self.pq.ParquetWriter(self.sink, schema)
+
+    def header(self):
+        return b""
+
+    def encode(self, rows):
+        pa = self.pa
+        if self.writer is None:
+            self._open(self._infer(rows))
+        arrays = []
+        for i, field in enumerate(self.schema):
+            values = [row[i] for row in rows]
+            if pa.types.is_string(field.type):
+                values = [v if v is None or isinstance(v, str) else _json_value(v) for v in values]
+            try:
+                arrays.append(pa.array(values, type=field.type))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+                # The schema is fixed by the first row group (e.g. SQLite
+                # returned INTEGER there and REAL here for a DECIMAL column)
+                raise RuntimeError(f"Column {field.name} does not fit the Parquet type {field.type} "
+                                   f"inferred from the first chunk; export it as CSV or NDJSON.")
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        return self.sink.drain()
+
+    def finish(self):
+        if self.writer is None:     # no rows: still a valid, empty file
+            self._open(self.pa.schema([(name, self.pa.string()) for name in self.columns]))
+        self.writer.close()
+        return self.sink.drain()
+
+
+ENCODERS = {"csv": CsvEncoder, "parquet": ParquetEncoder, "ndjson": NdjsonEncoder}
+
+
+# ======================================================
+# STREAMING
+# ======================================================
+def _stream(conn, sql, params, fmt, chunk_rows, counted):
+    cur = conn.cursor(buffered=False)
+    finished = False
+    try:
+        cur.execute(sql, params or None)
+        encoder = ENCODERS[fmt]([d[0] for d in cur.description])
+        yield encoder.header()
+        while True:
+            rows = cur.fetchmany(chunk_rows)
+            if not rows:
+                break
+            counted(len(rows))
+            yield encoder.encode(rows)
+        yield encoder.finish()
+        finished = True
+    finally:
+        if not finished and not db.is_sqlite():
+            # Unread rows would otherwise be drained (or refused) on close
+            try:
+                db.kill_query(conn.connection_id, conn.server_host, conn.server_port)
+                conn.consume_results()
+            except db.Error:
+                pass
+        cur.close()
+
+
+def stream(sql, params=None, fmt="csv", chunk_rows=None, conn=None):
+    """
+    Yield ``sql``'s result encoded as ``fmt``, one chunk of rows at a time.
+    Uses ``conn`` if given, otherwise a pooled (replica-routed) connection.
+    """
+    if fmt not in ENCODERS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    chunk_rows = chunk_rows or config.EXPORT_CHUNK_ROWS
+    if conn is not None:
+        yield from _stream(conn, sql, params, fmt, chunk_rows, lambda n: None)
+        return
+    with db.track("export", sql) as t, db.connection(read=True) as pooled:
+        t.rows = 0
+
+        def counted(n):
+            t.rows += n
+
+        yield from _stream(pooled, sql, params, fmt, chunk_rows, counted)
+
+
+def write_file(path, sql, params=None, fmt="csv", conn=None):
+    """Stream the export into ``path`` (replaced atomically). Returns its size in bytes."""
+    tmp = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            for data in stream(sql, params, fmt, conn=conn):
+                f.write(data)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return os.path.getsize(path)
+
+
+def source_sql(name, materialized=False):
+    """``(sql, params)`` for a report key or a table name."""
+    for report in queries.REPORTS:
+        if report.key == name:
+            return (report.materialized_sql if materialized and report.materialized_sql else report.sql), ()
+    return table_browser.select_sql(name)
+
+
+# ======================================================
+# PAGE WIDGET
+# ======================================================
+def export_section(name, sql, params=(), key="export"):
+    """Format picker + export button + download (View Tables / Complex Queries pages)."""
+    col1, col2 = st.columns([1, 3])
+    fmt = col1.selectbox("Format", list(FORMATS), key=f"{key}_format")
+    if col2.button("⬇️ Export", key=f"{key}_run"):
+        os.makedirs(config.EXPORT_DIR, exist_ok=True)
+        path = os.path.join(config.EXPORT_DIR,
+                            f"{name}_{datetime.datetime.now():%Y%m%d_%H%M%S}{FORMATS[fmt][1]}")
+        try:
+            with st.spinner("Exporting..."):
+                st.session_state[key] = (path, write_file(path, sql, params, fmt), fmt)
+        except (db.Error, RuntimeError) as e:
+            st.error(f"Export failed: {e}")
+
+    done = st.session_state.get(key)
+    if done is None or not os.path.exists(done[0]):
+        return
+    path, size, fmt = done
+    if size <= config.EXPORT_DOWNLOAD_MAX_MB * 1024 * 1024:
+        with open(path, "rb") as f:
+            st.download_button(f"Download {os.path.basename(path)} ({size / 1024:,.0f} KB)", f,
+                               file_name=os.path.basename(path), mime=FORMATS[fmt][0], key=f"{key}_download")
+    else:
+        st.info(f"{size / 1024 / 1024:,.0f} MB written to `{path}` on the server: too large for a browser "
+                f"download. Copy it from there, or use `python -m adventureguard.export`.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a table or report to CSV / Parquet / NDJSON.")
+    parser.add_argument("source", help="table name or report key "
+                                       f"({', '.join(r.key for r in queries.REPORTS)})")
+    parser.add_argument("--format", choices=list(FORMATS), default="csv")
+    parser.add_argument("-o", "--output", default="-", help="output file, or - for stdout (default)")
+    parser.add_argument("--materialized", action="store_true", help="read a report from its V004 table")
+    args = parser.parse_args()
+
+    conn = connect()
+    try:
+        sql, params = source_sql(args.source, args.materialized)
+        if args.output == "-":
+            for data in stream(sql, params, args.format, conn=conn):
+                sys.stdout.buffer.write(data)
+        else:
+            size = write_file(args.output, sql, params, args.format, conn=conn)
+            print(f"Wrote {size:,} bytes to {args.output}", file=sys.stderr)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Query instrumentation: every statement that goes through ``adventureguard.db``
+is recorded here with its wall time, rows returned, approximate result size,
+originating page and cache outcome.
+
+Records live in a bounded in-memory ring buffer (shared by all sessions) and
+are optionally appended to a JSONL file (``config.QUERY_LOG_PATH``). The
+Performance page reads the ring buffer.
+"""
+
+import contextvars
+import json
+import sys
+import threading
+import time
+from collections import deque
+
+import config
+
+# Set by each page (db.set_page) so records know where they came from
+current_page = contextvars.ContextVar("current_page", default="(unknown)")
+
+SQL_PREVIEW_CHARS = 300
+
+
+def normalize_sql(sql):
+    """Collapse whitespace so the same statement always looks the same."""
+    return " ".join(str(sql).split())
+
+
+def approx_size(result):
+    """Rough in-memory size of a query result in bytes (cheap, sampled)."""
+    if result is None:
+        return 0
+    if hasattr(result, "memory_usage"):
+        return int(result.memory_usage(index=False).sum())
+    if isinstance(result, (list, tuple)):
+        if not result:
+            return sys.getsizeof(result)
+        sample = result[:50]
+        per_row = sum(
+            sys.getsizeof(row) + sum(sys.getsizeof(v) for v in (row.values() if isinstance(row, dict) else row))
+            if isinstance(row, (list, tuple, dict)) else sys.getsizeof(row)
+            for row in sample
+        ) / len(sample)
+        return int(per_row * len(result)) if isinstance(result, list) else int(per_row)
+    return sys.getsizeof(result)
+
+
+def row_count(result):
+    if result is None:
+        return 0
+    if hasattr(result, "shape"):
+        return int(result.shape[0])
+    if isinstance(result, list):
+        return len(result)
+    return 1
+
+
+class QueryLog:
+    """Thread-safe ring buffer of query records with optional JSONL sink."""
+
+    def __init__(self, capacity=2000, path=None):
+        self._records = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.path = path
+        self._file = None
+        self._file_lock = threading.Lock()      # only writers wait on the file, never readers
+
+    def record(self, **rec):
+        with self._lock:
+            self._records.append(rec)
+        if self.path:
+            line = json.dumps(rec, default=str) + "\n"
+            with self._file_lock:
+                if self._file is None:
+                    self._file = open(self.path, "a", encoding="utf-8", buffering=1)   # line-buffered
+                self._file.write(line)
+
+    def records(self):
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+def new_query_log():
+    return QueryLog(config.QUERY_LOG_CAPACITY, config.QUERY_LOG_PATH)
+
+
+class Tracker:
+    """
+    Times one statement. Use as a context manager and set ``result`` (or
+    ``rows``) and ``cache`` before leaving; errors are recorded and re-raised.
+    """
+
+    def __init__(self, log, kind, sql):
+        self.log = log
+        self.kind = kind
+        self.sql = sql
+        self.result = None
+        self.rows = None
+        self.cache = "off"
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        ms = (time.perf_counter() - self._start) * 1000
+        self.log.record(
+            ts=time.time(),
+            page=current_page.get(),
+            kind=self.kind,
+            sql=normalize_sql(self.sql)[:SQL_PREVIEW_CHARS],
+            ms=round(ms, 3),
+            rows=self.rows if self.rows is not None else row_count(self.result),
+            bytes=approx_size(self.result),
+            cache=self.cache,
+            error=f"{exc_type.__name__}: {exc}" if exc_type else None,
+        )
+        return False
@@ -0,0 +1,59 @@
+"""
+Page setup shared by ``Home.py`` and every page under ``pages/``.
+
+``setup`` must be the first Streamlit call of a page: it sets the page
+config and tags the page's queries for the Performance page. ``apply_theme``
+injects the dark-mode + sidebar CSS.
+
+Importing this module is cheap (no pandas / plotly / mysql.connector, see
+``adventureguard/lazy.py``), so even a static page can use it.
+"""
+
+import streamlit as st
+
+from adventureguard import db
+
+DARK_MODE_CSS = """
+<style>
+
+    .stApp {
+        background-color: #0E1117 !important;
+        color: white !important;
+    }
+
+    section[data-testid="stSidebar"] {
+        background-color: #111418 !important;
+        padding-top: 10px !important;
+        padding-left: 18px !important;
+        padding-right: 12px !important;
+    }
+
+    section[data-testid="stSidebar"] p,
+    section[data-testid="stSidebar"] li,
+    section[data-testid="stSidebar"] div {
+        margin-bottom: 6px !important;
+        line-height: 1.35 !important;
+        font-size: 0.95rem !important;
+        color: #FFFFFF !important;
+    }
+
+    section[data-testid="stSidebar"] h2,
+    section[data-testid="stSidebar"] h3,
+    section[data-testid="stSidebar"] h4 {
+        margin-top: 12px !important;
+        margin-bottom: 6px !important;
+        color: white !important;
+    }
+
+</style>
+"""
+
+
+def setup(title, icon=None, name=None):
+    """``st.set_page_config`` (wide layout) and ``db.set_page(name or title)``."""
+    st.set_page_config(page_title=title, page_icon=icon, layout="wide")
+    db.set_page(name or title)
+
+
+def apply_theme():
+    st.markdown(DARK_MODE_CSS, unsafe_allow_html=True)
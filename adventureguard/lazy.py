@@ -0,0 +1,57 @@
+"""
+Deferred imports of the heavy dependencies (pandas, plotly, mysql.connector).
+
+A fresh Streamlit worker pays for every module the first page run imports:
+pandas alone is ~0.5 s, plotly.express ~0.35 s. Modules and pages bind them
+with ``lazy_import`` instead, so the real import happens on first attribute
+access and a page only pays for what it actually renders:
+
+    pd = lazy_import("pandas")
+    px = lazy_import("plotly.express")
+    mysql = lazy_import("mysql")        # mysql.connector.Error, mysql.connector.connect(...)
+
+The placeholder is never put in ``sys.modules``: anything else importing the
+package gets the real module, and ``loaded`` tells whether it has been paid
+for yet (see ``benchmarks/startup.py``). Annotations evaluated at import time
+(NamedTuple fields, signatures) must be strings, e.g. ``"pd.DataFrame"``.
+"""
+
+import importlib
+import sys
+import types
+
+# Imports a page should not pay for until it renders them
+HEAVY_MODULES = ("pandas", "plotly", "mysql.connector", "pyarrow", "numpy")
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for module ``name`` until one of its attributes is used."""
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        module = importlib.import_module(self.__name__)    # thread-safe, cached in sys.modules
+        try:
+            return getattr(module, attr)
+        except AttributeError:
+            pass
+        # A submodule its package does not import itself (mysql -> mysql.connector)
+        try:
+            return importlib.import_module(f"{self.__name__}.{attr}")
+        except ModuleNotFoundError as e:
+            if e.name != f"{self.__name__}.{attr}":
+                raise
+            raise AttributeError(f"module {self.__name__!r} has no attribute {attr!r}") from None
+
+    def __repr__(self):
+        return f"<lazy module {self.__name__!r}>"
+
+
+def lazy_import(name):
+    """``name`` if it is already imported, otherwise a ``LazyModule`` for it."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def loaded(name):
+    """True once module ``name`` has really been imported."""
+    return name in sys.modules
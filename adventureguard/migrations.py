@@ -0,0 +1,143 @@
+"""
+Versioned schema migrations for the ADVENTURE database.
+
+Migrations live in ``Backend_DB/migrations`` as ``V<NNN>__<name>.sql`` and are
+applied in version order, each exactly once. Applied versions are recorded
+in the ``schema_migrations`` table. Scripts may use ``DELIMITER`` blocks just
+like ``Backend_DB/DataBase_SQL_Code``.
+
+    python -m adventureguard.migrations            # apply pending migrations
+    python -m adventureguard.migrations --list     # show status
+"""
+
+import argparse
+import os
+import re
+
+import config
+from adventureguard.lazy import lazy_import
+
+mysql = lazy_import("mysql")    # only the CLIs and the MySQL pool need it
+
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Backend_DB", "migrations"
+)
+_FILE_RE = re.compile(r"^V(\d+)__(\w+)\.sql$")
+
+
+def connect():
+    return mysql.connector.connect(
+        host=config.DB_HOST,
+        user=config.DB_USER,
+        password=config.DB_PASSWORD,
+        database=config.DB_NAME,
+        port=config.DB_PORT,
+    )
+
+
+def available():
+    """``[(version, name, path), ...]`` for every migration file, in order."""
+    found = []
+    for fname in os.listdir(MIGRATIONS_DIR):
+        match = _FILE_RE.match(fname)
+        if match:
+            found.append((int(match.group(1)), match.group(2), os.path.join(MIGRATIONS_DIR, fname)))
+    return sorted(found)
+
+
+def split_statements(script):
+    """Split a SQL script into statements, honouring ``DELIMITER`` lines."""
+    statements, buf, delimiter = [], [], ";"
+    for line in script.splitlines():
+        stripped = line.strip()
+        if stripped.upper().startswith("DELIMITER "):
+            delimiter = stripped.split(None, 1)[1]
+            continue
+        if not buf and (not stripped or stripped.startswith("--")):
+            continue
+        if stripped.endswith(delimiter):
+            buf.append(line.rstrip()[: -len(delimiter)])
+            stmt = "\n".join(buf).strip()
+            if stmt:
+                statements.append(stmt)
+            buf = []
+        else:
+            buf.append(line)
+    tail = "\n".join(buf).strip()
+    if tail:
+        statements.append(tail)
+    return statements
+
+
+def _ensure_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            Version INT PRIMARY KEY,
+            Name VARCHAR(100) NOT NULL,
+            AppliedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def applied_versions(conn):
+    cur = conn.cursor()
+    _ensure_table(cur)
+    cur.execute("SELECT Version FROM schema_migrations")
+    versions = {row[0] for row in cur.fetchall()}
+    cur.close()
+    return versions
+
+
+def apply_file(conn, path):
+    """Run every statement of one migration file (DDL auto-commits in MySQL)."""
+    with open(path, encoding="utf-8") as f:
+        statements = split_statements(f.read())
+    cur = conn.cursor()
+    try:
+        for stmt in statements:
+            cur.execute(stmt)
+            if cur.with_rows:
+                cur.fetchall()
+        conn.commit()
+    finally:
+        cur.close()
+
+
+def migrate(conn, target=None, log=print):
+    """Apply pending migrations up to ``target`` (inclusive). Returns versions applied."""
+    done = applied_versions(conn)
+    applied = []
+    for version, name, path in available():
+        if version in done or (target is not None and version > target):
+            continue
+        log(f"Applying V{version:03d} {name} ...")
+        apply_file(conn, path)
+        cur = conn.cursor()
+        cur.execute("INSERT INTO schema_migrations (Version, Name) VALUES (%s, %s)", (version, name))
+        conn.commit()
+        cur.close()
+        applied.append(version)
+    return applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply ADVENTURE schema migrations.")
+    parser.add_argument("--list", action="store_true", help="show migration status and exit")
+    parser.add_argument("--target", type=int, help="stop after this version")
+    args = parser.parse_args()
+
+    conn = connect()
+    try:
+        if args.list:
+            done = applied_versions(conn)
+            for version, name, _ in available():
+                print(f"[{'x' if version in done else ' '}] V{version:03d} {name}")
+            return
+        applied = migrate(conn, args.target)
+        print(f"Applied {len(applied)} migration(s)." if applied else "Schema is up to date.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
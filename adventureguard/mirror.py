@@ -0,0 +1,221 @@
+"""
+Columnar analytics mirror: the nine ADVENTURE tables as local Parquet files,
+queried in-process with DuckDB.
+
+``sync`` snapshots MySQL into ``config.MIRROR_DIR`` (one ``<Table>.parquet``
+per table plus ``_state.json``):
+
+* Participant and Instructor (insert-only from the app) append rows past
+  the highest mirrored primary key;
+* every other table is copied in full. The V004 change journal only records
+  the keys the report columns depend on (an edit of Injury.Severity or
+  MaintenanceLog.Status journals nothing), and report_refresh consumes it,
+  so it cannot tell the mirror which rows changed.
+
+With ``full=True`` every table is copied in full.
+Files are replaced atomically, so readers never see a half-written table.
+``query`` runs the pages' SQL unchanged against DuckDB views over the files.
+
+    python -m adventureguard.mirror            # sync (appends new people)
+    python -m adventureguard.mirror --full     # copy everything
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+import streamlit as st
+
+import config
+from adventureguard import db
+from adventureguard.instrument import Tracker
+from adventureguard.lazy import lazy_import
+from adventureguard.migrations import connect
+
+pd = lazy_import("pandas")
+
+STATE_FILE = "_state.json"
+
+# table -> (strategy, key column)
+TABLES = {
+    "Participant": ("append", "ParticipantID"),
+    "Instructor": ("append", "InstructorID"),
+    "Activity": ("full", None),
+    "Equipment": ("full", None),
+    "ActivityEquipment": ("full", None),
+    "Registers": ("full", None),
+    "Injury": ("full", None),
+    "MaintenanceLog": ("full", None),
+    "Rating": ("full", None),
+}
+
+
+def _path(table):
+    return os.path.join(config.MIRROR_DIR, f"{table}.parquet")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise RuntimeError("The analytics mirror needs the 'pyarrow' package.")
+
+
+def _write(table, df):
+    tmp = _path(table) + ".tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, _path(table))
+
+
+def load_state():
+    """The last sync's state dict, or ``None`` if the mirror was never synced."""
+    try:
+        with open(os.path.join(config.MIRROR_DIR, STATE_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_state(state):
+    path = os.path.join(config.MIRROR_DIR, STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def sync(conn, full=False, log=print):
+    """Bring the mirror up to date; returns the new state."""
+    _require_pyarrow()
+    os.makedirs(config.MIRROR_DIR, exist_ok=True)
+    state = None if full else load_state()
+    missing = [t for t in TABLES if not os.path.exists(_path(t))]
+
+    try:
+        # One consistent snapshot for every table read
+        conn.start_transaction(consistent_snapshot=True, readonly=True)
+        new_state = {"synced_at": time.time(), "max_ids": {}, "rows": {}}
+
+        for table, (strategy, key) in TABLES.items():
+            start = time.perf_counter()
+            if strategy == "append" and state and table not in missing:
+                df = pd.read_parquet(_path(table))
+                last = (state.get("max_ids") or {}).get(table, 0)
+                fresh = pd.read_sql(f"SELECT * FROM {table} WHERE {key} > %s ORDER BY {key}", conn, params=(last,))
+                if len(fresh):
+                    df = pd.concat([df, fresh], ignore_index=True)
+                    _write(table, df)
+                how = f"{len(fresh):,} new row(s)"
+            else:
+                df = pd.read_sql(f"SELECT * FROM {table}", conn)
+                _write(table, df)
+                how = "full copy"
+            if strategy == "append":
+                new_state["max_ids"][table] = int(df[key].max()) if len(df) else 0
+            new_state["rows"][table] = len(df)
+            log(f"{table}: {how}, {len(df):,} rows ({(time.perf_counter() - start) * 1000:,.0f} ms)")
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    _save_state(new_state)
+    return new_state
+
+
+# ======================================================
+# QUERYING (DuckDB)
+# ======================================================
+def _duckdb():
+    try:
+        import duckdb
+    except ImportError:
+        raise RuntimeError("The analytics mirror needs the 'duckdb' package.")
+    return duckdb
+
+
+def open_engine():
+    """In-memory DuckDB database with one view per mirrored table."""
+    con = _duckdb().connect(":memory:")
+    for table in TABLES:
+        path = os.path.abspath(_path(table)).replace("'", "''")
+        con.execute(f"CREATE VIEW {table} AS SELECT * FROM read_parquet('{path}')")
+    return con
+
+
+@st.cache_resource(show_spinner=False)
+def _engine():
+    """Process-wide ``open_engine()`` plus its lock."""
+    return open_engine(), threading.Lock()
+
+
+def available():
+    return load_state() is not None and all(os.path.exists(_path(t)) for t in TABLES)
+
+
+def runner():
+    """
+    ``run(sql, params=None) -> DataFrame`` bound to the process-wide engine
+    and query log, so it can be handed to worker threads.
+    """
+    con, lock = _engine()
+    log = db.get_query_log()
+
+    def run(sql, params=None):
+        with lock:
+            cur = con.cursor()  # DuckDB cursors are per-thread handles on the same database
+        with Tracker(log, "duckdb", sql) as t:
+            try:
+                t.result = cur.execute(sql if params is None else sql.replace("%s", "?"), params).df()
+            finally:
+                cur.close()
+            return t.result
+
+    return run
+
+
+def query(sql, params=None):
+    """Run a SELECT against the mirror and return a DataFrame."""
+    return runner()(sql, params)
+
+
+def freshness():
+    """Human-readable age of the mirror, e.g. ``"synced 3 min ago"``."""
+    state = load_state()
+    if not state:
+        return "never synced"
+    age = time.time() - state["synced_at"]
+    if age < 60:
+        ago = f"{age:.0f} s"
+    elif age < 3600:
+        ago = f"{age / 60:.0f} min"
+    else:
+        ago = f"{age / 3600:.1f} h"
+    return f"synced {ago} ago ({time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(state['synced_at']))})"
+
+
+def sync_now(full=False):
+    """Sync through the app's pool (a replica is fine: the job only reads)."""
+    with db.track("sync", "mirror.sync") as t, db.connection(read=True) as conn:
+        t.result = sync(conn, full=full, log=lambda *_: None)
+        t.rows = sum(t.result["rows"].values())
+        return t.result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync the DuckDB/Parquet analytics mirror from MySQL.")
+    parser.add_argument("--full", action="store_true", help="copy every table in full")
+    args = parser.parse_args()
+
+    conn = connect()
+    try:
+        state = sync(conn, full=args.full)
+        print(f"Mirror synced to {config.MIRROR_DIR} ({sum(state['rows'].values()):,} rows).")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Monthly partition maintenance for Injury and MaintenanceLog (migration V005).
+
+Both tables are ``RANGE COLUMNS`` partitioned on their event date:
+``p_history`` (everything before the first month), one ``pYYYYMM`` partition
+per month and a catch-all ``p_future``. ``roll_forward`` splits ``p_future``
+so that ``config.PARTITION_MONTHS_AHEAD`` empty months always exist ahead of
+today (splitting an empty partition is instant, so run it from cron as often
+as you like). ``retire`` removes months older than a retention window,
+dropping them or first exchanging each into a standalone
+``<Table>_<partition>`` archive table.
+
+Dropped partitions fire no triggers, so after retiring rows the V002 summary
+tables, the V004 reports and the V009 search documents of injuries and
+maintenance logs are rebuilt from the base tables.
+
+``explain_recent`` shows the pruning: the ``partitions`` column of EXPLAIN
+(MySQL 8 reports it without the old ``EXPLAIN PARTITIONS`` keyword) for the
+Dashboard's date-bounded recent-events queries.
+
+    python -m adventureguard.partitions                       # roll forward + status
+    python -m adventureguard.partitions --retain-months 24    # also drop older months
+    python -m adventureguard.partitions --retain-months 24 --archive
+    python -m adventureguard.partitions --explain
+"""
+
+import argparse
+import datetime
+from typing import NamedTuple
+
+import mysql.connector
+
+import config
+from adventureguard import queries
+from adventureguard import report_refresh
+from adventureguard import search
+from adventureguard.migrations import connect
+
+# table -> partitioning column
+TABLES = {
+    "Injury": "InjuryDate",
+    "MaintenanceLog": "MaintDate",
+}
+FUTURE = "p_future"
+
+# Dashboard queries that should only touch the newest partitions
+RECENT = {
+    "Injury": queries.LATEST_INJURIES_SINCE,
+    "MaintenanceLog": queries.RECENT_MAINTENANCE_SINCE,
+}
+
+PARTITIONS = """
+    SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+    ORDER BY PARTITION_ORDINAL_POSITION
+"""
+
+
+class Partition(NamedTuple):
+    name: str
+    less_than: object           # datetime.date; None for MAXVALUE
+    rows: int                   # InnoDB estimate
+
+
+def add_months(day, n):
+    """First day of the month ``n`` months after ``day``'s month."""
+    years, month = divmod(day.month - 1 + n, 12)
+    return datetime.date(day.year + years, month + 1, 1)
+
+
+def partition_name(month):
+    return f"p{month:%Y%m}"
+
+
+def _bound(description):
+    # "'2025-02-01'" for a date bound, "MAXVALUE" for the catch-all
+    if description is None or description.upper() == "MAXVALUE":
+        return None
+    return datetime.date.fromisoformat(description.strip("'"))
+
+
+def list_partitions(conn, table):
+    cur = conn.cursor()
+    try:
+        cur.execute(PARTITIONS, (config.DB_NAME, table))
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+    return [Partition(name, _bound(desc), int(count or 0)) for name, desc, count in rows]
+
+
+def _require_partitioned(table, parts):
+    if not parts or parts[-1].name != FUTURE:
+        raise RuntimeError(f"{table} is not month-partitioned (apply migration V005).")
+
+
+def roll_forward(conn, months_ahead=None, today=None, log=print):
+    """Split ``p_future`` until every month up to ``months_ahead`` from now has a partition."""
+    months_ahead = config.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    today = today or datetime.date.today()
+    target = add_months(today, months_ahead + 1)    # exclusive upper bound
+    added = {}
+    cur = conn.cursor()
+    try:
+        for table in TABLES:
+            parts = list_partitions(conn, table)
+            _require_partitioned(table, parts)
+            month = max((p.less_than for p in parts if p.less_than), default=add_months(today, 0))
+            new = []
+            while month < target:
+                new.append((partition_name(month), add_months(month, 1)))
+                month = add_months(month, 1)
+            if new:
+                defs = ", ".join(f"PARTITION {name} VALUES LESS THAN ('{bound:%Y-%m-%d}')" for name, bound in new)
+                cur.execute(f"ALTER TABLE {table} REORGANIZE PARTITION {FUTURE} INTO "
+                            f"({defs}, PARTITION {FUTURE} VALUES LESS THAN (MAXVALUE))")
+                log(f"{table}: added {', '.join(name for name, _ in new)}")
+            added[table] = [name for name, _ in new]
+    finally:
+        cur.close()
+    return added
+
+
+def retire(conn, keep_months, archive=False, today=None, log=print):
+    """
+    Remove the partitions that end before the first day of the month
+    ``keep_months`` ago. With ``archive`` each is first swapped (instantly,
+    no row copy) into an empty ``<Table>_<partition>`` table.
+    """
+    today = today or datetime.date.today()
+    cutoff = add_months(today, -keep_months)
+    retired = {}
+    cur = conn.cursor()
+    try:
+        for table in TABLES:
+            parts = list_partitions(conn, table)
+            _require_partitioned(table, parts)
+            old = [p for p in parts if p.less_than is not None and p.less_than <= cutoff]
+            for part in old:
+                if archive:
+                    target = f"{table}_{part.name}"
+                    cur.execute(f"CREATE TABLE {target} LIKE {table}")
+                    cur.execute(f"ALTER TABLE {target} REMOVE PARTITIONING")
+                    cur.execute(f"ALTER TABLE {table} EXCHANGE PARTITION {part.name} WITH TABLE {target}")
+                cur.execute(f"ALTER TABLE {table} DROP PARTITION {part.name}")
+                log(f"{table}: {'archived' if archive else 'dropped'} {part.name} (~{part.rows:,} rows)")
+            retired[table] = [p.name for p in old]
+    finally:
+        cur.close()
+    return retired
+
+
+def resync(conn, log=print):
+    """Rebuild the trigger-maintained summaries after rows left without firing triggers."""
+    cur = conn.cursor()
+    try:
+        cur.callproc("proc_check_aggregates", (True,))
+        for result in cur.stored_results():
+            result.fetchall()
+        conn.commit()
+        log("V002 aggregate tables rebuilt.")
+    except mysql.connector.Error as e:
+        log(f"V002 aggregate tables skipped: {e.msg}")
+    finally:
+        cur.close()
+    try:
+        report_refresh.rebuild(conn)
+        log("V004 report tables rebuilt.")
+    except mysql.connector.Error as e:
+        log(f"V004 report tables skipped: {e.msg}")
+    try:
+        search.rebuild(conn, ("Injury", "Maintenance"))
+        log("V009 search documents rebuilt.")
+    except mysql.connector.Error as e:
+        log(f"V009 search documents skipped: {e.msg}")
+
+
+def explain_recent(conn, since=None):
+    """``{table: (partitions read, partitions total)}`` for the recent-events queries."""
+    since = since or datetime.date.today() - datetime.timedelta(days=config.RECENT_EVENTS_DAYS)
+    result = {}
+    cur = conn.cursor(dictionary=True)
+    try:
+        for table, sql in RECENT.items():
+            cur.execute("EXPLAIN " + sql.strip().rstrip(";"), (since,))
+            row = cur.fetchall()[0]
+            read = row["partitions"].split(",") if row["partitions"] else []
+            result[table] = (read, [p.name for p in list_partitions(conn, table)])
+    finally:
+        cur.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the monthly Injury / MaintenanceLog partitions.")
+    parser.add_argument("--months-ahead", type=int,
+                        help=f"empty months to keep ahead of today (default {config.PARTITION_MONTHS_AHEAD})")
+    parser.add_argument("--retain-months", type=int, help="retire partitions older than N months")
+    parser.add_argument("--archive", action="store_true",
+                        help="exchange retired partitions into <Table>_<partition> tables instead of dropping them")
+    parser.add_argument("--explain", action="store_true",
+                        help="show which partitions the Dashboard's recent-events queries read")
+    args = parser.parse_args()
+
+    conn = connect()
+    try:
+        roll_forward(conn, args.months_ahead)
+        if args.retain_months is not None:
+            retired = retire(conn, args.retain_months, args.archive)
+            if any(retired.values()):
+                resync(conn)
+        for table in TABLES:
+            parts = list_partitions(conn, table)
+            print(f"{table}: {len(parts)} partitions, ~{sum(p.rows for p in parts):,} rows")
+            for p in parts:
+                print(f"  {p.name:<10} < {p.less_than or 'MAXVALUE'!s:<10} ~{p.rows:,}")
+        if args.explain:
+            for table, (read, total) in explain_recent(conn).items():
+                print(f"{table}: recent-events query reads {len(read)} of {len(total)} partitions ({', '.join(read)})")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Searchable entity pickers for the Add Data forms.
+
+The selectbox option *value* is the entity's ID, so a submitted form never
+has to map a display name back to an ID (which was O(n) and broke on
+duplicate names). Candidates come from one of two places:
+
+* small tables: a cached, name-sorted in-memory index searched by prefix
+  with ``bisect`` (O(log n)); the index is rebuilt only when the table's
+  write version changes (see ``QueryCache.version``) or, to pick up writes
+  made outside the app, after ``PICKER_INDEX_TTL`` seconds;
+* large tables: an indexed ``LIKE 'prefix%' ORDER BY name LIMIT n`` query
+  (migration V003 adds the name indexes).
+"""
+
+import bisect
+import threading
+import time
+
+import streamlit as st
+
+import config
+from adventureguard import db
+
+# entity -> (table, id column, name column)
+ENTITIES = {
+    "participant": ("Participant", "ParticipantID", "Name"),
+    "instructor": ("Instructor", "InstructorID", "Name"),
+    "activity": ("Activity", "ActivityID", "ActivityName"),
+    "equipment": ("Equipment", "EquipmentID", "EquipmentType"),
+}
+
+
+class NameIndex:
+    """Name-sorted ``(lower name, name, id)`` entries with prefix search."""
+
+    def __init__(self, rows):
+        entries = sorted((str(name).lower(), str(name), int(id_)) for id_, name in rows)
+        self._keys = [e[0] for e in entries]
+        self._entries = entries
+        self.labels = {id_: name for _, name, id_ in entries}
+
+    def search(self, prefix, limit):
+        prefix = prefix.lower()
+        i = bisect.bisect_left(self._keys, prefix)
+        out = []
+        while i < len(self._keys) and len(out) < limit and self._keys[i].startswith(prefix):
+            out.append((self._entries[i][2], self._entries[i][1]))
+            i += 1
+        return out
+
+
+@st.cache_resource(show_spinner=False)
+def _index_store():
+    """Process-wide ``entity -> (version, built_at, NameIndex or None)`` plus its lock."""
+    return {}, threading.Lock()
+
+
+def _escape_like(value):
+    # '!' rather than the backslash: it means the same on MySQL and SQLite
+    return value.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def get_index(entity):
+    """
+    The in-memory index for ``entity``, or ``None`` if the table is too large
+    to hold in memory (callers then search with SQL).
+    """
+    table, id_col, name_col = ENTITIES[entity]
+    version = db.get_query_cache().version(table)
+    store, lock = _index_store()
+    with lock:
+        cached = store.get(entity)
+        if cached and cached[0] == version and time.monotonic() - cached[1] < config.PICKER_INDEX_TTL:
+            return cached[2]
+
+    limit = config.PICKER_INDEX_MAX_ROWS
+    rows = db.fetch_all(f"SELECT {id_col}, {name_col} FROM {table} LIMIT %s", (limit + 1,))
+    index = NameIndex(rows) if len(rows) <= limit else None
+    with lock:
+        store[entity] = (version, time.monotonic(), index)
+    return index
+
+
+def search(entity, text, limit=None):
+    """``[(id, name), ...]`` whose name starts with ``text`` (or whose ID equals it)."""
+    table, id_col, name_col = ENTITIES[entity]
+    limit = limit or config.PICKER_RESULT_LIMIT
+    text = (text or "").strip()
+
+    index = get_index(entity)
+    if index is not None:
+        matches = index.search(text, limit)
+        if text.isdigit() and int(text) in index.labels:
+            matches = [(int(text), index.labels[int(text)])] + [m for m in matches if m[0] != int(text)]
+        return matches[:limit]
+
+    sql = f"SELECT {id_col}, {name_col} FROM {table} WHERE {name_col} LIKE %s ESCAPE '!'"
+    params = [_escape_like(text) + "%"]
+    if text.isdigit():
+        sql += f" OR {id_col} = %s"
+        params.append(int(text))
+    sql += f" ORDER BY {name_col} LIMIT %s"
+    params.append(limit)
+    return [(int(i), str(n)) for i, n in db.fetch_all(sql, tuple(params))]
+
+
+def entity_picker(entity, label, key, optional=False):
+    """
+    Search box + selectbox whose value is the chosen entity's ID (or ``None``).
+    Place it outside ``st.form`` so typing refreshes the candidates.
+    """
+    text = st.text_input(f"Search {label.lower()}", key=f"{key}_search",
+                         placeholder="Type the first letters of the name, or an ID")
+    matches = search(entity, text)
+    labels = {id_: f"{name} (#{id_})" for id_, name in matches}
+    options = ([None] if optional else []) + list(labels)
+    if not options:
+        st.caption("No matches.")
+    return st.selectbox(
+        label,
+        options,
+        format_func=lambda id_: "None" if id_ is None else labels[id_],
+        key=key,
+    )
@@ -0,0 +1,191 @@
+"""
+SQL issued by the Home, Dashboard and Complex Queries pages, in one place so the
+pages, the benchmarks and any alternative execution paths share a single
+definition of each statement.
+"""
+
+from typing import NamedTuple
+
+
+# ======================================================
+# DASHBOARD
+# ======================================================
+# Summary tiles: one statement, five scalar subqueries -> one network round trip
+SNAPSHOT = """
+    SELECT
+        (SELECT COUNT(*) FROM Participant) AS participants,
+        (SELECT COUNT(*) FROM Activity)    AS activities,
+        (SELECT COUNT(*) FROM Instructor)  AS instructors,
+        (SELECT COUNT(*) FROM Equipment)   AS equipment,
+        (SELECT COUNT(*) FROM Injury)      AS injuries
+"""
+
+SEVERITY_COUNTS = "SELECT Severity, COUNT(*) AS Count FROM Injury GROUP BY Severity"
+
+EQUIPMENT_STATUS_COUNTS = "SELECT Status, COUNT(*) AS Count FROM Equipment GROUP BY Status"
+
+PARTICIPANTS_PER_ACTIVITY = """
+    SELECT a.ActivityName, COUNT(r.ParticipantID) AS ParticipantCount
+    FROM Activity a
+    LEFT JOIN Registers r ON a.ActivityID = r.ActivityID
+    GROUP BY a.ActivityID, a.ActivityName;
+"""
+
+LATEST_INJURIES = """
+    SELECT ParticipantID, ActivityID, InjuryName, Severity, InjuryDate
+    FROM Injury
+    ORDER BY InjuryDate DESC
+    LIMIT 5;
+"""
+
+RECENT_MAINTENANCE = """
+    SELECT EquipmentID, MaintDate, Technician, Cost
+    FROM MaintenanceLog
+    ORDER BY MaintDate DESC
+    LIMIT 5;
+"""
+
+# The same lists bounded to rows on/after a date: on the month-partitioned
+# tables (migration V005) they only open the newest partitions
+LATEST_INJURIES_SINCE = """
+    SELECT ParticipantID, ActivityID, InjuryName, Severity, InjuryDate
+    FROM Injury
+    WHERE InjuryDate >= %s
+    ORDER BY InjuryDate DESC
+    LIMIT 5;
+"""
+
+RECENT_MAINTENANCE_SINCE = """
+    SELECT EquipmentID, MaintDate, Technician, Cost
+    FROM MaintenanceLog
+    WHERE MaintDate >= %s
+    ORDER BY MaintDate DESC
+    LIMIT 5;
+"""
+
+
+# ======================================================
+# COMPLEX QUERIES (advanced reports)
+# ======================================================
+class Report(NamedTuple):
+    key: str
+    title: str
+    description: str
+    sql: str
+    # Same result read from the Report* tables (migration V004)
+    materialized_sql: str = None
+
+
+REPORTS = [
+    Report(
+        "paid_participants",
+        "📌 Query 1: Top Activities by Paid Participants (GROUP BY + HAVING)",
+        "This query lists activities with more than **2 paid participants**, using grouping + filtering.",
+        """
+    SELECT a.ActivityName, COUNT(r.ParticipantID) AS PaidCount
+    FROM Activity a
+    JOIN Registers r ON a.ActivityID = r.ActivityID
+    WHERE r.PaymentStatus = 'Yes'
+    GROUP BY a.ActivityName
+    HAVING COUNT(r.ParticipantID) > 2
+    ORDER BY PaidCount DESC;
+    """,
+        """
+    SELECT a.ActivityName, SUM(m.PaidCount) AS PaidCount
+    FROM ReportActivityPaid m
+    JOIN Activity a ON a.ActivityID = m.ActivityID
+    GROUP BY a.ActivityName
+    HAVING SUM(m.PaidCount) > 2
+    ORDER BY PaidCount DESC;
+    """,
+    ),
+    Report(
+        "injury_prone",
+        "📌 Query 2: Most Injury-Prone Participants (Nested Query + Count)",
+        "Shows participants with more injuries than the **average injury count**.",
+        """
+    SELECT p.Name, COUNT(i.InjuryName) AS InjuryCount
+    FROM Participant p
+    JOIN Injury i ON p.ParticipantID = i.ParticipantID
+    GROUP BY p.Name
+    HAVING InjuryCount > (
+        SELECT AVG(cnt)
+        FROM (
+            SELECT COUNT(*) AS cnt
+            FROM Injury
+            GROUP BY ParticipantID
+        ) AS injury_stats
+    );
+    """,
+        """
+    SELECT p.Name, SUM(m.InjuryCount) AS InjuryCount
+    FROM ReportParticipantInjuries m
+    JOIN Participant p ON p.ParticipantID = m.ParticipantID
+    WHERE m.InjuryCount > 0
+    GROUP BY p.Name
+    HAVING InjuryCount > (
+        SELECT AVG(InjuryCount) FROM ReportParticipantInjuries WHERE InjuryCount > 0
+    );
+    """,
+    ),
+    Report(
+        "high_cost_equipment",
+        "📌 Query 3: Highest Maintenance Cost Equipment (Aggregation + Join)",
+        "Finds equipment items with total maintenance cost > 500.",
+        """
+    SELECT e.EquipmentType, SUM(m.Cost) AS TotalCost
+    FROM Equipment e
+    JOIN MaintenanceLog m ON e.EquipmentID = m.EquipmentID
+    GROUP BY e.EquipmentType
+    HAVING TotalCost > 500
+    ORDER BY TotalCost DESC;
+    """,
+        """
+    SELECT e.EquipmentType, SUM(m.TotalCost) AS TotalCost
+    FROM ReportEquipmentCost m
+    JOIN Equipment e ON e.EquipmentID = m.EquipmentID
+    WHERE m.LogCount > 0
+    GROUP BY e.EquipmentType
+    HAVING TotalCost > 500
+    ORDER BY TotalCost DESC;
+    """,
+    ),
+    Report(
+        "instructor_ratings",
+        "📌 Query 4: Instructor Rating Summary (AVG + JOIN + Grouping)",
+        "Shows instructors with average rating ≥ 4.",
+        """
+    SELECT i.Name AS Instructor, ROUND(AVG(r.RatingValue), 2) AS AvgRating
+    FROM Instructor i
+    JOIN Rating r ON i.InstructorID = r.InstructorID
+    GROUP BY i.Name
+    HAVING AvgRating >= 4
+    ORDER BY AvgRating DESC;
+    """,
+        """
+    SELECT i.Name AS Instructor, ROUND(SUM(m.RatingSum) / SUM(m.RatingCount), 2) AS AvgRating
+    FROM ReportInstructorRatings m
+    JOIN Instructor i ON i.InstructorID = m.InstructorID
+    GROUP BY i.Name
+    HAVING AvgRating >= 4
+    ORDER BY AvgRating DESC;
+    """,
+    ),
+    Report(
+        "zero_injury_activities",
+        "📌 Query 5: Activities with Zero Injuries (LEFT JOIN + NULL CHECK)",
+        "Shows safe activities with **no injuries recorded**.",
+        """
+    SELECT a.ActivityName
+    FROM Activity a
+    LEFT JOIN Injury i ON a.ActivityID = i.ActivityID
+    WHERE i.InjuryName IS NULL;
+    """,
+        """
+    SELECT a.ActivityName
+    FROM Activity a
+    LEFT JOIN ReportActivityInjuries m ON a.ActivityID = m.ActivityID
+    WHERE IFNULL(m.InjuryCount, 0) = 0;
+    """,
+    ),
+]
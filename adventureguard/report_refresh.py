@@ -0,0 +1,261 @@
+"""
+Incremental refresh of the materialized Complex Queries reports.
+
+Journal triggers (migration V004) append the keys every Registers, Injury,
+MaintenanceLog and Rating change affects to ``ChangeJournal``. ``refresh``
+claims the entries no refresh has applied yet (``RefreshID IS NULL``, V011),
+tags them with its own id, recomputes just those keys in the ``Report*``
+tables from the base tables (each an indexed lookup) and commits, all in one
+transaction, so its cost is proportional to the delta rather than the history.
+
+Claims use ``FOR UPDATE SKIP LOCKED``: an entry whose writer has not
+committed yet is locked, so it is left for a later refresh instead of being
+skipped for good because a newer entry was applied first.
+
+    python -m adventureguard.report_refresh            # apply pending changes
+    python -m adventureguard.report_refresh --full     # rebuild from scratch
+    python -m adventureguard.report_refresh --purge-days 30
+"""
+
+import argparse
+from typing import NamedTuple
+
+from adventureguard import db
+from adventureguard.migrations import connect
+
+WATERMARK = "reports"
+
+# Journal entries tagged per UPDATE ... WHERE ChangeID IN (...)
+CLAIM_CHUNK = 1000
+
+REPORT_TABLES = (
+    "ReportActivityPaid", "ReportParticipantInjuries", "ReportActivityInjuries",
+    "ReportEquipmentCost", "ReportInstructorRatings",
+)
+
+
+def _changed(source, column):
+    return (f"SELECT DISTINCT {column} FROM ChangeJournal "
+            f"WHERE RefreshID = %(refresh)s AND SourceTable = '{source}' "
+            f"AND {column} IS NOT NULL")
+
+
+# One statement per report table: recompute the journaled keys only
+INCREMENTAL = [
+    f"""
+    INSERT INTO ReportActivityPaid (ActivityID, PaidCount)
+    SELECT k.ActivityID,
+           (SELECT COUNT(*) FROM Registers r WHERE r.ActivityID = k.ActivityID AND r.PaymentStatus = 'Yes')
+    FROM ({_changed('Registers', 'ActivityID')}) k
+    ON DUPLICATE KEY UPDATE PaidCount = VALUES(PaidCount)
+    """,
+    f"""
+    INSERT INTO ReportParticipantInjuries (ParticipantID, InjuryCount)
+    SELECT k.ParticipantID, (SELECT COUNT(*) FROM Injury i WHERE i.ParticipantID = k.ParticipantID)
+    FROM ({_changed('Injury', 'ParticipantID')}) k
+    ON DUPLICATE KEY UPDATE InjuryCount = VALUES(InjuryCount)
+    """,
+    f"""
+    INSERT INTO ReportActivityInjuries (ActivityID, InjuryCount)
+    SELECT k.ActivityID, (SELECT COUNT(*) FROM Injury i WHERE i.ActivityID = k.ActivityID)
+    FROM ({_changed('Injury', 'ActivityID')}) k
+    ON DUPLICATE KEY UPDATE InjuryCount = VALUES(InjuryCount)
+    """,
+    f"""
+    INSERT INTO ReportEquipmentCost (EquipmentID, TotalCost, LogCount)
+    SELECT k.EquipmentID,
+           (SELECT IFNULL(SUM(m.Cost), 0) FROM MaintenanceLog m WHERE m.EquipmentID = k.EquipmentID),
+           (SELECT COUNT(*) FROM MaintenanceLog m WHERE m.EquipmentID = k.EquipmentID)
+    FROM ({_changed('MaintenanceLog', 'EquipmentID')}) k
+    ON DUPLICATE KEY UPDATE TotalCost = VALUES(TotalCost), LogCount = VALUES(LogCount)
+    """,
+    f"""
+    INSERT INTO ReportInstructorRatings (InstructorID, RatingSum, RatingCount)
+    SELECT k.InstructorID,
+           (SELECT IFNULL(SUM(r.RatingValue), 0) FROM Rating r WHERE r.InstructorID = k.InstructorID),
+           (SELECT COUNT(r.RatingValue) FROM Rating r WHERE r.InstructorID = k.InstructorID)
+    FROM ({_changed('Rating', 'InstructorID')}) k
+    ON DUPLICATE KEY UPDATE RatingSum = VALUES(RatingSum), RatingCount = VALUES(RatingCount)
+    """,
+]
+
+# Full rebuild (same statements as the initial build in V004)
+FULL = [
+    "INSERT INTO ReportActivityPaid (ActivityID, PaidCount) "
+    "SELECT ActivityID, COUNT(*) FROM Registers WHERE PaymentStatus = 'Yes' GROUP BY ActivityID",
+    "INSERT INTO ReportParticipantInjuries (ParticipantID, InjuryCount) "
+    "SELECT ParticipantID, COUNT(*) FROM Injury GROUP BY ParticipantID",
+    "INSERT INTO ReportActivityInjuries (ActivityID, InjuryCount) "
+    "SELECT ActivityID, COUNT(*) FROM Injury GROUP BY ActivityID",
+    "INSERT INTO ReportEquipmentCost (EquipmentID, TotalCost, LogCount) "
+    "SELECT EquipmentID, IFNULL(SUM(Cost), 0), COUNT(*) FROM MaintenanceLog GROUP BY EquipmentID",
+    "INSERT INTO ReportInstructorRatings (InstructorID, RatingSum, RatingCount) "
+    "SELECT InstructorID, IFNULL(SUM(RatingValue), 0), COUNT(RatingValue) FROM Rating GROUP BY InstructorID",
+]
+
+
+class RefreshResult(NamedTuple):
+    refresh_id: int             # 0 when there was nothing to apply
+    entries: int                # journal entries applied
+    rows: int                   # affected report rows (as counted by MySQL)
+
+
+class ReportStatus(NamedTuple):
+    last_change: int            # highest journal entry applied so far
+    refreshed_at: object
+    pending: int                # committed journal entries not yet applied
+
+
+def _lock_watermark(cur):
+    cur.execute("SELECT LastChangeID FROM ReportWatermark WHERE Name = %s FOR UPDATE", (WATERMARK,))
+    row = cur.fetchone()
+    return int(row[0]) if row else 0
+
+
+def _set_watermark(cur, change_id):
+    cur.execute(
+        "INSERT INTO ReportWatermark (Name, LastChangeID, RefreshedAt) VALUES (%s, %s, NOW(6)) "
+        "ON DUPLICATE KEY UPDATE LastChangeID = GREATEST(LastChangeID, VALUES(LastChangeID)), "
+        "RefreshedAt = VALUES(RefreshedAt)",
+        (WATERMARK, change_id),
+    )
+
+
+def _claim(cur):
+    """
+    Tag the unapplied journal entries this transaction can lock and return
+    ``(refresh_id, entries)``. The id is the highest ChangeID claimed, so it
+    is unique: every entry is claimed exactly once.
+    """
+    cur.execute("SELECT ChangeID FROM ChangeJournal WHERE RefreshID IS NULL "
+                "ORDER BY ChangeID FOR UPDATE SKIP LOCKED")
+    ids = [int(r[0]) for r in cur.fetchall()]
+    if not ids:
+        return 0, 0
+    refresh_id = ids[-1]
+    for i in range(0, len(ids), CLAIM_CHUNK):
+        chunk = ids[i:i + CLAIM_CHUNK]
+        cur.execute(
+            f"UPDATE ChangeJournal SET RefreshID = %s WHERE ChangeID IN ({', '.join(['%s'] * len(chunk))})",
+            (refresh_id, *chunk),
+        )
+    return refresh_id, len(ids)
+
+
+def refresh(conn):
+    """
+    Apply the journal entries no refresh has claimed. Concurrent refreshes
+    claim disjoint entries; with nothing to apply, nothing is written.
+    """
+    cur = conn.cursor()
+    try:
+        conn.start_transaction()
+        refresh_id, entries = _claim(cur)
+        if not entries:
+            conn.rollback()
+            return RefreshResult(0, 0, 0)
+        rows = 0
+        for sql in INCREMENTAL:
+            cur.execute(sql, {"refresh": refresh_id})
+            rows += max(cur.rowcount, 0)
+        _set_watermark(cur, refresh_id)
+        conn.commit()
+        return RefreshResult(refresh_id, entries, rows)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def rebuild(conn):
+    """Recompute every report table from the base tables and mark the committed journal applied."""
+    cur = conn.cursor()
+    try:
+        conn.start_transaction()
+        _lock_watermark(cur)                # one rebuild at a time
+        refresh_id, entries = _claim(cur)
+        rows = 0
+        for table in REPORT_TABLES:
+            cur.execute(f"DELETE FROM {table}")
+        for sql in FULL:
+            cur.execute(sql)
+            rows += max(cur.rowcount, 0)
+        _set_watermark(cur, refresh_id)
+        conn.commit()
+        return RefreshResult(refresh_id, entries, rows)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def purge(conn, keep_days):
+    """Delete applied journal entries older than ``keep_days``; returns the number removed."""
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "DELETE FROM ChangeJournal WHERE RefreshID IS NOT NULL "
+            "AND ChangedAt < NOW(6) - INTERVAL %s DAY",
+            (keep_days,),
+        )
+        conn.commit()
+        return cur.rowcount
+    finally:
+        cur.close()
+
+
+def status(conn):
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "SELECT w.LastChangeID, w.RefreshedAt, "
+            "       (SELECT COUNT(*) FROM ChangeJournal j WHERE j.RefreshID IS NULL) "
+            "FROM ReportWatermark w WHERE w.Name = %s",
+            (WATERMARK,),
+        )
+        row = cur.fetchone()
+        return ReportStatus(int(row[0]), row[1], int(row[2])) if row else ReportStatus(0, None, 0)
+    finally:
+        cur.close()
+
+
+# ======================================================
+# APP HELPERS (pooled connection + instrumentation)
+# ======================================================
+def refresh_now():
+    """Refresh through the app's pool and drop cached reads of the report tables."""
+    with db.track("refresh", "report_refresh.refresh") as t, db.connection() as conn:
+        result = refresh(conn)
+        t.rows = result.rows
+    if result.rows:
+        db.get_query_cache().invalidate(REPORT_TABLES)
+        db.mark_written()
+    return result
+
+
+def current_status():
+    with db.track("rows", "report_refresh.status") as t, db.connection() as conn:
+        t.result = status(conn)
+        return t.result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the materialized Complex Queries reports.")
+    parser.add_argument("--full", action="store_true", help="rebuild the report tables from scratch")
+    parser.add_argument("--purge-days", type=int, help="also delete applied journal entries older than N days")
+    args = parser.parse_args()
+
+    conn = connect()
+    try:
+        result = rebuild(conn) if args.full else refresh(conn)
+        print(f"Applied {result.entries} journal entries: {result.rows} report row(s) affected.")
+        if args.purge_days is not None:
+            print(f"Purged {purge(conn, args.purge_days)} journal entries.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
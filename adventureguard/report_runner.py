@@ -0,0 +1,175 @@
+"""
+Concurrent "run all" for the Complex Queries reports.
+
+Each report runs in a shared thread pool on its own pooled connection, with a
+``MAX_EXECUTION_TIME`` optimizer hint so a slow report can never run longer
+than ``config.REPORT_TIMEOUT_MS``. A run is kept in a process-wide registry
+(not in the script run), so its queries keep going across Streamlit reruns:
+the page polls the futures and renders each result as it lands, and a Cancel
+click (which reruns the page) issues ``KILL QUERY`` on that report's
+connection.
+
+On the embedded SQLite engine the hint is inert (there is no timeout) and
+Cancel interrupts the report's connection instead.
+
+A run can also be pointed at another engine (the DuckDB analytics mirror)
+by passing ``source``; such reports can only be cancelled while queued.
+
+Worker threads do not inherit the page's context variables, so every task is
+submitted through ``contextvars.copy_context()`` to keep the instrumentation's
+``current_page`` tag.
+"""
+
+import contextvars
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+import streamlit as st
+
+import config
+from adventureguard import db
+from adventureguard import sqlite_backend
+from adventureguard.instrument import Tracker
+from adventureguard.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+ER_QUERY_INTERRUPTED = 1317     # KILL QUERY
+ER_QUERY_TIMEOUT = 3024         # MAX_EXECUTION_TIME exceeded
+MAX_RUNS = 32                   # runs remembered across reruns/sessions
+
+_SELECT_RE = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+
+
+class Outcome(NamedTuple):
+    status: str                 # done | cancelled | timed out | error
+    frame: object               # DataFrame when done
+    error: str
+    ms: float
+
+
+def with_timeout(sql, ms=None):
+    """Add a ``MAX_EXECUTION_TIME`` hint to a SELECT (other statements are returned as-is)."""
+    ms = config.REPORT_TIMEOUT_MS if ms is None else ms
+    return _SELECT_RE.sub(f"SELECT /*+ MAX_EXECUTION_TIME({int(ms)}) */", sql, count=1)
+
+
+def _classify(exc):
+    # pandas wraps driver errors in its own DatabaseError
+    err = exc if isinstance(exc, db.Error) else exc.__cause__
+    if sqlite_backend.is_interrupted(err):
+        return "cancelled"
+    errno = getattr(err, "errno", None)
+    if errno == ER_QUERY_INTERRUPTED:
+        return "cancelled"
+    if errno == ER_QUERY_TIMEOUT:
+        return "timed out"
+    return "error"
+
+
+class ReportRun:
+    """One "run all": a future per report plus the connection each is using."""
+
+    def __init__(self, reports, source=None):
+        self.id = uuid.uuid4().hex
+        self.reports = list(reports)
+        self.source = source        # sql -> DataFrame, instead of MySQL
+        self.futures = {}
+        self._conn_ids = {}         # key -> (connection id, host, port)
+        self._cancelled = set()
+        self._lock = threading.Lock()
+
+    def done(self):
+        return all(f.done() for f in self.futures.values())
+
+    def outcome(self, key):
+        """``Outcome`` for a finished report, or ``None`` while it is queued/running."""
+        future = self.futures[key]
+        if future.cancelled():
+            return Outcome("cancelled", None, None, 0.0)
+        return future.result() if future.done() else None
+
+    def running(self, key):
+        with self._lock:
+            return key in self._conn_ids
+
+    def cancel(self, key):
+        """Cancel a queued report, or ``KILL QUERY`` a running one."""
+        with self._lock:
+            self._cancelled.add(key)
+            target = self._conn_ids.get(key)
+        if target is None:
+            self.futures[key].cancel()  # no-op once running on another engine
+        elif not self.futures[key].done():
+            db.kill_query(*target)
+
+    def wait(self, timeout):
+        """Block until at least one more report finishes (or ``timeout`` seconds pass)."""
+        pending = [f for f in self.futures.values() if not f.done()]
+        if pending:
+            wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+    def _execute(self, report, route, log, timeout_ms):
+        sql = with_timeout(report.sql, timeout_ms)
+        start = time.perf_counter()
+        try:
+            if self.source is not None:
+                with self._lock:
+                    if report.key in self._cancelled:
+                        return Outcome("cancelled", None, None, 0.0)
+                    self._conn_ids[report.key] = None
+                frame = self.source(report.sql)
+                return Outcome("done", frame, None, (time.perf_counter() - start) * 1000)
+            with Tracker(log, "df", sql) as t, db.connection(route) as conn:
+                with self._lock:
+                    if report.key in self._cancelled:
+                        return Outcome("cancelled", None, None, 0.0)
+                    self._conn_ids[report.key] = (conn.connection_id, conn.server_host, conn.server_port)
+                t.result = pd.read_sql(sql, conn)
+            return Outcome("done", t.result, None, (time.perf_counter() - start) * 1000)
+        except Exception as e:
+            return Outcome(_classify(e), None, str(e), (time.perf_counter() - start) * 1000)
+        finally:
+            with self._lock:
+                self._conn_ids.pop(report.key, None)
+
+
+@st.cache_resource(show_spinner=False)
+def get_executor():
+    """Process-wide worker pool for report queries."""
+    return ThreadPoolExecutor(max_workers=config.REPORT_WORKERS, thread_name_prefix="report")
+
+
+@st.cache_resource(show_spinner=False)
+def _run_store():
+    """Process-wide ``run id -> ReportRun`` (most recent ``MAX_RUNS``) plus its lock."""
+    return OrderedDict(), threading.Lock()
+
+
+def start_run(reports, timeout_ms=None, source=None):
+    """Submit every report and return the new ``ReportRun``."""
+    run = ReportRun(reports, source)
+    # Resolve the shared resources (and the replica) here: worker threads
+    # have no script context
+    route, log, executor = db.read_route(), db.get_query_log(), get_executor()
+    for report in run.reports:
+        ctx = contextvars.copy_context()
+        run.futures[report.key] = executor.submit(ctx.run, run._execute, report, route, log, timeout_ms)
+
+    runs, lock = _run_store()
+    with lock:
+        runs[run.id] = run
+        while len(runs) > MAX_RUNS:
+            runs.popitem(last=False)
+    return run
+
+
+def get_run(run_id):
+    runs, lock = _run_store()
+    with lock:
+        return runs.get(run_id)
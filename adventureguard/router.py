@@ -0,0 +1,99 @@
+"""
+Read-replica selection for ``adventureguard.db``.
+
+``ReplicaRouter`` keeps a health record per replica (reachable? how far
+behind the primary?) refreshed at most every ``interval`` seconds, and hands
+out healthy replicas round-robin. A replica is skipped while it is
+unreachable, not replicating, or lagging more than ``max_lag`` seconds; when
+none qualifies the caller falls back to the primary.
+
+The router is pure Python: the lag probe is injected, so it can be exercised
+without a database.
+"""
+
+import itertools
+import threading
+import time
+
+
+def replica_lag(conn):
+    """
+    Seconds this server is behind its source, or ``None`` if it is not
+    replicating (no replica status, or the SQL thread is stopped).
+    """
+    cur = conn.cursor(dictionary=True)
+    try:
+        try:
+            cur.execute("SHOW REPLICA STATUS")          # MySQL 8.0.22+
+        except Exception:
+            cur.execute("SHOW SLAVE STATUS")            # older MySQL, MariaDB
+        row = cur.fetchone()
+        cur.fetchall()
+    finally:
+        cur.close()
+    if not row:
+        return None
+    lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+    return None if lag is None else int(lag)
+
+
+class ReplicaRouter:
+    """Thread-safe health tracking and round-robin choice over ``count`` replicas."""
+
+    def __init__(self, count, probe, max_lag=5, interval=5):
+        self.count = count
+        self.probe = probe              # probe(index) -> lag seconds or None; may raise
+        self.max_lag = max_lag
+        self.interval = interval
+        self._health = {i: (False, None, float("-inf")) for i in range(count)}  # healthy, lag, checked_at
+        self._next = itertools.cycle(range(count)) if count else None
+        self._lock = threading.Lock()
+        self._checking = threading.Lock()
+
+    def check(self, index):
+        """Probe one replica now and record the outcome."""
+        try:
+            lag = self.probe(index)
+        except Exception:
+            lag, healthy = None, False
+        else:
+            healthy = lag is not None and lag <= self.max_lag
+        with self._lock:
+            self._health[index] = (healthy, lag, time.monotonic())
+        return healthy
+
+    def _refresh_stale(self):
+        # One thread probes at a time; the others route on the last known state
+        if not self._checking.acquire(blocking=False):
+            return
+        try:
+            now = time.monotonic()
+            with self._lock:
+                stale = [i for i, (_, _, at) in self._health.items() if now - at >= self.interval]
+            for index in stale:
+                self.check(index)
+        finally:
+            self._checking.release()
+
+    def choose(self):
+        """Index of a healthy replica, or ``None`` to use the primary."""
+        if not self.count:
+            return None
+        self._refresh_stale()
+        with self._lock:
+            for _ in range(self.count):
+                index = next(self._next)
+                if self._health[index][0]:
+                    return index
+        return None
+
+    def mark_down(self, index):
+        """Take a replica out of rotation until its next health check."""
+        with self._lock:
+            _, lag, _ = self._health[index]
+            self._health[index] = (False, lag, time.monotonic())
+
+    def status(self):
+        """``{index: (healthy, lag)}`` as last observed."""
+        with self._lock:
+            return {i: (healthy, lag) for i, (healthy, lag, _) in self._health.items()}
@@ -0,0 +1,244 @@
+"""
+Scheduling conflicts: an instructor, or equipment linked through
+``ActivityEquipment``, booked by two activities whose windows overlap.
+
+Bookings are half-open ``[StartDate, EndDate)`` intervals, so back-to-back
+activities do not clash. ``ScheduleIndex`` keeps one ``Timeline`` per
+resource: the bookings sorted by start plus a running maximum of their end
+times. Both lists are monotonic, so the bookings that can overlap a window
+are found with two ``bisect`` calls (O(log n), plus one step per clash
+found) instead of a scan of every activity.
+
+``all_conflicts`` is the bulk "what is double-booked this season" scan: a
+sweep over each timeline keeping the still-running bookings in a heap.
+
+One index is kept per server process, refreshed the same way as
+``equipment_graph``: new activities (IDs past the highest loaded one) are
+appended when the app wrote Activity, the equipment timelines are rebuilt
+when it wrote ActivityEquipment, and everything is reloaded after
+``config.SCHEDULE_INDEX_TTL`` seconds. The index is a fast pre-check for the
+Add Data form; migration V007 is the guard that holds under concurrent
+inserts.
+
+    python -m adventureguard.schedule --since 2025-11-01 --until 2026-03-01
+"""
+
+import argparse
+import bisect
+import datetime
+import heapq
+import threading
+import time
+from typing import NamedTuple
+
+import streamlit as st
+
+import config
+from adventureguard import db
+from adventureguard.migrations import connect
+
+ACTIVITIES = "SELECT ActivityID, ActivityName, StartDate, EndDate, InstructorID FROM Activity"
+NEW_ACTIVITIES = ACTIVITIES + " WHERE ActivityID > %s ORDER BY ActivityID"
+ACTIVITY_EQUIPMENT = "SELECT ActivityID, EquipmentID FROM ActivityEquipment"
+
+
+class Booking(NamedTuple):
+    start: datetime.datetime
+    end: datetime.datetime
+    activity: int
+
+
+class Conflict(NamedTuple):
+    kind: str                   # "instructor" or "equipment"
+    resource: int
+    first: Booking
+    second: Booking
+
+
+def as_datetime(value):
+    """``datetime`` from a MySQL DATETIME or an SQLite text timestamp."""
+    if isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, datetime.date):
+        return datetime.datetime.combine(value, datetime.time())
+    return datetime.datetime.fromisoformat(str(value))
+
+
+class Timeline:
+    """One resource's bookings, sorted by start, with a running maximum of end times."""
+
+    def __init__(self):
+        self.starts = []
+        self.bookings = []
+        self.max_end = []           # max_end[i] = latest end among bookings[:i + 1]
+
+    def add(self, booking):
+        i = bisect.bisect_right(self.starts, booking.start)
+        self.starts.insert(i, booking.start)
+        self.bookings.insert(i, booking)
+        self.max_end.insert(i, max(self.max_end[i - 1], booking.end) if i else booking.end)
+        # Later running maxima only change if this booking ends after them
+        j = i + 1
+        while j < len(self.max_end) and self.max_end[j] < booking.end:
+            self.max_end[j] = booking.end
+            j += 1
+
+    def overlapping(self, start, end):
+        """Bookings that overlap ``[start, end)``."""
+        lo = bisect.bisect_right(self.max_end, start)   # first booking that could still be running
+        hi = bisect.bisect_left(self.starts, end)       # bookings that start before ``end``
+        return [b for b in self.bookings[lo:hi] if b.end > start]
+
+    def conflicts(self):
+        """Every overlapping pair, by a sweep in start order."""
+        running, pairs = [], []     # heap of (end, booking)
+        for booking in self.bookings:
+            while running and running[0][0] <= booking.start:
+                heapq.heappop(running)
+            pairs.extend((other, booking) for _, other in running)
+            heapq.heappush(running, (booking.end, booking))
+        return pairs
+
+
+class ScheduleIndex:
+    """Per-instructor and per-equipment timelines of every activity."""
+
+    def __init__(self):
+        self.timelines = {}         # ("instructor" | "equipment", id) -> Timeline
+        self.bookings = {}          # activity -> Booking
+        self.names = {}             # activity -> ActivityName
+        self.equipment = {}         # activity -> {equipment, ...}
+        self.max_id = 0
+
+    def _timeline(self, kind, resource):
+        return self.timelines.setdefault((kind, resource), Timeline())
+
+    def add_activity(self, activity, name, start, end, instructor):
+        booking = Booking(as_datetime(start), as_datetime(end), activity)
+        self.bookings[activity] = booking
+        self.names[activity] = name
+        self.max_id = max(self.max_id, activity)
+        if instructor is not None:
+            self._timeline("instructor", instructor).add(booking)
+        for equipment in self.equipment.get(activity, ()):
+            self._timeline("equipment", equipment).add(booking)
+
+    def set_equipment(self, links):
+        """Replace the equipment timelines with ``(activity, equipment)`` links."""
+        self.timelines = {key: t for key, t in self.timelines.items() if key[0] != "equipment"}
+        self.equipment = {}
+        for activity, equipment in links:
+            self.equipment.setdefault(activity, set()).add(equipment)
+            if activity in self.bookings:
+                self._timeline("equipment", equipment).add(self.bookings[activity])
+
+    def conflicts(self, start, end, instructor=None, equipment=()):
+        """Clashes a new booking of ``[start, end)`` would cause; ``second`` is the new booking."""
+        new = Booking(as_datetime(start), as_datetime(end), None)
+        resources = [("instructor", instructor)] if instructor is not None else []
+        resources += [("equipment", e) for e in equipment]
+        found = []
+        for kind, resource in resources:
+            timeline = self.timelines.get((kind, resource))
+            if timeline is not None:
+                found += [Conflict(kind, resource, b, new) for b in timeline.overlapping(new.start, new.end)]
+        return found
+
+    def all_conflicts(self, since=None, until=None):
+        """Every double booking that overlaps ``[since, until)`` (open-ended if omitted)."""
+        since = as_datetime(since) if since is not None else None
+        until = as_datetime(until) if until is not None else None
+        found = []
+        for (kind, resource), timeline in sorted(self.timelines.items()):
+            for first, second in timeline.conflicts():
+                # The overlap of the pair is [second.start, min(ends))
+                if (until is None or second.start < until) and \
+                        (since is None or min(first.end, second.end) > since):
+                    found.append(Conflict(kind, resource, first, second))
+        return found
+
+
+def build(activity_rows, link_rows):
+    """An index from ``(id, name, start, end, instructor)`` and ``(activity, equipment)`` rows."""
+    index = ScheduleIndex()
+    for activity, name, start, end, instructor in activity_rows:
+        index.add_activity(int(activity), name, start, end, None if instructor is None else int(instructor))
+    index.set_equipment((int(a), int(e)) for a, e in link_rows)
+    return index
+
+
+def describe(index, conflict):
+    """One line for the UI / CLI."""
+    def label(booking):
+        if booking.activity is None:
+            return f"new activity ({booking.start:%Y-%m-%d %H:%M} – {booking.end:%H:%M})"
+        return (f"#{booking.activity} {index.names.get(booking.activity, '')} "
+                f"({booking.start:%Y-%m-%d %H:%M} – {booking.end:%H:%M})")
+
+    return f"{conflict.kind.title()} #{conflict.resource}: {label(conflict.first)} overlaps {label(conflict.second)}"
+
+
+# ======================================================
+# PROCESS-WIDE INDEX
+# ======================================================
+@st.cache_resource(show_spinner=False)
+def _index_store():
+    """Process-wide ``{"index": (index, built_at, versions)}`` plus its lock."""
+    return {}, threading.Lock()
+
+
+def _versions():
+    cache = db.get_query_cache()
+    return cache.version("Activity"), cache.version("ActivityEquipment")
+
+
+def get_index():
+    """The up-to-date process-wide ``ScheduleIndex``."""
+    store, lock = _index_store()
+    with lock:
+        index, built_at, (act_version, ae_version) = store.get("index", (None, 0, (None, None)))
+        now = _versions()
+        # A new version means a write on the primary that a replica may not have yet
+        primary = db.primary_route()
+        if index is None or time.monotonic() - built_at >= config.SCHEDULE_INDEX_TTL:
+            index = build(db.fetch_all(ACTIVITIES, route=primary),
+                          db.fetch_all(ACTIVITY_EQUIPMENT, route=primary))
+            built_at = time.monotonic()
+        else:
+            if now[0] != act_version:
+                new = db.fetch_all(NEW_ACTIVITIES, (index.max_id,), route=primary)
+                for activity, name, start, end, instructor in new:
+                    index.add_activity(int(activity), name, start, end,
+                                       None if instructor is None else int(instructor))
+            if now[1] != ae_version:
+                index.set_equipment((int(a), int(e)) for a, e in db.fetch_all(ACTIVITY_EQUIPMENT, route=primary))
+        store["index"] = (index, built_at, now)
+        return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List double-booked instructors and equipment.")
+    parser.add_argument("--since", type=datetime.date.fromisoformat, help="season start (YYYY-MM-DD)")
+    parser.add_argument("--until", type=datetime.date.fromisoformat, help="season end, exclusive (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    conn = connect()
+    cur = conn.cursor()
+    try:
+        cur.execute(ACTIVITIES)
+        activities = cur.fetchall()
+        cur.execute(ACTIVITY_EQUIPMENT)
+        links = cur.fetchall()
+    finally:
+        cur.close()
+        conn.close()
+
+    index = build(activities, links)
+    found = index.all_conflicts(args.since, args.until)
+    for conflict in found:
+        print(describe(index, conflict))
+    print(f"{len(found):,} conflict(s) among {len(index.bookings):,} activities")
+
+
+if __name__ == "__main__":
+    main()
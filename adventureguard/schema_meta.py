@@ -0,0 +1,175 @@
+"""
+Schema metadata for the Backend Implementation page.
+
+Everything the page shows (keys, enums, triggers, routine definitions) is
+loaded with five set-based ``information_schema`` queries instead of one
+``SHOW CREATE`` per routine, and kept in memory under a schema fingerprint:
+a checksum over ``ROUTINES.LAST_ALTERED``, ``TABLES.CREATE_TIME`` and
+``TRIGGERS.CREATED``. Reruns only pay for the (cached) fingerprint query;
+the metadata is reloaded when the fingerprint changes.
+
+On the embedded SQLite engine the same ``SchemaMeta`` is built from
+``sqlite_master`` and the ``pragma_*`` table functions, fingerprinted by
+``PRAGMA schema_version``; its "functions" are the Python UDFs.
+"""
+
+import threading
+from typing import NamedTuple
+
+import streamlit as st
+
+import config
+from adventureguard import db
+from adventureguard import sqlite_backend
+
+FINGERPRINT = """
+    SELECT
+        (SELECT CONCAT(COUNT(*), ':', COALESCE(SUM(CRC32(CONCAT_WS('|', ROUTINE_TYPE, ROUTINE_NAME, LAST_ALTERED))), 0))
+         FROM information_schema.ROUTINES WHERE ROUTINE_SCHEMA = %s) AS routines,
+        (SELECT CONCAT(COUNT(*), ':', COALESCE(SUM(CRC32(CONCAT_WS('|', TABLE_NAME, CREATE_TIME))), 0))
+         FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s) AS tables,
+        (SELECT CONCAT(COUNT(*), ':', COALESCE(SUM(CRC32(CONCAT_WS('|', TRIGGER_NAME, CREATED))), 0))
+         FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = %s) AS triggers
+"""
+
+KEY_COLUMNS = """
+    SELECT TABLE_NAME, CONSTRAINT_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
+    FROM information_schema.KEY_COLUMN_USAGE
+    WHERE TABLE_SCHEMA = %s AND (CONSTRAINT_NAME = 'PRIMARY' OR REFERENCED_TABLE_NAME IS NOT NULL)
+    ORDER BY TABLE_NAME, CONSTRAINT_NAME, ORDINAL_POSITION
+"""
+
+ENUM_COLUMNS = """
+    SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE
+    FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = %s AND DATA_TYPE = 'enum'
+    ORDER BY TABLE_NAME, ORDINAL_POSITION
+"""
+
+TRIGGERS = """
+    SELECT TRIGGER_NAME, ACTION_TIMING, EVENT_MANIPULATION, EVENT_OBJECT_TABLE, ACTION_STATEMENT
+    FROM information_schema.TRIGGERS
+    WHERE TRIGGER_SCHEMA = %s
+    ORDER BY EVENT_OBJECT_TABLE, EVENT_MANIPULATION, ACTION_TIMING, ACTION_ORDER
+"""
+
+ROUTINES = """
+    SELECT ROUTINE_NAME, ROUTINE_TYPE, DTD_IDENTIFIER, IS_DETERMINISTIC, SQL_DATA_ACCESS, ROUTINE_DEFINITION
+    FROM information_schema.ROUTINES
+    WHERE ROUTINE_SCHEMA = %s
+    ORDER BY ROUTINE_NAME
+"""
+
+PARAMETERS = """
+    SELECT SPECIFIC_NAME, ROUTINE_TYPE, PARAMETER_MODE, PARAMETER_NAME, DTD_IDENTIFIER
+    FROM information_schema.PARAMETERS
+    WHERE SPECIFIC_SCHEMA = %s AND ORDINAL_POSITION > 0
+    ORDER BY SPECIFIC_NAME, ORDINAL_POSITION
+"""
+
+
+class SchemaMeta(NamedTuple):
+    fingerprint: tuple
+    primary_keys: dict      # table -> [column, ...]
+    foreign_keys: list      # [(table, column, ref_table, ref_column), ...]
+    enums: list             # [(table, column, column_type), ...]
+    triggers: list          # [dict(name, timing, event, table, statement), ...]
+    procedures: dict        # name -> CREATE PROCEDURE text
+    functions: dict         # name -> CREATE FUNCTION text
+
+
+@st.cache_resource(show_spinner=False)
+def _meta_store():
+    """Process-wide ``{"meta": SchemaMeta}`` plus its lock."""
+    return {}, threading.Lock()
+
+
+def fingerprint():
+    """Cheap checksum that changes whenever a table, routine or trigger is (re)created."""
+    if db.is_sqlite():
+        sql, params = sqlite_backend.FINGERPRINT, None
+    else:
+        sql, params = FINGERPRINT, (config.DB_NAME,) * 3
+    row = db.fetch_one(sql, params, ttl=config.SCHEMA_FINGERPRINT_TTL, tables=("information_schema",))
+    return tuple(row) if row else ()
+
+
+def _create_statement(routine, params):
+    kind = routine["ROUTINE_TYPE"]
+    args = ", ".join(
+        " ".join(p for p in ((mode if kind == "PROCEDURE" else None), name, dtd) if p)
+        for mode, name, dtd in params
+    )
+    lines = [f"CREATE {kind} `{routine['ROUTINE_NAME']}`({args})"]
+    if kind == "FUNCTION":
+        lines.append(f"RETURNS {routine['DTD_IDENTIFIER']}")
+    if routine["IS_DETERMINISTIC"] == "YES":
+        lines.append("DETERMINISTIC")
+    if routine["SQL_DATA_ACCESS"] and routine["SQL_DATA_ACCESS"] != "CONTAINS SQL":
+        lines.append(routine["SQL_DATA_ACCESS"])
+    definition = routine["ROUTINE_DEFINITION"]
+    lines.append(definition if definition is not None else f"-- Could not load {kind.lower()} body")
+    return "\n".join(lines)
+
+
+def _load_sqlite(fp):
+    primary_keys = {}
+    for table, column, _ in db.fetch_all(sqlite_backend.KEY_COLUMNS):
+        primary_keys.setdefault(table, []).append(column)
+    foreign_keys = [tuple(r) for r in db.fetch_all(sqlite_backend.FOREIGN_KEYS)]
+    enums = sqlite_backend.enum_columns(db.fetch_all(sqlite_backend.TABLE_DDL))
+    triggers = [
+        dict(zip(("timing", "event"), sqlite_backend.trigger_event(stmt)), name=name, table=table, statement=stmt)
+        for name, table, stmt in db.fetch_all(sqlite_backend.TRIGGERS)
+    ]
+    return SchemaMeta(fp, primary_keys, foreign_keys, enums, triggers, {}, sqlite_backend.function_sources())
+
+
+def load(fp):
+    """Fetch all metadata with set-based queries (no per-routine round trips)."""
+    if db.is_sqlite():
+        return _load_sqlite(fp)
+    schema = (config.DB_NAME,)
+
+    primary_keys, foreign_keys = {}, []
+    for row in db.fetch_all(KEY_COLUMNS, schema, dictionary=True):
+        if row["CONSTRAINT_NAME"] == "PRIMARY":
+            primary_keys.setdefault(row["TABLE_NAME"], []).append(row["COLUMN_NAME"])
+        else:
+            foreign_keys.append((row["TABLE_NAME"], row["COLUMN_NAME"],
+                                 row["REFERENCED_TABLE_NAME"], row["REFERENCED_COLUMN_NAME"]))
+
+    enums = [tuple(r) for r in db.fetch_all(ENUM_COLUMNS, schema)]
+
+    triggers = [
+        dict(name=name, timing=timing, event=event, table=table, statement=stmt)
+        for name, timing, event, table, stmt in db.fetch_all(TRIGGERS, schema)
+    ]
+
+    params = {}
+    for name, kind, mode, pname, dtd in db.fetch_all(PARAMETERS, schema):
+        params.setdefault((kind, name), []).append((mode, pname, dtd))
+
+    procedures, functions = {}, {}
+    for routine in db.fetch_all(ROUTINES, schema, dictionary=True):
+        key = (routine["ROUTINE_TYPE"], routine["ROUTINE_NAME"])
+        text = _create_statement(routine, params.get(key, []))
+        (procedures if routine["ROUTINE_TYPE"] == "PROCEDURE" else functions)[routine["ROUTINE_NAME"]] = text
+
+    return SchemaMeta(fp, primary_keys, foreign_keys, enums, triggers, procedures, functions)
+
+
+def get_schema_meta(refresh=False):
+    """The current ``SchemaMeta``, reloaded only when the fingerprint changes."""
+    if refresh:
+        db.get_query_cache().invalidate(("information_schema",))
+    fp = fingerprint()
+    store, lock = _meta_store()
+    with lock:
+        meta = store.get("meta")
+    if meta is not None and meta.fingerprint == fp and not refresh:
+        return meta
+    meta = load(fp)
+    with lock:
+        store["meta"] = meta
+    return meta
@@ -0,0 +1,120 @@
+"""
+Global search over participants, instructors, injuries and maintenance notes.
+
+Migration V009 keeps one ``SearchDocument`` row per searchable source row
+(title, body and a display line) under a FULLTEXT index; on SQLite the same
+table is an FTS5 virtual table. ``search`` turns the box's text into a
+prefix query that needs every word (``+word*`` on MySQL, ``"word"*`` on
+FTS5) and returns ranked, typed hits (``Hit``) from one index lookup, with no
+``LIKE '%x%'`` scans. A participant hit carries the emergency contact in
+``detail``, so an incident lookup is a single round trip.
+
+Words shorter than ``config.SEARCH_MIN_TERM`` are dropped: InnoDB does not
+index them (``innodb_ft_min_token_size`` defaults to 3).
+
+Dropping or exchanging a partition of Injury or MaintenanceLog fires no
+triggers, so ``partitions.resync`` calls ``rebuild`` to recopy their
+documents from the base tables.
+"""
+
+import re
+from typing import NamedTuple
+
+import config
+from adventureguard import db
+
+KINDS = ("Participant", "Instructor", "Injury", "Maintenance")
+ICONS = {"Participant": "🧍", "Instructor": "🧑‍🏫", "Injury": "🩹", "Maintenance": "🛠"}
+
+_WORD_RE = re.compile(r"\w+")
+
+MYSQL_SEARCH = """
+    SELECT EntityType, EntityKey, EntityID, Title, Detail, LEFT(Body, 160),
+           MATCH(Title, Body) AGAINST (%s IN BOOLEAN MODE) AS Score
+    FROM SearchDocument
+    WHERE MATCH(Title, Body) AGAINST (%s IN BOOLEAN MODE){kinds}
+    ORDER BY Score DESC
+    LIMIT %s
+"""
+
+# bm25() is lower-is-better and weights every column: the title counts double
+SQLITE_SEARCH = """
+    SELECT EntityType, EntityKey, EntityID, Title, Detail, substr(Body, 1, 160),
+           -bm25(SearchDocument, 0, 0, 0, 2.0, 1.0, 0) AS Score
+    FROM SearchDocument
+    WHERE SearchDocument MATCH %s{kinds}
+    ORDER BY Score DESC
+    LIMIT %s
+"""
+
+
+# Kind -> the documents of its source table (same statements as the initial build in V009)
+REBUILD = {
+    "Participant": "SELECT 'Participant', ParticipantID, ParticipantID, Name, "
+                   "CONCAT_WS(' ', ContactNumber, EmergencyContactName, EmergencyContactNumber), "
+                   "CONCAT('Emergency: ', EmergencyContactName, ' ', EmergencyContactNumber, "
+                   "' · Contact: ', ContactNumber) FROM Participant",
+    "Instructor": "SELECT 'Instructor', InstructorID, InstructorID, Name, Expertise, "
+                  "CONCAT('Contact: ', ContactNumber, ' · ', ExperienceYears, ' yrs') FROM Instructor",
+    "Injury": "SELECT 'Injury', CONCAT_WS('|', ParticipantID, InjuryName, InjuryDate), ParticipantID, "
+              "InjuryName, Treatment, CONCAT(Severity, ' · ', InjuryDate, ' · participant #', ParticipantID, "
+              "' · activity #', ActivityID) FROM Injury",
+    "Maintenance": "SELECT 'Maintenance', MaintenanceID, MaintenanceID, IFNULL(Technician, ''), Description, "
+                   "CONCAT(MaintDate, ' · equipment #', EquipmentID, ' · ', Status) FROM MaintenanceLog",
+}
+
+
+class Hit(NamedTuple):
+    kind: str                   # one of KINDS
+    key: str                    # source primary key, '|'-joined
+    entity_id: int
+    title: str
+    detail: str
+    snippet: str                # start of the body
+    score: float
+
+
+def terms(text):
+    """The searchable words of ``text``, lower-cased."""
+    return [w.lower() for w in _WORD_RE.findall(text or "") if len(w) >= config.SEARCH_MIN_TERM]
+
+
+def search(text, kinds=None, limit=None):
+    """The best-ranked hits for ``text``; every word must match as a prefix."""
+    words = terms(text)
+    if not words:
+        return []
+    kinds = [k for k in (kinds or ()) if k in KINDS]
+    kind_sql = f" AND EntityType IN ({', '.join(['%s'] * len(kinds))})" if kinds else ""
+    limit = limit or config.SEARCH_LIMIT
+
+    if db.is_sqlite():
+        query = " ".join(f'"{w}"*' for w in words)
+        rows = db.fetch_all(SQLITE_SEARCH.format(kinds=kind_sql), (query, *kinds, limit))
+    else:
+        query = " ".join(f"+{w}*" for w in words)
+        rows = db.fetch_all(MYSQL_SEARCH.format(kinds=kind_sql), (query, query, *kinds, limit))
+    return [
+        Hit(kind, str(key), int(entity_id), title or "", detail or "", snippet or "", float(score))
+        for kind, key, entity_id, title, detail, snippet, score in rows
+    ]
+
+
+def rebuild(conn, kinds=KINDS):
+    """Recopy the documents of ``kinds`` from their source tables (MySQL); returns the row count."""
+    cur = conn.cursor()
+    try:
+        conn.start_transaction()
+        rows = 0
+        for kind in kinds:
+            cur.execute("DELETE FROM SearchDocument WHERE EntityType = %s", (kind,))
+            cur.execute("INSERT INTO SearchDocument (EntityType, EntityKey, EntityID, Title, Body, Detail) "
+                        + REBUILD[kind])
+            rows += max(cur.rowcount, 0)
+        conn.commit()
+        return rows
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
@@ -0,0 +1,27 @@
+"""
+Summary metric tiles (Home + Dashboard) fetched in a single round trip.
+"""
+
+from typing import NamedTuple
+
+from adventureguard import db
+from adventureguard.queries import SNAPSHOT
+
+
+class Snapshot(NamedTuple):
+    participants: int
+    activities: int
+    instructors: int
+    equipment: int
+    injuries: int
+
+
+EMPTY_SNAPSHOT = Snapshot(0, 0, 0, 0, 0)
+
+
+def get_snapshot(ttl=60):
+    """Return all tile counts as a ``Snapshot`` (cached for ``ttl`` seconds)."""
+    row = db.fetch_one(SNAPSHOT, ttl=ttl)
+    if not row:
+        return EMPTY_SNAPSHOT
+    return Snapshot(*(int(v or 0) for v in row))
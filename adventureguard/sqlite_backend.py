@@ -0,0 +1,341 @@
+"""
+Embedded SQLite engine for ``adventureguard.db`` (``config.DB_ENGINE = "sqlite"``).
+
+The whole app can run in-process, without a MySQL server: ``Pool`` hands out
+connections that behave like pooled ``mysql.connector`` connections (``%s``
+placeholders, ``cursor(dictionary=True)``, ``close()`` returns them to the
+pool), so the pages, ``pd.read_sql`` and the query helpers run unchanged.
+
+A new database file is created from ``Backend_DB/sqlite_schema.sql`` (the
+ADVENTURE tables, indexes and triggers translated to SQLite) and, by
+default, filled with ``Backend_DB/DB_SampleData``. The stored functions are
+reimplemented below and registered on every connection as UDFs, so
+``SELECT fn_total_maintenance_cost(EquipmentID) FROM Equipment`` works on
+either engine. Stored procedures, replicas, the change journal and the
+materialized reports remain MySQL-only.
+"""
+
+import datetime
+import decimal
+import inspect
+import itertools
+import os
+import re
+import sqlite3
+import threading
+from functools import cache, partial
+
+from adventureguard.migrations import split_statements
+
+BACKEND_DB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Backend_DB")
+SCHEMA_PATH = os.path.join(BACKEND_DB_DIR, "sqlite_schema.sql")
+SAMPLE_DATA_PATH = os.path.join(BACKEND_DB_DIR, "DB_SampleData")
+
+Error = sqlite3.Error
+
+# Skips the FTS5 shadow tables behind SearchDocument (V009)
+LIST_TABLES = """
+    SELECT name FROM pragma_table_list
+    WHERE schema = 'main' AND type IN ('table', 'virtual') AND name NOT LIKE 'sqlite!_%' ESCAPE '!'
+    ORDER BY name
+"""
+
+_PARAM_RE = re.compile(r"%s|%%")
+_MYSQL_ONLY_RE = re.compile(r"^\s*(USE|SHOW)\b", re.IGNORECASE)
+
+
+class PoolError(Error):
+    """Every pooled connection is checked out."""
+
+
+def _translate(sql):
+    """mysql.connector ``%s`` placeholders -> sqlite3 ``?``."""
+    return _PARAM_RE.sub(lambda m: "?" if m.group() == "%s" else "%", sql)
+
+
+@cache
+def _register_adapters():
+    """Run on first connect, not at import: numpy alone is ~0.1 s of page start-up."""
+    sqlite3.register_adapter(datetime.date, lambda d: d.isoformat())
+    sqlite3.register_adapter(datetime.datetime, lambda d: d.isoformat(" "))
+    sqlite3.register_adapter(decimal.Decimal, str)
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    for t in (np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64):
+        sqlite3.register_adapter(t, int)
+    sqlite3.register_adapter(np.float32, float)
+    sqlite3.register_adapter(np.float64, float)
+    sqlite3.register_adapter(np.bool_, bool)
+
+
+# ======================================================
+# FUNCTIONS (DataBase_SQL_Code, as Python UDFs)
+# ======================================================
+def fn_total_maintenance_cost(conn, equipment_id):
+    total = conn.execute(
+        "SELECT IFNULL(SUM(Cost), 0) FROM MaintenanceLog WHERE EquipmentID = ?", (equipment_id,)
+    ).fetchone()[0]
+    return round(total, 2)
+
+
+def fn_calculate_age(conn, participant_id):
+    row = conn.execute("SELECT DOB FROM Participant WHERE ParticipantID = ?", (participant_id,)).fetchone()
+    if not row or row[0] is None:
+        return None
+    dob, today = datetime.date.fromisoformat(str(row[0])[:10]), datetime.date.today()
+    return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+
+
+def fn_average_instructor_rating(conn, instructor_id):
+    avg = conn.execute(
+        "SELECT ROUND(AVG(RatingValue), 2) FROM Rating WHERE InstructorID = ?", (instructor_id,)
+    ).fetchone()[0]
+    return avg if avg is not None else 0
+
+
+def fn_total_participants_in_activity(conn, activity_id):
+    return conn.execute(
+        "SELECT COUNT(*) FROM Registers WHERE ActivityID = ? AND PaymentStatus = 'Yes'", (activity_id,)
+    ).fetchone()[0]
+
+
+def fn_injury_count_for_participant(conn, participant_id):
+    return conn.execute("SELECT COUNT(*) FROM Injury WHERE ParticipantID = ?", (participant_id,)).fetchone()[0]
+
+
+FUNCTIONS = {
+    fn.__name__: fn
+    for fn in (
+        fn_total_maintenance_cost,
+        fn_calculate_age,
+        fn_average_instructor_rating,
+        fn_total_participants_in_activity,
+        fn_injury_count_for_participant,
+    )
+}
+
+
+def function_sources():
+    """``name -> Python source`` of every UDF (shown on the Backend Implementation page)."""
+    return {name: inspect.getsource(fn) for name, fn in FUNCTIONS.items()}
+
+
+# ======================================================
+# CONNECTIONS
+# ======================================================
+class Cursor:
+    """``sqlite3.Cursor`` with mysql.connector's placeholders and ``dictionary=`` rows."""
+
+    def __init__(self, raw, dictionary=False):
+        self._cur = raw
+        self._dictionary = dictionary
+
+    def execute(self, sql, params=None):
+        if params is None:
+            self._cur.execute(sql)
+        else:
+            self._cur.execute(_translate(sql), tuple(params))
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._cur.executemany(_translate(sql), seq_of_params)
+        return self
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip((d[0] for d in self._cur.description), row))
+
+    def fetchone(self):
+        return self._row(self._cur.fetchone())
+
+    def fetchmany(self, size=None):
+        rows = self._cur.fetchmany(size) if size else self._cur.fetchmany()
+        return [self._row(r) for r in rows]
+
+    def fetchall(self):
+        return [self._row(r) for r in self._cur.fetchall()]
+
+    def __iter__(self):
+        return (self._row(r) for r in self._cur)
+
+    @property
+    def description(self):
+        return self._cur.description
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cur.lastrowid
+
+    def close(self):
+        self._cur.close()
+
+
+class Connection:
+    """A pooled SQLite connection with the parts of mysql.connector's API the app uses."""
+
+    server_host = server_port = None    # there is only ever the one "server"
+
+    def __init__(self, raw, pool, connection_id):
+        self._raw = raw
+        self._pool = pool
+        self.connection_id = connection_id
+
+    def cursor(self, dictionary=False, buffered=False, **_):
+        return Cursor(self._raw.cursor(), dictionary)
+
+    def start_transaction(self, **_):
+        if not self._raw.in_transaction:
+            self._raw.execute("BEGIN")
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def ping(self, **_):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def interrupt(self):
+        self._raw.interrupt()
+
+    def close(self):
+        """Roll back anything left open and hand the connection back to the pool."""
+        if self._raw.in_transaction:
+            self._raw.rollback()
+        self._pool._release(self)
+
+
+def connect_raw(path):
+    """A configured ``sqlite3`` connection with the UDFs registered."""
+    _register_adapters()
+    if path == ":memory:":
+        # One database shared by every pooled connection
+        raw = sqlite3.connect("file:adventureguard?mode=memory&cache=shared", uri=True,
+                              check_same_thread=False)
+    else:
+        raw = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        raw.execute("PRAGMA journal_mode = WAL")
+    raw.execute("PRAGMA foreign_keys = ON")
+    for name, fn in FUNCTIONS.items():
+        raw.create_function(name, 1, partial(fn, raw))
+    return raw
+
+
+def initialize(raw, sample_data=True):
+    """Create the schema (and load the sample data) if the database is empty."""
+    if raw.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]:
+        return False
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        raw.executescript(f.read())
+    if sample_data:
+        # The sample script references some participants before inserting
+        # them: check foreign keys once, at commit
+        raw.execute("BEGIN")
+        raw.execute("PRAGMA defer_foreign_keys = ON")
+        with open(SAMPLE_DATA_PATH, encoding="utf-8") as f:
+            for stmt in split_statements(f.read()):
+                if not _MYSQL_ONLY_RE.match(stmt):
+                    raw.execute(stmt)
+        raw.commit()
+    return True
+
+
+class Pool:
+    """Fixed-size pool of SQLite connections to one database file."""
+
+    def __init__(self, path, size, sample_data=True):
+        self.path = path
+        self.size = size
+        self._ids = itertools.count(1)
+        self._idle = []
+        self._all = {}
+        self._lock = threading.Lock()
+        first = self._new()
+        initialize(first._raw, sample_data)
+        self._idle.append(first)
+
+    def _new(self):
+        conn = Connection(connect_raw(self.path), self, next(self._ids))
+        self._all[conn.connection_id] = conn
+        return conn
+
+    def get_connection(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            if len(self._all) >= self.size:
+                raise PoolError("Failed getting connection; pool exhausted")
+            return self._new()
+
+    def _release(self, conn):
+        with self._lock:
+            self._idle.append(conn)
+
+    def interrupt(self, connection_id):
+        """Abort the statement running on ``connection_id`` (the SQLite ``KILL QUERY``)."""
+        conn = self._all.get(connection_id)
+        if conn is not None:
+            conn.interrupt()
+
+
+def is_interrupted(exc):
+    return isinstance(exc, sqlite3.OperationalError) and str(exc) == "interrupted"
+
+
+# ======================================================
+# METADATA (Backend Implementation / View Tables pages)
+# ======================================================
+FINGERPRINT = "PRAGMA schema_version"
+
+COLUMNS = "SELECT name AS COLUMN_NAME FROM pragma_table_info(%s) ORDER BY cid"
+
+PRIMARY_KEY = "SELECT name AS COLUMN_NAME FROM pragma_table_info(%s) WHERE pk > 0 ORDER BY pk"
+
+KEY_COLUMNS = """
+    SELECT m.name AS TABLE_NAME, p.name AS COLUMN_NAME, p.pk AS POSITION
+    FROM sqlite_master m JOIN pragma_table_info(m.name) p
+    WHERE m.type = 'table' AND p.pk > 0 AND m.name NOT LIKE 'sqlite!_%' ESCAPE '!'
+    ORDER BY m.name, p.pk
+"""
+
+FOREIGN_KEYS = """
+    SELECT m.name, f."from", f."table", f."to"
+    FROM sqlite_master m JOIN pragma_foreign_key_list(m.name) f
+    WHERE m.type = 'table'
+    ORDER BY m.name, f.id, f.seq
+"""
+
+TABLE_DDL = "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND sql IS NOT NULL ORDER BY name"
+
+TRIGGERS = "SELECT name, tbl_name, sql FROM sqlite_master WHERE type = 'trigger' ORDER BY tbl_name, name"
+
+_ENUM_RE = re.compile(r"^\s*(\w+)\b[^,]*?CHECK\s*\(\s*\1\s+IN\s*\(([^)]*)\)\s*\)", re.IGNORECASE | re.MULTILINE)
+_TRIGGER_RE = re.compile(r"\b(BEFORE|AFTER|INSTEAD\s+OF)\s+(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+def enum_columns(ddl_rows):
+    """``[(table, column, "enum('a','b')"), ...]`` from the ``CHECK (col IN (...))`` constraints."""
+    return [
+        (table, column, "enum(" + re.sub(r"\s*,\s*", ",", values.strip()) + ")")
+        for table, ddl in ddl_rows
+        for column, values in _ENUM_RE.findall(ddl)
+    ]
+
+
+def trigger_event(ddl):
+    """``(timing, event)`` of a ``CREATE TRIGGER`` statement."""
+    match = _TRIGGER_RE.search(ddl)
+    if not match:
+        return "", ""
+    return " ".join(match.group(1).upper().split()), match.group(2).upper()
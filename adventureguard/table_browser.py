@@ -0,0 +1,210 @@
+"""
+Server-side, keyset-paginated table browser used by the View Tables page.
+
+Instead of ``SELECT * FROM table`` into a DataFrame, each page is fetched with
+``WHERE (sort, pk) > (last seen) ORDER BY sort, pk LIMIT n`` so the cost of a
+page does not depend on how deep into the table it is or how big the table
+is. Projection, filters and sort are pushed down to SQL; every identifier is
+checked against ``information_schema`` (``pragma_table_info`` on SQLite)
+before being quoted into a statement.
+"""
+
+import config
+from adventureguard import db
+from adventureguard import sqlite_backend
+
+# Metadata changes rarely; keep it around for a while
+META_TTL = 300
+
+FILTER_OPS = {
+    "=": "=",
+    "!=": "<>",
+    ">": ">",
+    ">=": ">=",
+    "<": "<",
+    "<=": "<=",
+    "starts with": "LIKE",
+    "contains": "LIKE",
+    "is empty": "IS NULL",
+}
+
+
+def _quote(name):
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _to_param(value):
+    """Convert a pandas/numpy cell back into something the driver can bind."""
+    if value is None or value != value:     # NULL read back as NaN / NaT
+        return None
+    if hasattr(value, "to_pydatetime"):
+        return value.to_pydatetime()
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def _escape_like(value):
+    # '!' rather than the backslash: it means the same on MySQL and SQLite
+    return value.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def get_columns(table):
+    """Column names of ``table`` in definition order."""
+    if db.is_sqlite():
+        return db.read_sql(sqlite_backend.COLUMNS, (table,), ttl=META_TTL)["COLUMN_NAME"].tolist()
+    df = db.read_sql("""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA=%s AND TABLE_NAME=%s
+        ORDER BY ORDINAL_POSITION;
+    """, (config.DB_NAME, table), ttl=META_TTL)
+    return df["COLUMN_NAME"].tolist()
+
+
+def get_primary_key(table):
+    """Primary-key columns of ``table`` in key order."""
+    if db.is_sqlite():
+        return db.read_sql(sqlite_backend.PRIMARY_KEY, (table,), ttl=META_TTL)["COLUMN_NAME"].tolist()
+    df = db.read_sql("""
+        SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA=%s AND TABLE_NAME=%s AND CONSTRAINT_NAME='PRIMARY'
+        ORDER BY ORDINAL_POSITION;
+    """, (config.DB_NAME, table), ttl=META_TTL)
+    return df["COLUMN_NAME"].tolist()
+
+
+def _seek(sort, pk, after, descending):
+    """
+    WHERE fragment + params for the rows after cursor ``after`` in
+    ``ORDER BY sort, pk``. Both engines sort NULLs first ascending and last
+    descending, and a row comparison with NULL is never true, so a nullable
+    sort column needs the NULL cases spelled out.
+    """
+    op = "<" if descending else ">"
+    keys = "(" + ", ".join(_quote(c) for c in pk) + ")"
+    key_after = f"{keys} {op} (" + ", ".join(["%s"] * len(pk)) + ")"
+    if sort is None:
+        return key_after, list(after)
+    value, key = after[0], list(after[1:])
+    col = _quote(sort)
+    if value is None:
+        if descending:      # NULLs come last: only the rest of the NULL run
+            return f"({col} IS NULL AND {key_after})", key
+        return f"(({col} IS NULL AND {key_after}) OR {col} IS NOT NULL)", key
+    clause = f"{col} {op} %s OR ({col} = %s AND {key_after})"
+    if descending:
+        clause += f" OR {col} IS NULL"
+    return f"({clause})", [value, value] + key
+
+
+def _where(filters, columns):
+    """Build a WHERE fragment + params from ``[(column, op, value), ...]``."""
+    clauses, params = [], []
+    for column, op, value in filters or ():
+        if column not in columns or op not in FILTER_OPS:
+            raise ValueError(f"Invalid filter: {column} {op}")
+        sql_op = FILTER_OPS[op]
+        if op == "is empty":
+            clauses.append(f"{_quote(column)} IS NULL")
+            continue
+        if op == "starts with":
+            value = _escape_like(str(value)) + "%"
+        elif op == "contains":
+            value = "%" + _escape_like(str(value)) + "%"
+        clauses.append(f"{_quote(column)} {sql_op} %s" + (" ESCAPE '!'" if sql_op == "LIKE" else ""))
+        params.append(value)
+    return clauses, params
+
+
+def approx_row_count(table, filters=None):
+    """
+    Cheap row-count estimate: ``TABLES.TABLE_ROWS`` when unfiltered, otherwise
+    the optimizer's row estimate from EXPLAIN. Never scans the table.
+    SQLite keeps no such estimates, so there the count is exact.
+    """
+    if db.is_sqlite():
+        clauses, params = _where(filters, get_columns(table))
+        sql = f"SELECT COUNT(*) FROM {_quote(table)}" + (" WHERE " + " AND ".join(clauses) if clauses else "")
+        return int(db.fetch_value(sql, tuple(params), ttl=None if filters else META_TTL))
+
+    if not filters:
+        return int(db.fetch_value("""
+            SELECT TABLE_ROWS FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA=%s AND TABLE_NAME=%s;
+        """, (config.DB_NAME, table), ttl=META_TTL) or 0)
+
+    clauses, params = _where(filters, get_columns(table))
+    rows = db.fetch_all(
+        f"EXPLAIN SELECT 1 FROM {_quote(table)} WHERE " + " AND ".join(clauses),
+        params, dictionary=True,
+    )
+    return int(rows[0]["rows"] or 0) if rows else 0
+
+
+def fetch_page(table, columns=None, filters=None, sort=None, descending=False,
+               after=None, page_size=50):
+    """
+    Return ``(df, next_cursor)`` for one page of ``table``.
+
+    ``after`` is the cursor returned for the previous page (``None`` for the
+    first page); ``next_cursor`` is ``None`` once the end is reached. Rows
+    with NULL in the sort column come first ascending and last descending.
+    """
+    all_columns = get_columns(table)
+    pk = get_primary_key(table)
+    if not pk:
+        raise ValueError(f"Table '{table}' has no primary key to paginate on.")
+
+    columns = [c for c in (columns or all_columns) if c in all_columns]
+    if sort is not None and sort not in all_columns:
+        raise ValueError(f"Unknown sort column: {sort}")
+
+    # Key columns always come back: they are the cursor
+    sort = sort if sort and sort not in pk else None
+    order_cols = ([sort] if sort else []) + pk
+    select_cols = list(dict.fromkeys(columns + order_cols))
+
+    clauses, params = _where(filters, all_columns)
+    if after is not None:
+        clause, seek_params = _seek(sort, pk, after, descending)
+        clauses.append(clause)
+        params.extend(seek_params)
+
+    direction = " DESC" if descending else ""
+    sql = (
+        "SELECT " + ", ".join(_quote(c) for c in select_cols)
+        + f" FROM {_quote(table)}"
+        + (" WHERE " + " AND ".join(clauses) if clauses else "")
+        + " ORDER BY " + ", ".join(_quote(c) + direction for c in order_cols)
+        + " LIMIT %s"
+    )
+    # One extra row tells us whether another page exists
+    df = db.read_sql(sql, tuple(params) + (page_size + 1,))
+
+    next_cursor = None
+    if len(df) > page_size:
+        df = df.iloc[:page_size]
+        last = df.iloc[-1]
+        next_cursor = tuple(_to_param(last[c]) for c in order_cols)
+
+    return df[columns + [c for c in select_cols if c not in columns]], next_cursor
+
+
+def select_sql(table, columns=None, filters=None):
+    """
+    ``(sql, params)`` reading every matching row of ``table`` in primary-key
+    order (a clustered-index walk, no sort), for exports.
+    """
+    all_columns = get_columns(table)
+    columns = [c for c in (columns or all_columns) if c in all_columns]
+    if not columns:
+        raise ValueError(f"Unknown table or columns: {table}")
+    clauses, params = _where(filters, all_columns)
+    pk = get_primary_key(table)
+    sql = (
+        "SELECT " + ", ".join(_quote(c) for c in columns)
+        + f" FROM {_quote(table)}"
+        + (" WHERE " + " AND ".join(clauses) if clauses else "")
+        + (" ORDER BY " + ", ".join(_quote(c) for c in pk) if pk else "")
+    )
+    return sql, tuple(params)
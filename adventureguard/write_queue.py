@@ -0,0 +1,423 @@
+"""
+Write-behind queue for the Add Data forms (``config.WRITE_BEHIND``).
+
+A form's INSERT is appended to a local SQLite journal
+(``config.WRITE_QUEUE_PATH``, WAL + ``synchronous=FULL``), so the form is
+acknowledged as soon as the entry is on disk instead of waiting for MySQL.
+One background thread per server process drains the journal in group
+commits: up to ``config.WRITE_BATCH_ROWS`` entries in one transaction, as
+soon as that many are queued or the oldest has waited
+``config.WRITE_BATCH_MS``.
+
+Each entry runs behind a savepoint. An entry the database rejects (a
+trigger ``SIGNAL`` such as the injury-severity check, a duplicate key, a
+missing parent) is rolled back alone and marked failed with the error
+text; the rest of the batch still commits. The Add Data page polls the
+journal for its session's tickets and shows those errors. Deadlocks, lock
+timeouts and lost connections roll back the whole batch, which is retried.
+
+The tickets a batch applied are inserted into ``AppliedWrite`` (migration
+V010) in the same transaction. If the process dies after the commit but
+before the journal is updated, the entries are found there on restart and
+not applied twice. Unapplied entries simply wait in the journal for the
+next start.
+
+Use one journal file per server process. Queued rows are not visible to
+reads (or to the entity pickers) until their batch commits.
+
+    python -m adventureguard.write_queue            # journal status + recent failures
+    python -m adventureguard.write_queue --drain    # apply what is queued (app stopped)
+"""
+
+import argparse
+import datetime
+import decimal
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import streamlit as st
+
+import config
+from adventureguard import db
+from adventureguard.cache import tables_written
+from adventureguard.instrument import Tracker
+from adventureguard.migrations import connect
+
+QUEUED, DONE, FAILED = "queued", "done", "failed"
+
+RETRY_ERRNOS = {1205, 1213}     # lock wait timeout, deadlock: retry the whole batch
+RETRY_DELAY = 1.0               # seconds before a failed batch is retried
+GROUP_COMMIT = "WRITE-BEHIND GROUP COMMIT"      # how a batch shows up on the Performance page
+POLL_SECONDS = 2                # how often the Add Data page checks its queued writes
+
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS entry (
+    ticket INTEGER PRIMARY KEY AUTOINCREMENT,   -- never reused, even after a purge
+    sql TEXT NOT NULL,
+    params TEXT NOT NULL,
+    queued_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    error TEXT,
+    settled_at REAL
+);
+CREATE INDEX IF NOT EXISTS entry_status ON entry (status, ticket);
+"""
+
+
+# ======================================================
+# PARAMETERS (JSON, with dates and decimals tagged)
+# ======================================================
+def _encode(value):
+    if isinstance(value, datetime.datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return {"$decimal": str(value)}
+    raise TypeError(f"Cannot queue a parameter of type {type(value).__name__}")
+
+
+_DECODERS = {
+    "$datetime": datetime.datetime.fromisoformat,
+    "$date": datetime.date.fromisoformat,
+    "$decimal": decimal.Decimal,
+}
+
+
+def _decode(obj):
+    if len(obj) == 1:
+        (tag, value), = obj.items()
+        if tag in _DECODERS:
+            return _DECODERS[tag](value)
+    return obj
+
+
+def dump_params(params):
+    return json.dumps(list(params or ()), default=_encode)
+
+
+def load_params(text):
+    return tuple(json.loads(text, object_hook=_decode))
+
+
+# ======================================================
+# JOURNAL (local SQLite file)
+# ======================================================
+class Journal:
+    """The durable queue: one row per form write, ``queued`` until its batch settles."""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = FULL")     # an acknowledged entry survives a crash
+        self._conn.executescript(JOURNAL_SCHEMA)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO meta VALUES ('origin', ?)", (uuid.uuid4().hex,))
+            self.origin = self._conn.execute("SELECT value FROM meta WHERE key = 'origin'").fetchone()[0]
+
+    def append(self, sql, params):
+        """Queue one statement; returns its ticket once it is on disk."""
+        encoded = dump_params(params)
+        with self._lock:
+            return self._conn.execute(
+                "INSERT INTO entry (sql, params, queued_at) VALUES (?, ?, ?)", (sql, encoded, time.time())
+            ).lastrowid
+
+    def queued(self, limit):
+        """The oldest ``limit`` queued entries as ``(ticket, sql, params)``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ticket, sql, params FROM entry WHERE status = 'queued' ORDER BY ticket LIMIT ?", (limit,)
+            ).fetchall()
+        return [(ticket, sql, load_params(params)) for ticket, sql, params in rows]
+
+    def backlog(self):
+        """``(number queued, queued_at of the oldest)``."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*), MIN(queued_at) FROM entry WHERE status = 'queued'"
+            ).fetchone()
+
+    def settle(self, outcomes):
+        """Record ``{ticket: error or None}`` in one transaction."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "UPDATE entry SET status = ?, error = ?, settled_at = ? WHERE ticket = ?",
+                    [(DONE if error is None else FAILED, error, now, ticket) for ticket, error in outcomes.items()],
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def settled_upto(self):
+        """Every ticket up to this one has settled (0 if none has)."""
+        with self._lock:
+            first_queued, last = self._conn.execute(
+                "SELECT MIN(CASE WHEN status = 'queued' THEN ticket END), MAX(ticket) FROM entry"
+            ).fetchone()
+        return (first_queued - 1) if first_queued is not None else (last or 0)
+
+    def status(self, tickets):
+        """``{ticket: (status, error)}`` for the given tickets."""
+        tickets = list(tickets)
+        if not tickets:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT ticket, status, error FROM entry WHERE ticket IN ({', '.join('?' * len(tickets))})",
+                tickets,
+            ).fetchall()
+        return {ticket: (status, error) for ticket, status, error in rows}
+
+    def counts(self):
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM entry GROUP BY status").fetchall())
+
+    def failures(self, limit=20):
+        """Most recent failed entries as ``(ticket, sql, error)``."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT ticket, sql, error FROM entry WHERE status = 'failed' ORDER BY ticket DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+    def purge(self, older_than):
+        """Forget settled entries settled before ``older_than`` (epoch seconds)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entry WHERE status != 'queued' AND settled_at < ?", (older_than,))
+
+
+# ======================================================
+# GROUP COMMIT
+# ======================================================
+def _lost_transaction(err):
+    return getattr(err, "errno", None) in RETRY_ERRNOS
+
+
+def recover(conn, journal):
+    """
+    Mark done the queued entries that a commit already applied (the process
+    died before the journal was updated). Returns their tickets.
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT Ticket FROM AppliedWrite WHERE Origin = %s", (journal.origin,))
+        applied = [int(ticket) for (ticket,) in cur.fetchall()]
+    finally:
+        cur.close()
+    done = [ticket for ticket, (status, _) in journal.status(applied).items() if status == QUEUED]
+    if done:
+        journal.settle({ticket: None for ticket in done})
+    return done
+
+
+def apply_batch(conn, origin, batch, settled_upto=0):
+    """
+    Run ``batch`` (``[(ticket, sql, params)]``) in one transaction and
+    return ``{ticket: error or None}``. Raises, with nothing applied, when
+    the transaction itself is lost (deadlock, disconnect).
+    """
+    outcomes = {}
+    cur = conn.cursor()
+    try:
+        for ticket, sql, params in batch:
+            cur.execute("SAVEPOINT write_behind")
+            try:
+                cur.execute(sql, params)
+            except db.Error as e:
+                if _lost_transaction(e):
+                    raise
+                # Raises in turn if the server already rolled everything back
+                cur.execute("ROLLBACK TO SAVEPOINT write_behind")
+                outcomes[ticket] = str(e)
+            else:
+                outcomes[ticket] = None
+        applied = [ticket for ticket, error in outcomes.items() if error is None]
+        if applied:
+            cur.execute(
+                f"INSERT INTO AppliedWrite (Origin, Ticket) VALUES {', '.join(['(%s, %s)'] * len(applied))}",
+                tuple(v for ticket in applied for v in (origin, ticket)),
+            )
+        if settled_upto:
+            # The journal has recorded these; their markers are no longer needed
+            cur.execute("DELETE FROM AppliedWrite WHERE Origin = %s AND Ticket <= %s", (origin, settled_upto))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return outcomes
+
+
+class WriteQueue:
+    """The journal plus the thread that drains it."""
+
+    def __init__(self, journal, route, cache, log):
+        self.journal = journal
+        self.route = route          # resolved by the page: the thread has no script context
+        self.cache = cache
+        self.log = log
+        self.last_error = None      # last batch-level failure, shown on the page
+        self._wake = threading.Condition()
+        self._recovered = False
+
+    def start(self):
+        threading.Thread(target=self._run, name="write-behind", daemon=True).start()
+        return self
+
+    def submit(self, sql, params=None):
+        """Queue one write and wake the worker; returns its ticket."""
+        ticket = self.journal.append(sql, params)
+        with self._wake:
+            self._wake.notify()
+        return ticket
+
+    def _wait_for_batch(self):
+        with self._wake:
+            while True:
+                queued, oldest = self.journal.backlog()
+                if queued >= config.WRITE_BATCH_ROWS:
+                    return
+                if queued:
+                    remaining = oldest + config.WRITE_BATCH_MS / 1000 - time.time()
+                    if remaining <= 0:
+                        return
+                    self._wake.wait(remaining)
+                else:
+                    self._wake.wait()
+
+    def drain_once(self):
+        """Apply the oldest queued batch; returns ``{ticket: error or None}``."""
+        if not self._recovered:
+            with db.connection(self.route) as conn:
+                recover(conn, self.journal)
+            self._recovered = True
+        batch = self.journal.queued(config.WRITE_BATCH_ROWS)
+        if not batch:
+            return {}
+        try:
+            with Tracker(self.log, "write", GROUP_COMMIT) as t, db.connection(self.route) as conn:
+                outcomes = apply_batch(conn, self.journal.origin, batch, self.journal.settled_upto())
+                t.rows = sum(error is None for error in outcomes.values())
+            written = set()
+            for _, sql, _ in batch:
+                written |= tables_written(sql)
+            self.cache.invalidate(written)
+            self.journal.settle(outcomes)
+        except Exception:
+            # The batch may have committed (lost reply, journal locked while
+            # settling): look for its AppliedWrite markers before the retry
+            self._recovered = False
+            raise
+        return outcomes
+
+    def _run(self):
+        next_purge = 0
+        while True:
+            self._wait_for_batch()
+            try:
+                self.drain_once()
+                self.last_error = None
+            except Exception as e:
+                # The batch stays queued; recover() skips whatever was committed
+                self.last_error = f"{type(e).__name__}: {e}"
+                time.sleep(RETRY_DELAY)
+            if time.time() >= next_purge:
+                self.journal.purge(time.time() - config.WRITE_QUEUE_KEEP_HOURS * 3600)
+                next_purge = time.time() + 3600
+
+
+@st.cache_resource(show_spinner=False)
+def get_queue():
+    """The process-wide queue; its worker starts on first use and drains any backlog."""
+    journal = Journal(config.WRITE_QUEUE_PATH)
+    return WriteQueue(journal, db.primary_route(), db.get_query_cache(), db.get_query_log()).start()
+
+
+# ======================================================
+# PAGE HELPERS
+# ======================================================
+_TICKETS_KEY = "_write_behind_tickets"      # {ticket: success message}, this session's pending writes
+_FAILED_KEY = "_write_behind_failed"        # [(ticket, message, error)] until dismissed
+
+
+def submit(sql, params=None, message=""):
+    """Queue a form write for this session; ``message`` is shown once it commits."""
+    ticket = get_queue().submit(sql, params)
+    st.session_state.setdefault(_TICKETS_KEY, {})[ticket] = message
+    return ticket
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def outcomes():
+    """Report this session's queued writes as they commit or are rejected."""
+    pending = st.session_state.get(_TICKETS_KEY, {})
+    queue = get_queue()
+    for ticket, (status, error) in queue.journal.status(pending).items():
+        if status == QUEUED:
+            continue
+        message = pending.pop(ticket)
+        if status == DONE:
+            st.toast(f"#{ticket}: {message}")
+        else:
+            st.session_state.setdefault(_FAILED_KEY, []).append((ticket, message, error))
+            st.toast(f"❌ #{ticket} was rejected: {error}")
+
+    if pending:
+        st.info(f"⏳ {len(pending):,} write(s) from this session waiting to be committed.")
+    if queue.last_error:
+        st.warning(f"Write-behind worker is retrying: {queue.last_error}")
+    failed = st.session_state.get(_FAILED_KEY, [])
+    for ticket, message, error in failed:
+        st.error(f"❌ Queued write #{ticket} was rejected by the database: {error}")
+    if failed and st.button("Dismiss", key="write_behind_dismiss"):
+        failed.clear()
+        st.rerun(scope="fragment")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show (or drain) the Add Data write-behind journal.")
+    parser.add_argument("--path", default=config.WRITE_QUEUE_PATH, help="journal file")
+    parser.add_argument("--drain", action="store_true", help="apply every queued entry now")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"No journal at {args.path}")
+        return
+    journal = Journal(args.path)
+    if args.drain:
+        conn = connect()
+        try:
+            recovered = recover(conn, journal)
+            if recovered:
+                print(f"{len(recovered):,} entries had already been applied")
+            while True:
+                batch = journal.queued(config.WRITE_BATCH_ROWS)
+                if not batch:
+                    break
+                outcomes = apply_batch(conn, journal.origin, batch, journal.settled_upto())
+                journal.settle(outcomes)
+                print(f"Applied {sum(e is None for e in outcomes.values()):,} / {len(outcomes):,} entries")
+        finally:
+            conn.close()
+
+    counts = journal.counts()
+    print(", ".join(f"{counts.get(s, 0):,} {s}" for s in (QUEUED, DONE, FAILED)))
+    for ticket, sql, error in journal.failures():
+        print(f"#{ticket:<8} {' '.join(sql.split())[:60]:<60}  {error}")
+
+
+if __name__ == "__main__":
+    main()
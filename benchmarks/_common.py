@@ -0,0 +1,66 @@
+"""
+Shared plumbing for the benchmark scripts in this folder.
+
+Benchmarks talk to MySQL directly (no Streamlit) using the settings in
+config.py, so run them from the repository root:
+
+    python -m benchmarks.<name> --help
+"""
+
+import math
+import statistics
+import time
+
+import mysql.connector
+
+import config
+
+
+def connect(**overrides):
+    """Open a plain (unpooled) connection using config.py settings."""
+    params = dict(
+        host=config.DB_HOST,
+        user=config.DB_USER,
+        password=config.DB_PASSWORD,
+        database=config.DB_NAME,
+        port=config.DB_PORT,
+    )
+    params.update(overrides)
+    return mysql.connector.connect(**params)
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples`` (pct in 0-100)."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def time_call(fn, repeat):
+    """Run ``fn`` ``repeat`` times and return per-call wall times in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples):
+    return {
+        "mean": statistics.fmean(samples) if samples else 0.0,
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+    }
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    line = "  ".join(str(h).ljust(w) for h, w in zip(headers, widths))
+    print(line)
+    print("-" * len(line))
+    for r in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(r, widths)))
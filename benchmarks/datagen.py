@@ -0,0 +1,309 @@
+"""
+Parametric synthetic data generator for all nine ADVENTURE tables.
+
+``--scale`` is the number of Registers rows (the largest table); every other
+table is sized relative to it, so scale 1e3 gives a toy dataset and 1e7 a
+production-sized one. Popularity is Zipf-skewed: a few activities draw most
+registrations, a few instructors most ratings, a few items of equipment most
+maintenance, and a small share of participants most injuries.
+
+Rows are generated in participant-sized chunks with explicit IDs (so child
+rows can reference them without reading anything back) and inserted with
+``executemany``. Injury dates never precede the activity start, ratings
+stay within 1-5, and no instructor or item of equipment is booked for two
+overlapping activities (V007), so the validation triggers accept every row.
+
+    python -m benchmarks.datagen --scale 100000
+"""
+
+import argparse
+import datetime
+import time
+
+import numpy as np
+
+from benchmarks._common import connect
+
+# Table sizes as a fraction of the Registers row count (with small floors)
+RATIOS = {
+    "Participant": (1 / 3, 30),
+    "Instructor": (1 / 1000, 10),
+    "Activity": (1 / 100, 20),
+    "Equipment": (1 / 200, 20),
+    "MaintenanceLog": (1 / 2, 20),
+}
+
+FIRST = ["Aarav", "Aditi", "Amit", "Ananya", "Arjun", "Divya", "Ishaan", "Kavya", "Karan", "Meera",
+         "Neha", "Nikhil", "Pooja", "Priya", "Rahul", "Riya", "Rohan", "Sanya", "Shreya", "Vikram"]
+LAST = ["Bhat", "Desai", "Gupta", "Iyer", "Joshi", "Kapoor", "Kumar", "Mehta", "Menon", "Nair",
+        "Patel", "Rao", "Reddy", "Shah", "Sharma", "Singh", "Thakur", "Verma"]
+ACTIVITY_TYPES = ["Climbing", "Kayaking", "Yoga", "Rafting", "Jumping", "Zorbing", "Aerial",
+                  "Cycling", "Water", "Archery", "Hiking", "Snow"]
+EQUIPMENT_TYPES = ["Climbing Rope", "Harness", "Kayak", "Paddle", "Yoga Mat", "Helmet", "Bungee Cord",
+                   "Zorbing Ball", "Wall Grips", "Paraglider", "Cycle", "Oxygen Tank", "Snowboard"]
+INJURIES = ["Knee Sprain", "Finger Cut", "Shoulder Pain", "Back Strain", "Ankle Twist", "Neck Pain",
+            "Minor Bruise", "Hand Scratch", "Calf Cramp", "Ear Block", "Blisters", "Leg Sprain",
+            "Wrist Twist", "Muscle Pull", "Elbow Bruise", "Foot Cramps"]
+TREATMENTS = ["Physiotherapy", "Medication", "Rest", "Bandage", "Stretching", "Electrolytes"]
+MAINT_WORK = ["Replaced outer sheath", "Rebuckled joints", "Repaired cracks", "Polished surface",
+              "Padding replaced", "Elasticity test", "Recalibrated", "Lubricated", "Waxed base"]
+SEVERITY_P = [0.55, 0.28, 0.13, 0.04]           # Low, Medium, High, Critical
+STATUS_P = [0.85, 0.10, 0.05]                   # Working, Under Maintenance, Broken
+
+EPOCH = datetime.datetime(2020, 1, 1)
+
+
+def sizes(scale):
+    out = {t: max(floor, int(scale * r)) for t, (r, floor) in RATIOS.items()}
+    out["Registers"] = scale
+    return out
+
+
+def zipf_weights(n, s=1.1, rng=None):
+    """Zipf popularity over ``n`` items, randomly permuted so ID order isn't rank order."""
+    w = 1.0 / np.arange(1, n + 1) ** s
+    if rng is not None:
+        rng.shuffle(w)
+    return w / w.sum()
+
+
+def schedule(rng, start_h, dur_h, inst_ids, inst_w, eq_ids, eq_w, tries=8):
+    """
+    Book an instructor and 1-4 items of equipment for each activity without
+    overlaps. Resources are still drawn Zipf-skewed; a busy one is redrawn up
+    to ``tries`` times, after which the activity moves to when the least busy
+    candidate is free. A resource's next booking always starts after its
+    previous one ends. Returns ``([(start_h, end_h)], [instructor], [[equipment]])``.
+    """
+    inst_free, eq_free = {}, {}         # resource -> hour its last booking ends
+    windows, instructors, links = [], [], []
+    for start, dur in zip(start_h.tolist(), dur_h.tolist()):
+        cands = rng.choice(inst_ids, tries, p=inst_w).tolist()
+        inst = next((i for i in cands if inst_free.get(i, 0) <= start), None)
+        if inst is None:
+            inst = min(cands, key=inst_free.get)
+            start = inst_free[inst]
+        want = int(rng.integers(1, 5))
+        cands = rng.choice(eq_ids, want * tries, p=eq_w).tolist()
+        items = [e for e in dict.fromkeys(cands) if eq_free.get(e, 0) <= start][:want]
+        if not items:
+            e = min(cands, key=eq_free.get)
+            items, start = [e], max(start, eq_free[e])
+        end = start + dur
+        inst_free[inst] = end
+        for e in items:
+            eq_free[e] = end
+        windows.append((start, end))
+        instructors.append(inst)
+        links.append(items)
+    return windows, instructors, links
+
+
+def next_ids(cur):
+    ids = {}
+    for table, key in (("Participant", "ParticipantID"), ("Instructor", "InstructorID"),
+                       ("Activity", "ActivityID"), ("Equipment", "EquipmentID"),
+                       ("MaintenanceLog", "MaintenanceID")):
+        cur.execute(f"SELECT IFNULL(MAX({key}), 0) + 1 FROM {table}")
+        ids[table] = int(cur.fetchone()[0])
+    return ids
+
+
+def _insert(conn, cur, sql, rows, batch):
+    for i in range(0, len(rows), batch):
+        cur.executemany(sql, rows[i:i + batch])
+        conn.commit()
+
+
+def contact(rng, n):
+    return [f"9{v:09d}" for v in rng.integers(0, 10 ** 9, n)]
+
+
+def names(rng, n):
+    return [f"{FIRST[a]} {LAST[b]}" for a, b in zip(rng.integers(0, len(FIRST), n), rng.integers(0, len(LAST), n))]
+
+
+def generate(conn, scale, seed=42, batch=2000, chunk=50000, fast=False, log=print):
+    """Append a dataset of roughly ``scale`` registrations. Returns row counts per table."""
+    rng = np.random.default_rng(seed)
+    n = sizes(scale)
+    cur = conn.cursor()
+    if fast:
+        # Data is consistent by construction; skip per-row FK / unique lookups
+        cur.execute("SET SESSION foreign_key_checks = 0")
+        cur.execute("SET SESSION unique_checks = 0")
+    base = next_ids(cur)
+    counts = dict.fromkeys(["Participant", "Instructor", "Activity", "Equipment", "ActivityEquipment",
+                            "MaintenanceLog", "Registers", "Rating", "Injury"], 0)
+    t0 = time.perf_counter()
+
+    # ---- Instructors
+    ni = n["Instructor"]
+    inst_ids = np.arange(base["Instructor"], base["Instructor"] + ni)
+    rows = [
+        (int(i), nm, c, int(y), f"{ACTIVITY_TYPES[a]}, CPR")
+        for i, nm, c, y, a in zip(inst_ids, names(rng, ni), contact(rng, ni),
+                                  rng.integers(1, 25, ni), rng.integers(0, len(ACTIVITY_TYPES), ni))
+    ]
+    _insert(conn, cur, "INSERT INTO Instructor (InstructorID, Name, ContactNumber, ExperienceYears, Expertise) "
+                       "VALUES (%s, %s, %s, %s, %s)", rows, batch)
+    counts["Instructor"] = ni
+    inst_w = zipf_weights(ni, 0.8, rng)
+
+    # ---- Equipment (~20% depend on an earlier item -> acyclic)
+    ne = n["Equipment"]
+    eq_ids = np.arange(base["Equipment"], base["Equipment"] + ne)
+    depends = [
+        int(rng.integers(base["Equipment"], e)) if e > base["Equipment"] and rng.random() < 0.2 else None
+        for e in eq_ids
+    ]
+    status = rng.choice(["Working", "Under Maintenance", "Broken"], ne, p=STATUS_P)
+    rows = [
+        (int(e), f"{EQUIPMENT_TYPES[int(e) % len(EQUIPMENT_TYPES)]} - {int(e)}", str(s),
+         datetime.date(2026, 1, 1) + datetime.timedelta(days=int(rng.integers(0, 1500))), d)
+        for e, s, d in zip(eq_ids, status, depends)
+    ]
+    _insert(conn, cur, "INSERT INTO Equipment (EquipmentID, EquipmentType, Status, WarrantyExpiry, "
+                       "DependsOnEquipmentID) VALUES (%s, %s, %s, %s, %s)", rows, batch)
+    counts["Equipment"] = ne
+    eq_w = zipf_weights(ne, 1.0, rng)
+
+    # ---- Activities (start times spread over ~3 years, 1-6 hours long) with
+    # their instructor and 1-4 items of equipment, none double-booked
+    na = n["Activity"]
+    act_ids = np.arange(base["Activity"], base["Activity"] + na)
+    windows, act_inst, links = schedule(
+        rng, np.sort(rng.integers(0, 3 * 365 * 24, na)), rng.integers(1, 7, na), inst_ids, inst_w, eq_ids, eq_w,
+    )
+    act_types = rng.integers(0, len(ACTIVITY_TYPES), na)
+    rows = [
+        (int(a), f"{ACTIVITY_TYPES[t]} Session {int(a)}", ACTIVITY_TYPES[t],
+         EPOCH + datetime.timedelta(hours=s), EPOCH + datetime.timedelta(hours=e), float(rng.integers(2, 40) * 50), i)
+        for a, t, (s, e), i in zip(act_ids, act_types, windows, act_inst)
+    ]
+    _insert(conn, cur, "INSERT INTO Activity (ActivityID, ActivityName, ActivityType, StartDate, EndDate, Fees, "
+                       "InstructorID) VALUES (%s, %s, %s, %s, %s, %s, %s)", rows, batch)
+    counts["Activity"] = na
+    act_w = zipf_weights(na, 1.1, rng)
+    act_start_date = np.array([(EPOCH + datetime.timedelta(hours=s)).date() for s, _ in windows])
+    act_instructor = dict(zip(act_ids.tolist(), act_inst))
+
+    # ---- ActivityEquipment
+    rows = [(int(a), e) for a, items in zip(act_ids, links) for e in sorted(items)]
+    _insert(conn, cur, "INSERT INTO ActivityEquipment (ActivityID, EquipmentID) VALUES (%s, %s)", rows, batch)
+    counts["ActivityEquipment"] = len(rows)
+
+    # ---- MaintenanceLog (skewed towards popular equipment)
+    nm = n["MaintenanceLog"]
+    for lo in range(0, nm, chunk):
+        k = min(chunk, nm - lo)
+        ids = np.arange(base["MaintenanceLog"] + lo, base["MaintenanceLog"] + lo + k)
+        eqs = rng.choice(eq_ids, k, p=eq_w)
+        days = rng.integers(0, 3 * 365, k)
+        rows = [
+            (int(m), int(e), EPOCH.date() + datetime.timedelta(days=int(d)),
+             MAINT_WORK[int(m) % len(MAINT_WORK)], f"Tech {int(m) % 97}", float(rng.integers(5, 200) * 5))
+            for m, e, d in zip(ids, eqs, days)
+        ]
+        _insert(conn, cur, "INSERT INTO MaintenanceLog (MaintenanceID, EquipmentID, MaintDate, Description, "
+                           "Technician, Cost) VALUES (%s, %s, %s, %s, %s, %s)", rows, batch)
+        counts["MaintenanceLog"] += k
+        log(f"  MaintenanceLog {counts['MaintenanceLog']:,}/{nm:,}")
+
+    # trg_update_equipment_status marked every serviced item 'Under Maintenance';
+    # restore the intended status mix
+    _insert(conn, cur, "UPDATE Equipment SET Status = %s WHERE EquipmentID = %s",
+            [(str(s), int(e)) for e, s in zip(eq_ids, status)], batch)
+
+    # ---- Participants + their Registers / Rating / Injury, chunk by chunk
+    np_ = n["Participant"]
+    regs_per = scale / np_
+    for lo in range(0, np_, chunk):
+        k = min(chunk, np_ - lo)
+        pids = np.arange(base["Participant"] + lo, base["Participant"] + lo + k)
+        dob = rng.integers(365 * 15, 365 * 60, k)
+        rows = [
+            (int(p), nm, datetime.date(2025, 1, 1) - datetime.timedelta(days=int(d)), c, en, ec)
+            for p, nm, d, c, en, ec in zip(pids, names(rng, k), dob, contact(rng, k), names(rng, k), contact(rng, k))
+        ]
+        _insert(conn, cur, "INSERT INTO Participant (ParticipantID, Name, DOB, ContactNumber, "
+                           "EmergencyContactName, EmergencyContactNumber) VALUES (%s, %s, %s, %s, %s, %s)",
+                rows, batch)
+        counts["Participant"] += k
+
+        # Registrations: geometric count per participant (mean ~regs_per), Zipf activities
+        per = rng.geometric(1 / regs_per, k)
+        reg_p = np.repeat(pids, per)
+        reg_a = rng.choice(act_ids, len(reg_p), p=act_w)
+        pairs = np.unique(np.stack([reg_p, reg_a], axis=1), axis=0)
+        paid = rng.random(len(pairs)) < 0.8
+        rows = [
+            (int(p), int(a), act_start_date[int(a) - base["Activity"]] - datetime.timedelta(days=int(d)),
+             "Yes" if y else "No")
+            for (p, a), d, y in zip(pairs, rng.integers(1, 60, len(pairs)), paid)
+        ]
+        _insert(conn, cur, "INSERT INTO Registers (ParticipantID, ActivityID, RegistrationDate, PaymentStatus) "
+                           "VALUES (%s, %s, %s, %s)", rows, batch)
+        counts["Registers"] += len(rows)
+
+        # Ratings: ~1 in 3 registrations rate that activity's instructor (1-5, skewed high)
+        rated = pairs[rng.random(len(pairs)) < 0.33]
+        seen, rows = set(), []
+        for (p, a), v in zip(rated, rng.choice([1, 2, 3, 4, 5], len(rated), p=[0.03, 0.07, 0.2, 0.35, 0.35])):
+            key = (int(p), act_instructor[int(a)])
+            if key not in seen:
+                seen.add(key)
+                rows.append(key + (int(v), "Generated rating"))
+        _insert(conn, cur, "INSERT INTO Rating (ParticipantID, InstructorID, RatingValue, Comments) "
+                           "VALUES (%s, %s, %s, %s)", rows, batch)
+        counts["Rating"] += len(rows)
+
+        # Injuries: ~5% of registrations, heavier for a few accident-prone participants
+        prone = zipf_weights(len(pairs), 0.5, rng) * len(pairs) * 0.05
+        hurt = pairs[rng.random(len(pairs)) < np.minimum(prone, 1)]
+        seen, rows = set(), []
+        for (p, a), name, sev, lag, tr in zip(
+                hurt, rng.integers(0, len(INJURIES), len(hurt)),
+                rng.choice(["Low", "Medium", "High", "Critical"], len(hurt), p=SEVERITY_P),
+                rng.integers(0, 3, len(hurt)), rng.integers(0, len(TREATMENTS), len(hurt))):
+            key = (int(p), INJURIES[name])
+            if key not in seen:
+                seen.add(key)
+                rows.append((int(p), int(a), INJURIES[name],
+                             act_start_date[int(a) - base["Activity"]] + datetime.timedelta(days=int(lag)),
+                             str(sev), TREATMENTS[tr]))
+        _insert(conn, cur, "INSERT INTO Injury (ParticipantID, ActivityID, InjuryName, InjuryDate, Severity, "
+                           "Treatment) VALUES (%s, %s, %s, %s, %s, %s)", rows, batch)
+        counts["Injury"] += len(rows)
+        log(f"  Participants {counts['Participant']:,}/{np_:,}  Registers {counts['Registers']:,}")
+
+    if fast:
+        cur.execute("SET SESSION foreign_key_checks = 1")
+        cur.execute("SET SESSION unique_checks = 1")
+    cur.execute("ANALYZE TABLE Participant, Instructor, Activity, Equipment, ActivityEquipment, "
+                "MaintenanceLog, Registers, Injury, Rating")
+    cur.fetchall()
+    cur.close()
+    log(f"Generated {sum(counts.values()):,} rows in {time.perf_counter() - t0:.1f}s")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic ADVENTURE dataset.")
+    parser.add_argument("--scale", type=int, default=10000, help="number of Registers rows (1e3 - 1e7)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch", type=int, default=2000, help="rows per INSERT transaction")
+    parser.add_argument("--fast", action="store_true", help="disable FK/unique checks while loading")
+    args = parser.parse_args()
+
+    conn = connect()
+    try:
+        counts = generate(conn, args.scale, args.seed, args.batch, fast=args.fast)
+    finally:
+        conn.close()
+    for table, count in counts.items():
+        print(f"{table:<20} {count:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark for ``adventureguard.equipment_graph`` on a synthetic fleet.
+
+Builds a random dependency forest of ``--items`` equipment (each item depends
+on an earlier one with probability ``--linked``) and ``--activities``
+activities that each use a few items, then times the impact queries the
+Dashboard and the Add Data page run. No database is needed.
+
+    python -m benchmarks.equipment_graph
+    python -m benchmarks.equipment_graph --items 1000000 --repeat 50
+"""
+
+import argparse
+import random
+import time
+
+from adventureguard.equipment_graph import build
+from benchmarks._common import print_table, summarize, time_call
+
+
+def synthetic(items, activities, linked, down, seed):
+    rng = random.Random(seed)
+    equipment = [
+        (i, rng.randint(1, i - 1) if i > 1 and rng.random() < linked else None,
+         "Broken" if rng.random() < down else "Working")
+        for i in range(1, items + 1)
+    ]
+    uses = {(a, rng.randint(1, items)) for a in range(1, activities + 1) for _ in range(3)}
+    return equipment, uses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time equipment dependency-graph queries.")
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--activities", type=int, default=20_000)
+    parser.add_argument("--linked", type=float, default=0.8, help="share of items that depend on another")
+    parser.add_argument("--down", type=float, default=0.01, help="share of items not Working")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    equipment, uses = synthetic(args.items, args.activities, args.linked, args.down, args.seed)
+    start = time.perf_counter()
+    graph = build(equipment, uses)
+    print(f"Built graph of {args.items:,} items / {len(uses):,} activity links "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    # Roots have the largest subtrees, leaves the smallest
+    rng = random.Random(args.seed)
+    roots = [e for e, parent, _ in equipment if parent is None]
+    picks = {"root": rng.choice(roots), "random": rng.randint(1, args.items)}
+
+    rows = []
+    for label, eq in picks.items():
+        cases = {
+            f"impacted({label})": lambda eq=eq: graph.impacted(eq),
+            f"blocked_activities({label})": lambda eq=eq: graph.blocked_activities(eq),
+            f"would_cycle({label})": lambda eq=eq: graph.would_cycle(eq, rng.randint(1, args.items)),
+        }
+        for name, fn in cases.items():
+            s = summarize(time_call(fn, args.repeat))
+            rows.append([name, f"{s['mean']:.3f}", f"{s['p50']:.3f}", f"{s['p95']:.3f}"])
+
+    def blocked_now():
+        graph._unusable = None      # time the full recomputation, not the memo
+        return graph.blocked_now()
+
+    s = summarize(time_call(blocked_now, args.repeat))
+    rows.append(["blocked_now()", f"{s['mean']:.3f}", f"{s['p50']:.3f}", f"{s['p95']:.3f}"])
+
+    print_table(["query", "mean ms", "p50 ms", "p95 ms"], rows)
+    print(f"\n{len(graph.impacted(picks['root'])):,} items depend on root #{picks['root']}; "
+          f"{len(graph.blocked_now()):,} activities blocked now")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Before/after benchmark for migration V001 (hot-path secondary indexes).
+
+"Before" runs each hot query with ``IGNORE INDEX`` on the V001 indexes, so
+the optimizer sees the original schema (PKs + implicit FK indexes); "after"
+lets it use them. For each query it prints latency and the EXPLAIN access
+path (key, rows, filesort/covering).
+
+    python -m adventureguard.migrations               # apply V001 first
+    python -m benchmarks.index_pack --seed 1000000    # optional: grow the data
+    python -m benchmarks.index_pack --repeat 50
+"""
+
+import argparse
+
+import config
+from benchmarks._common import connect, print_table, summarize, time_call
+
+V001_INDEXES = {
+    "Injury": ["idx_injury_date_recent", "idx_injury_severity"],
+    "MaintenanceLog": ["idx_maint_date_recent", "idx_maint_equipment_cost"],
+    "Equipment": ["idx_equipment_status"],
+    "Registers": ["idx_registers_activity_paid"],
+    "Rating": ["idx_rating_instructor_value"],
+}
+
+# {Table} marks where the IGNORE INDEX hint for that table goes
+HOT_QUERIES = {
+    "dashboard: latest injuries": (
+        "SELECT ParticipantID, ActivityID, InjuryName, Severity, InjuryDate "
+        "FROM Injury {Injury} ORDER BY InjuryDate DESC LIMIT 5", None),
+    "dashboard: recent maintenance": (
+        "SELECT EquipmentID, MaintDate, Technician, Cost "
+        "FROM MaintenanceLog {MaintenanceLog} ORDER BY MaintDate DESC LIMIT 5", None),
+    "dashboard: injuries by severity": (
+        "SELECT Severity, COUNT(*) FROM Injury {Injury} GROUP BY Severity", None),
+    "dashboard: equipment by status": (
+        "SELECT Status, COUNT(*) FROM Equipment {Equipment} GROUP BY Status", None),
+    "fn_total_participants_in_activity": (
+        "SELECT COUNT(*) FROM Registers {Registers} "
+        "WHERE ActivityID = %s AND PaymentStatus = 'Yes'", "activity"),
+    "fn_average_instructor_rating": (
+        "SELECT ROUND(AVG(RatingValue), 2) FROM Rating {Rating} WHERE InstructorID = %s", "instructor"),
+    "fn_total_maintenance_cost": (
+        "SELECT IFNULL(SUM(Cost), 0) FROM MaintenanceLog {MaintenanceLog} WHERE EquipmentID = %s", "equipment"),
+    "complex query 1": (
+        "SELECT a.ActivityName, COUNT(r.ParticipantID) AS PaidCount "
+        "FROM Activity a JOIN Registers r {Registers} ON a.ActivityID = r.ActivityID "
+        "WHERE r.PaymentStatus = 'Yes' GROUP BY a.ActivityName "
+        "HAVING COUNT(r.ParticipantID) > 2 ORDER BY PaidCount DESC", None),
+    "complex query 4": (
+        "SELECT i.Name, ROUND(AVG(r.RatingValue), 2) AS AvgRating "
+        "FROM Instructor i JOIN Rating r {Rating} ON i.InstructorID = r.InstructorID "
+        "GROUP BY i.Name HAVING AvgRating >= 4 ORDER BY AvgRating DESC", None),
+}
+
+# A representative key for the point-lookup queries: the busiest parent
+SAMPLE_KEY_SQL = {
+    "activity": "SELECT ActivityID FROM Registers GROUP BY ActivityID ORDER BY COUNT(*) DESC LIMIT 1",
+    "instructor": "SELECT InstructorID FROM Rating GROUP BY InstructorID ORDER BY COUNT(*) DESC LIMIT 1",
+    "equipment": "SELECT EquipmentID FROM MaintenanceLog GROUP BY EquipmentID ORDER BY COUNT(*) DESC LIMIT 1",
+}
+
+
+def existing_indexes(cur):
+    cur.execute(
+        "SELECT DISTINCT TABLE_NAME, INDEX_NAME FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = %s", (config.DB_NAME,))
+    return {(t.lower(), i) for t, i in cur.fetchall()}
+
+
+def render(template, ignore, present):
+    hints = {}
+    for table, names in V001_INDEXES.items():
+        names = [n for n in names if (table.lower(), n) in present]
+        hints[table] = f"IGNORE INDEX ({', '.join(names)})" if ignore and names else ""
+    return template.format(**hints)
+
+
+def explain(cur, sql, params):
+    cur.execute("EXPLAIN " + sql, params)
+    cols = [d[0] for d in cur.description]
+    plan = [dict(zip(cols, row)) for row in cur.fetchall()]
+    return "; ".join(
+        f"{p['table']}:{p['key'] or 'ALL'} rows={p['rows']}"
+        + (" filesort" if "filesort" in (p.get("Extra") or "") else "")
+        + (" covering" if "Using index" in (p.get("Extra") or "") else "")
+        for p in plan
+    )
+
+
+def seed(conn, rows):
+    """
+    Bulk-grow the event tables server-side to roughly ``rows`` rows each
+    (with proportionally sized parent tables) using recursive CTEs. Injury
+    dates are derived from the activity start so trg_injury_severity_check
+    accepts them.
+    """
+    parents = max(10, rows // 100)
+    cur = conn.cursor()
+    for var in ("cte_max_recursion_depth", "max_recursive_iterations"):
+        try:
+            cur.execute(f"SET SESSION {var} = %s", (rows + 1,))
+        except Exception:
+            pass
+
+    def seq(n):
+        return (f"(WITH RECURSIVE seq (n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < {int(n)}) "
+                "SELECT n FROM seq) s")
+
+    def pick(table, key, alias):
+        return (f"JOIN (SELECT {key}, ROW_NUMBER() OVER (ORDER BY {key}) - 1 AS rn, COUNT(*) OVER () AS cnt "
+                f"FROM {table}) {alias}")
+
+    steps = [
+        f"INSERT INTO Instructor (Name, ContactNumber, ExperienceYears, Expertise) "
+        f"SELECT CONCAT('Bench Instructor ', n), LPAD(n, 10, '0'), n % 30, 'Benchmark' FROM {seq(parents)}",
+        f"INSERT INTO Participant (Name, DOB, ContactNumber, EmergencyContactName, EmergencyContactNumber) "
+        f"SELECT CONCAT('Bench Participant ', n), DATE('1990-01-01') + INTERVAL n % 9000 DAY, "
+        f"LPAD(n, 10, '0'), CONCAT('Bench Contact ', n), LPAD(n, 10, '1') FROM {seq(rows // 10)}",
+        f"INSERT INTO Activity (ActivityName, ActivityType, StartDate, EndDate, Fees, InstructorID) "
+        f"SELECT CONCAT('Bench Activity ', n), 'Benchmark', TIMESTAMP('2020-01-01') + INTERVAL n HOUR, "
+        f"TIMESTAMP('2020-01-01') + INTERVAL n + 2 HOUR, 500, i.InstructorID "
+        f"FROM {seq(parents)} {pick('Instructor', 'InstructorID', 'i')} ON i.rn = s.n % i.cnt",
+        f"INSERT INTO Equipment (EquipmentType, Status, WarrantyExpiry) "
+        f"SELECT CONCAT('Bench Equipment ', n), ELT(1 + n % 10 DIV 8 + n % 10 DIV 9, 'Working', "
+        f"'Under Maintenance', 'Broken'), DATE('2030-01-01') FROM {seq(parents)}",
+        f"INSERT IGNORE INTO Registers (ParticipantID, ActivityID, RegistrationDate, PaymentStatus) "
+        f"SELECT p.ParticipantID, a.ActivityID, DATE('2024-01-01') + INTERVAL s.n % 365 DAY, "
+        f"IF(s.n % 4 = 0, 'No', 'Yes') FROM {seq(rows)} "
+        f"{pick('Participant', 'ParticipantID', 'p')} ON p.rn = s.n % p.cnt "
+        f"{pick('Activity', 'ActivityID', 'a')} ON a.rn = (s.n * 7919) % a.cnt",
+        f"INSERT IGNORE INTO Rating (ParticipantID, InstructorID, RatingValue, Comments) "
+        f"SELECT p.ParticipantID, i.InstructorID, 1 + s.n % 5, 'Benchmark' FROM {seq(rows)} "
+        f"{pick('Participant', 'ParticipantID', 'p')} ON p.rn = s.n % p.cnt "
+        f"{pick('Instructor', 'InstructorID', 'i')} ON i.rn = (s.n * 31) % i.cnt",
+        f"INSERT INTO MaintenanceLog (EquipmentID, MaintDate, Description, Technician, Cost) "
+        f"SELECT e.EquipmentID, DATE('2015-01-01') + INTERVAL s.n % 3650 DAY, 'Benchmark service', "
+        f"CONCAT('Tech ', s.n % 50), 50 + s.n % 950 FROM {seq(rows)} "
+        f"{pick('Equipment', 'EquipmentID', 'e')} ON e.rn = s.n % e.cnt",
+        f"INSERT IGNORE INTO Injury (ParticipantID, ActivityID, InjuryName, InjuryDate, Severity, Treatment) "
+        f"SELECT p.ParticipantID, a.ActivityID, CONCAT('Bench Injury ', s.n), "
+        f"DATE(a.StartDate) + INTERVAL s.n % 1500 DAY, ELT(1 + s.n % 4, 'Low', 'Medium', 'High', 'Critical'), "
+        f"'First aid' FROM {seq(rows)} "
+        f"{pick('Participant', 'ParticipantID', 'p')} ON p.rn = s.n % p.cnt "
+        f"JOIN (SELECT ActivityID, StartDate, ROW_NUMBER() OVER (ORDER BY ActivityID) - 1 AS rn, "
+        f"COUNT(*) OVER () AS cnt FROM Activity) a ON a.rn = (s.n * 13) % a.cnt",
+    ]
+    for sql in steps:
+        print(sql.split(" (", 1)[0] + " ...")
+        cur.execute(sql)
+        conn.commit()
+    cur.execute("ANALYZE TABLE Participant, Instructor, Activity, Equipment, "
+                "MaintenanceLog, Registers, Injury, Rating")
+    cur.fetchall()
+    cur.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the V001 hot-path indexes.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0,
+                        help="first add roughly this many rows to each event table")
+    args = parser.parse_args()
+
+    conn = connect()
+    if args.seed:
+        seed(conn, args.seed)
+
+    cur = conn.cursor()
+    present = existing_indexes(cur)
+    if not any((t.lower(), n) in present for t, names in V001_INDEXES.items() for n in names):
+        print("V001 indexes not found - run `python -m adventureguard.migrations` first.")
+        return
+
+    keys = {}
+    for name, sql in SAMPLE_KEY_SQL.items():
+        cur.execute(sql)
+        row = cur.fetchone()
+        keys[name] = row[0] if row else 0
+
+    rows = []
+    for label, (template, key) in HOT_QUERIES.items():
+        params = (keys[key],) if key else None
+        result = []
+        for ignore in (True, False):
+            sql = render(template, ignore, present)
+
+            def run():
+                cur.execute(sql, params)
+                cur.fetchall()
+
+            run()  # warm-up
+            stats = summarize(time_call(run, args.repeat))
+            result.append((stats["p50"], explain(cur, sql, params)))
+        (before, plan_before), (after, plan_after) = result
+        speedup = before / after if after else float("inf")
+        rows.append((label, f"{before:.2f}", f"{after:.2f}", f"{speedup:.1f}x", plan_before, plan_after))
+    cur.close()
+    conn.close()
+
+    print_table(("query", "before p50 ms", "after p50 ms", "speedup", "plan before", "plan after"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Analytics mirror vs MySQL: the Dashboard chart aggregations and the five
+Complex Queries, run on the live schema and in-process on DuckDB over the
+Parquet mirror. Reports p50/p95 for both paths, the speed-up, and whether
+both returned the same number of rows.
+
+    python -m adventureguard.mirror --full            # build the mirror first
+    python -m benchmarks.mirror_vs_mysql --repeat 20
+    python -m benchmarks.mirror_vs_mysql --sync       # incremental sync, then benchmark
+"""
+
+import argparse
+
+from adventureguard import mirror, queries
+from benchmarks._common import connect, print_table, summarize, time_call
+
+
+def statements():
+    stmts = [
+        ("snapshot tiles", queries.SNAPSHOT),
+        ("severity counts", queries.SEVERITY_COUNTS),
+        ("equipment status", queries.EQUIPMENT_STATUS_COUNTS),
+        ("participants/activity", queries.PARTICIPANTS_PER_ACTIVITY),
+    ]
+    stmts += [(f"query {n} ({r.key})", r.sql) for n, r in enumerate(queries.REPORTS, start=1)]
+    return stmts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare MySQL with the DuckDB/Parquet analytics mirror.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sync", action="store_true", help="sync the mirror before timing")
+    args = parser.parse_args()
+
+    conn = connect()
+    if args.sync:
+        state = mirror.sync(conn, log=lambda *_: None)
+        print(f"Mirror synced ({sum(state['rows'].values()):,} rows).")
+    if not mirror.available():
+        raise SystemExit("No mirror found: run `python -m adventureguard.mirror --full` first.")
+    print(f"Mirror {mirror.freshness()}.")
+
+    duck = mirror.open_engine()
+    cur = conn.cursor()
+    rows = []
+    for label, sql in statements():
+        def on_mysql():
+            cur.execute(sql)
+            return cur.fetchall()
+
+        def on_duckdb():
+            return duck.execute(sql).fetchall()
+
+        mysql_rows, duck_rows = len(on_mysql()), len(on_duckdb())  # warm-up + row check
+        m = summarize(time_call(on_mysql, args.repeat))
+        d = summarize(time_call(on_duckdb, args.repeat))
+        rows.append((
+            label,
+            f"{m['p50']:.2f}", f"{m['p95']:.2f}",
+            f"{d['p50']:.2f}", f"{d['p95']:.2f}",
+            f"{m['p50'] / d['p50']:.1f}x" if d["p50"] else "-",
+            "yes" if mysql_rows == duck_rows else f"no ({mysql_rows} vs {duck_rows})",
+        ))
+    cur.close()
+    conn.close()
+    duck.close()
+
+    print_table(("statement", "mysql p50", "mysql p95", "duckdb p50", "duckdb p95", "speed-up", "same rows"), rows)
+
+
+if __name__ == "__main__":
+    main()
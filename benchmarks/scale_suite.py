@@ -0,0 +1,133 @@
+"""
+Scale benchmark: every statement the pages issue, at growing data sizes.
+
+For each ``--scales`` value the dataset is topped up with benchmarks.datagen
+until Registers holds that many rows, then every page statement (Home and
+Dashboard tiles/charts/lists, the five Complex Queries, the View Tables first
+page per table, the Add Data pickers and the Backend page metadata queries)
+is run ``--repeat`` times. Reports p50/p95/p99 latency and rows scanned
+(sum of the session ``Handler_read_*`` counters for one execution).
+
+    python -m benchmarks.scale_suite --scales 1000 10000 100000 1000000
+    python -m benchmarks.scale_suite --no-generate          # current data only
+"""
+
+import argparse
+import datetime
+
+import config
+from adventureguard import pickers, queries, schema_meta
+from benchmarks import datagen
+from benchmarks._common import connect, print_table, summarize, time_call
+
+BROWSE_TABLES = {
+    "Participant": "ParticipantID", "Instructor": "InstructorID", "Activity": "ActivityID",
+    "Equipment": "EquipmentID", "MaintenanceLog": "MaintenanceID",
+    "Registers": "ParticipantID, ActivityID", "Injury": "ParticipantID, InjuryName",
+    "Rating": "ParticipantID, InstructorID", "ActivityEquipment": "ActivityID, EquipmentID",
+}
+
+
+def page_statements():
+    """``[(page, label, sql, params), ...]`` covering every page's queries."""
+    recent_since = datetime.date.today() - datetime.timedelta(days=config.RECENT_EVENTS_DAYS)
+    stmts = [
+        ("Home", "snapshot tiles", queries.SNAPSHOT, None),
+        ("Dashboard", "snapshot tiles", queries.SNAPSHOT, None),
+        ("Dashboard", "severity counts", queries.SEVERITY_COUNTS, None),
+        ("Dashboard", "equipment status", queries.EQUIPMENT_STATUS_COUNTS, None),
+        ("Dashboard", "participants/activity", queries.PARTICIPANTS_PER_ACTIVITY, None),
+        ("Dashboard", "latest injuries", queries.LATEST_INJURIES, None),
+        ("Dashboard", "recent maintenance", queries.RECENT_MAINTENANCE, None),
+        ("Dashboard", "latest injuries (recent window)", queries.LATEST_INJURIES_SINCE, (recent_since,)),
+        ("Dashboard", "recent maintenance (recent window)", queries.RECENT_MAINTENANCE_SINCE, (recent_since,)),
+    ]
+    for n, report in enumerate(queries.REPORTS, start=1):
+        stmts.append(("Complex Queries", f"query {n} ({report.key})", report.sql, None))
+        if report.materialized_sql:
+            stmts.append(("Complex Queries", f"query {n} materialized", report.materialized_sql, None))
+    stmts.append(("View Tables", "SHOW TABLES", "SHOW TABLES", None))
+    for table, pk in BROWSE_TABLES.items():
+        stmts.append(("View Tables", f"first page {table}", f"SELECT * FROM {table} ORDER BY {pk} LIMIT 51", None))
+    for entity, (table, id_col, name_col) in pickers.ENTITIES.items():
+        stmts.append(("Add Data", f"{entity} picker index",
+                      f"SELECT {id_col}, {name_col} FROM {table} LIMIT %s",
+                      (config.PICKER_INDEX_MAX_ROWS + 1,)))
+        stmts.append(("Add Data", f"{entity} picker search",
+                      f"SELECT {id_col}, {name_col} FROM {table} WHERE {name_col} LIKE %s "
+                      f"ORDER BY {name_col} LIMIT %s", ("A%", config.PICKER_RESULT_LIMIT)))
+    schema = (config.DB_NAME,)
+    stmts.append(("Backend", "schema fingerprint", schema_meta.FINGERPRINT, schema * 3))
+    for label in ("KEY_COLUMNS", "ENUM_COLUMNS", "TRIGGERS", "ROUTINES", "PARAMETERS"):
+        stmts.append(("Backend", label.lower().replace("_", " "), getattr(schema_meta, label), schema))
+    return stmts
+
+
+def handler_reads(cur):
+    cur.execute("SHOW SESSION STATUS LIKE 'Handler_read%'")
+    return sum(int(v) for _, v in cur.fetchall())
+
+
+def rows_scanned(cur, sql, params):
+    # Calibrate: one SHOW STATUS reads a few handler rows by itself
+    start = handler_reads(cur)
+    overhead = handler_reads(cur) - start
+    before = handler_reads(cur)
+    cur.execute(sql, params)
+    cur.fetchall()
+    return max(0, handler_reads(cur) - before - overhead)
+
+
+def current_scale(cur):
+    cur.execute("SELECT COUNT(*) FROM Registers")
+    return cur.fetchone()[0]
+
+
+def run(conn, repeat):
+    cur = conn.cursor()
+    results = []
+    for page, label, sql, params in page_statements():
+        def once():
+            cur.execute(sql, params)
+            cur.fetchall()
+
+        once()  # warm-up
+        stats = summarize(time_call(once, repeat))
+        results.append((page, label, stats, rows_scanned(cur, sql, params)))
+    cur.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark all page queries at several data scales.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-generate", action="store_true", help="benchmark the current data as-is")
+    parser.add_argument("--fast", action="store_true", help="load with FK/unique checks disabled")
+    args = parser.parse_args()
+
+    conn = connect()
+    scales = [None] if args.no_generate else sorted(args.scales)
+    for scale in scales:
+        if scale is not None:
+            cur = conn.cursor()
+            have = current_scale(cur)
+            cur.close()
+            if have < scale:
+                print(f"Topping up Registers from {have:,} to ~{scale:,} rows ...")
+                datagen.generate(conn, scale - have, seed=scale, fast=args.fast, log=lambda *_: None)
+
+        cur = conn.cursor()
+        label = f"{current_scale(cur):,} registrations"
+        cur.close()
+        print(f"\n=== {label} ===")
+        rows = [
+            (page, name, f"{s['p50']:.2f}", f"{s['p95']:.2f}", f"{s['p99']:.2f}", f"{scanned:,}")
+            for page, name, s, scanned in run(conn, args.repeat)
+        ]
+        print_table(("page", "statement", "p50 ms", "p95 ms", "p99 ms", "rows scanned"), rows)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Per-rerun latency of the five summary tiles vs. number of round trips.
+
+Splits the five tile COUNTs into 1..5 statements (1 = the snapshot query in
+adventureguard/queries.py, 5 = the old one-query-per-tile layout) and times
+a full "rerun" for each split. ``--latency-ms`` adds a simulated network
+delay per round trip to model a remote database.
+
+    python -m benchmarks.snapshot_roundtrips --repeat 200 --latency-ms 2
+"""
+
+import argparse
+import time
+
+from benchmarks._common import connect, print_table, summarize, time_call
+
+TILES = [
+    ("participants", "Participant"),
+    ("activities", "Activity"),
+    ("instructors", "Instructor"),
+    ("equipment", "Equipment"),
+    ("injuries", "Injury"),
+]
+
+
+def split_statements(round_trips):
+    """Distribute the five tile COUNTs over ``round_trips`` statements."""
+    groups = [TILES[i::round_trips] for i in range(round_trips)]
+    return [
+        "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {table}) AS {alias}" for alias, table in group)
+        for group in groups
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="simulated extra network latency per round trip")
+    args = parser.parse_args()
+
+    conn = connect()
+    cur = conn.cursor()
+    rows = []
+    for round_trips in range(1, len(TILES) + 1):
+        statements = split_statements(round_trips)
+
+        def rerun():
+            for sql in statements:
+                if args.latency_ms:
+                    time.sleep(args.latency_ms / 1000)
+                cur.execute(sql)
+                cur.fetchall()
+
+        rerun()  # warm-up
+        stats = summarize(time_call(rerun, args.repeat))
+        rows.append((round_trips, f"{stats['mean']:.2f}", f"{stats['p50']:.2f}", f"{stats['p95']:.2f}"))
+    cur.close()
+    conn.close()
+
+    print_table(("round trips", "mean ms", "p50 ms", "p95 ms"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Cold-start import cost of every Streamlit page, with a regression budget.
+
+Each page is probed in a fresh interpreter that first imports what a
+``streamlit run`` server already has loaded, then runs only the page's
+import block (its ``import`` statements and ``lazy_import`` bindings). That
+is the time the first run of a page pays in a new worker before it renders
+anything. The probe also reports which heavy modules (``lazy.HEAVY_MODULES``)
+the imports pulled in.
+
+Exits with status 1 when a page's median exceeds its budget in
+``BUDGET_MS`` (times ``--slack``), so it can gate CI:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 10 --slack 1.5
+"""
+
+import argparse
+import ast
+import glob
+import json
+import os
+import subprocess
+import sys
+
+from adventureguard.lazy import HEAVY_MODULES
+from benchmarks._common import print_table, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Median import-block time per page (ms). Pages not listed get DEFAULT_BUDGET_MS.
+# Pandas alone costs ~500 ms: a page over budget has usually started
+# importing a heavy module eagerly again.
+DEFAULT_BUDGET_MS = 150
+BUDGET_MS = {
+    "Home.py": 100,
+    "6_Project_Overview.py": 50,
+}
+
+PROBE = """
+import ast, json, sys, time
+import streamlit.runtime.scriptrunner       # loaded by the server before any page runs
+from streamlit.web import bootstrap
+
+path, heavy = sys.argv[1], sys.argv[2].split(",")
+before = set(sys.modules)
+tree = ast.parse(open(path, encoding="utf-8").read(), path)
+block = ast.Module([node for node in tree.body if {is_import}(node)], [])
+code = compile(block, path, "exec")
+start = time.perf_counter()
+exec(code, {{"__name__": "__page__"}})
+ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": ms, "loaded": [m for m in heavy if m in sys.modules and m not in before],
+                  "modules": len(set(sys.modules) - before)}}))
+"""
+
+IS_IMPORT = """(lambda node: isinstance(node, (ast.Import, ast.ImportFrom)) or (
+    isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)
+    and getattr(node.value.func, "id", None) == "lazy_import"))"""
+
+
+def pages():
+    return [os.path.join(ROOT, "Home.py")] + sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+def probe(path):
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(is_import=IS_IMPORT), path, ",".join(HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True,     # cwd: the page's imports resolve as under streamlit run
+    )
+    if out.returncode != 0:
+        raise RuntimeError(f"{os.path.basename(path)}: {out.stderr.strip().splitlines()[-1]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per page")
+    parser.add_argument("--slack", type=float, default=1.0, help="multiply every budget (slow CI machines)")
+    args = parser.parse_args()
+
+    rows, over = [], []
+    for path in pages():
+        name = os.path.basename(path)
+        runs = [probe(path) for _ in range(args.repeat)]
+        s = summarize([r["ms"] for r in runs])
+        budget = BUDGET_MS.get(name, DEFAULT_BUDGET_MS) * args.slack
+        ok = s["p50"] <= budget
+        if not ok:
+            over.append(name)
+        rows.append([name, f"{s['p50']:.0f}", f"{s['p95']:.0f}", f"{budget:.0f}", "ok" if ok else "OVER",
+                     runs[-1]["modules"], ", ".join(runs[-1]["loaded"]) or "-"])
+
+    print_table(["page", "p50 ms", "p95 ms", "budget ms", "", "modules", "heavy modules loaded"], rows)
+    if over:
+        print(f"\n{len(over)} page(s) over their import budget: {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,3 +3,75 @@ DB_USER = "DB_USER"
 DB_PASSWORD = "DB_PASSWORD"
 DB_NAME = "DB_NAME"  
 DB_PORT = DB_PORT
+
+# Database engine: "mysql" (the server above) or "sqlite" (embedded, no server needed)
+DB_ENGINE = "mysql"
+SQLITE_PATH = "adventure.db"    # relative to the app root; ":memory:" for a throwaway database
+SQLITE_SAMPLE_DATA = True       # fill a new SQLite database with Backend_DB/DB_SampleData
+
+# Connection pool (shared by every page through adventureguard.db)
+DB_POOL_NAME = "adventureguard"
+DB_POOL_SIZE = 5          # mysql.connector allows at most 32
+DB_POOL_TIMEOUT = 10      # seconds to wait for a free connection
+
+# Query-result cache (dashboard / home metrics)
+QUERY_CACHE_TTL = 60            # default seconds a cached result stays fresh
+QUERY_CACHE_MAX_ENTRIES = 256   # LRU bound on cached results
+
+# Query instrumentation (Performance page)
+QUERY_LOG_CAPACITY = 2000       # records kept in the in-memory ring buffer
+QUERY_LOG_PATH = None           # e.g. "query_log.jsonl" to also append to a file
+
+# Add Data entity pickers
+PICKER_INDEX_MAX_ROWS = 20000   # tables up to this size are searched in memory
+PICKER_INDEX_TTL = 300          # seconds before an in-memory index is rebuilt anyway
+PICKER_RESULT_LIMIT = 50        # candidates shown per search
+
+# Backend Implementation page metadata
+SCHEMA_FINGERPRINT_TTL = 10     # seconds between schema-change checks
+
+# Complex Queries "run all"
+REPORT_WORKERS = 4              # concurrent reports (keep below DB_POOL_SIZE)
+REPORT_TIMEOUT_MS = 30000       # MAX_EXECUTION_TIME hint per report
+
+# Dashboard chart figures
+FIGURE_CACHE_MAX_ENTRIES = 64
+FIGURE_CACHE_TTL = 3600         # figures are keyed by content; this only bounds memory
+CHART_MAX_CATEGORIES = 30       # bars shown before the rest fold into "Other"
+
+# Read replicas (reads only; writes always go to the primary above)
+# e.g. DB_REPLICAS = [{"host": "replica1.local"}, {"host": "replica2.local", "port": 3307}]
+# Missing keys (user, password, database, port) default to the primary's.
+DB_REPLICAS = []
+REPLICA_MAX_LAG = 5             # seconds behind the primary before a replica is skipped
+REPLICA_HEALTH_INTERVAL = 5     # seconds between replica health checks
+READ_YOUR_WRITES_WINDOW = 10    # seconds a session that wrote keeps reading the primary
+
+# Analytics mirror (python -m adventureguard.mirror)
+MIRROR_DIR = "analytics_mirror"  # Parquet files + sync state, relative to the app root
+
+# Global search (migration V009, adventureguard.search)
+SEARCH_LIMIT = 50               # hits returned per search
+SEARCH_MIN_TERM = 3             # shorter words are ignored (innodb_ft_min_token_size)
+
+# Streaming exports (adventureguard.export)
+EXPORT_DIR = "exports"          # server-side export files, relative to the app root
+EXPORT_CHUNK_ROWS = 10000       # rows fetched per round trip / per Parquet row group
+EXPORT_DOWNLOAD_MAX_MB = 100    # larger exports stay on disk instead of going through the browser
+
+# Month-partitioned Injury / MaintenanceLog (migration V005, python -m adventureguard.partitions)
+PARTITION_MONTHS_AHEAD = 3      # empty monthly partitions kept ahead of today
+RECENT_EVENTS_DAYS = 90         # Dashboard "latest" lists read only this window when it has 5+ rows
+
+# Equipment dependency graph (adventureguard.equipment_graph)
+EQUIPMENT_GRAPH_TTL = 300       # seconds before the in-memory graph is reloaded in full
+
+# Scheduling conflicts (adventureguard.schedule)
+SCHEDULE_INDEX_TTL = 300        # seconds before the in-memory booking timelines are reloaded in full
+
+# Write-behind queue for the Add Data forms (adventureguard.write_queue, migration V010)
+WRITE_BEHIND = False            # True: forms queue their INSERT and return at once
+WRITE_QUEUE_PATH = "write_queue.db"     # durable local journal, relative to the app root
+WRITE_BATCH_ROWS = 50           # group commit once this many writes are queued...
+WRITE_BATCH_MS = 200            # ...or the oldest has waited this long
+WRITE_QUEUE_KEEP_HOURS = 24     # settled journal entries kept for status lookups
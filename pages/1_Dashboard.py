@@ -1,46 +1,92 @@
+import datetime
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import mysql.connector
 import config
+from adventureguard import charts
+from adventureguard import db
+from adventureguard import equipment_graph
+from adventureguard import layout
+from adventureguard import mirror
+from adventureguard import pickers
+from adventureguard import queries
+from adventureguard.lazy import lazy_import
+from adventureguard.snapshot import EMPTY_SNAPSHOT, get_snapshot
+
+px = lazy_import("plotly.express")
 
 # =========================================================
 # PAGE SETTINGS
 # =========================================================
-st.set_page_config(page_title="Dashboard", page_icon="🏠", layout="wide")
+layout.setup("Dashboard", "🏠")
+
+# Seconds results may be served from the query cache (writes invalidate sooner)
+METRIC_TTL = 60
+RECENT_TTL = 15
+MAX_BLOCKED_ROWS = 50
 
 # =========================================================
-# DB CONNECTION FUNCTION (your version)
+# HELPER FUNCTION (safe snapshot getter)
 # =========================================================
-def get_db_connection():
+def load_snapshot():
     try:
-        conn = mysql.connector.connect(
-            host=config.DB_HOST,
-            user=config.DB_USER,
-            password=config.DB_PASSWORD,
-            database=config.DB_NAME,
-            port=config.DB_PORT
-        )
-        return conn
-    except mysql.connector.Error as err:
-        st.error(f"Database connection failed: {err}")
-        return None
+        return get_snapshot(ttl=METRIC_TTL)
+    except:
+        return EMPTY_SNAPSHOT
 
 
-# Open connection once
-conn = get_db_connection()
+def load_chart_data(sql):
+    """Chart input from the analytics mirror when selected, else MySQL (cached)."""
+    if use_mirror:
+        return mirror.query(sql)
+    return db.read_sql(sql, ttl=METRIC_TTL)
 
 
+def load_recent(since_sql, all_sql):
+    """Newest rows from the last RECENT_EVENTS_DAYS (a few partitions), else from all history."""
+    since = datetime.date.today() - datetime.timedelta(days=config.RECENT_EVENTS_DAYS)
+    df = db.read_sql(since_sql, (since,), ttl=RECENT_TTL)
+    if len(df) < 5:
+        df = db.read_sql(all_sql, ttl=RECENT_TTL)
+    return df
+
 
 # =========================================================
-# HELPER FUNCTION (safe value getter)
+# CHART BUILDERS (only called when the data changed)
 # =========================================================
-def get_value(query):
-    try:
-        df = pd.read_sql(query, conn)
-        return df.iloc[0, 0]
-    except:
-        return 0
+def severity_bar(df):
+    fig = px.bar(
+        df,
+        x="Severity",
+        y="Count",
+        color="Severity",
+        template="plotly_dark",
+        title="Injury Distribution by Severity",
+        text="Count"
+    )
+    fig.update_traces(textposition="outside")
+    return fig
+
+
+def equipment_pie(df):
+    return px.pie(
+        df,
+        names="Status",
+        values="Count",
+        title="Equipment Condition Overview",
+        template="plotly_dark"
+    )
+
+
+def activity_bar(df):
+    fig = px.bar(
+        df,
+        x="ActivityName",
+        y="ParticipantCount",
+        template="plotly_dark",
+        title="Participant Distribution Across Activities",
+        text="ParticipantCount"
+    )
+    fig.update_traces(textposition="outside")
+    return fig
 
 
 # =========================================================
@@ -56,36 +102,45 @@ st.markdown("---")
 # =========================================================
 col1, col2, col3, col4, col5 = st.columns(5)
 
-col1.metric("🧍 Participants", get_value("SELECT COUNT(*) FROM Participant"))
-col2.metric("🧗 Activities", get_value("SELECT COUNT(*) FROM Activity"))
-col3.metric("🧑‍🏫 Instructors", get_value("SELECT COUNT(*) FROM Instructor"))
-col4.metric("🩹 Injuries Logged", get_value("SELECT COUNT(*) FROM Injury"))
-col5.metric("🛠 Equipment Items", get_value("SELECT COUNT(*) FROM Equipment"))
+snap = load_snapshot()
+
+col1.metric("🧍 Participants", snap.participants)
+col2.metric("🧗 Activities", snap.activities)
+col3.metric("🧑‍🏫 Instructors", snap.instructors)
+col4.metric("🩹 Injuries Logged", snap.injuries)
+col5.metric("🛠 Equipment Items", snap.equipment)
 
 st.markdown("<hr>", unsafe_allow_html=True)
 
 
+# =========================================================
+# CHART DATA SOURCE
+# =========================================================
+col1, col2 = st.columns([3, 1])
+with col2:
+    if st.button("🔄 Sync analytics mirror"):
+        try:
+            with st.spinner("Syncing..."):
+                mirror.sync_now()
+        except Exception as e:
+            st.error(f"Mirror sync failed: {e}")
+with col1:
+    use_mirror = mirror.available() and st.toggle(
+        "🦆 Charts from analytics mirror (DuckDB)",
+        help="Run the chart aggregations in-process on the local Parquet mirror instead of MySQL."
+    )
+    st.caption(f"Analytics mirror {mirror.freshness()}.")
+
+
 # =========================================================
 # INJURY SEVERITY CHART
 # =========================================================
 st.subheader("📊 Injury Severity Overview")
 
-inj_df = pd.read_sql(
-    "SELECT Severity, COUNT(*) AS Count FROM Injury GROUP BY Severity",
-    conn
-)
+inj_df = load_chart_data(queries.SEVERITY_COUNTS)
 
 if not inj_df.empty:
-    fig = px.bar(
-        inj_df,
-        x="Severity",
-        y="Count",
-        color="Severity",
-        template="plotly_dark",
-        title="Injury Distribution by Severity",
-        text="Count"
-    )
-    fig.update_traces(textposition="outside")
+    fig = charts.cached_figure("severity", inj_df, severity_bar)
     st.plotly_chart(fig, use_container_width=True)
 else:
     st.info("No injuries recorded yet.")
@@ -98,19 +153,10 @@ st.markdown("---")
 # =========================================================
 st.subheader("🔧 Equipment Status Distribution")
 
-eq_df = pd.read_sql(
-    "SELECT Status, COUNT(*) AS Count FROM Equipment GROUP BY Status",
-    conn
-)
+eq_df = load_chart_data(queries.EQUIPMENT_STATUS_COUNTS)
 
 if not eq_df.empty:
-    fig = px.pie(
-        eq_df,
-        names="Status",
-        values="Count",
-        title="Equipment Condition Overview",
-        template="plotly_dark"
-    )
+    fig = charts.cached_figure("equipment_status", eq_df, equipment_pie)
     st.plotly_chart(fig, use_container_width=True)
 else:
     st.info("No equipment available to display.")
@@ -118,29 +164,53 @@ else:
 st.markdown("---")
 
 
+# =========================================================
+# EQUIPMENT DEPENDENCIES (what an outage takes down)
+# =========================================================
+st.subheader("🔗 Blocked Activities")
+
+graph = equipment_graph.get_graph()
+blocked = graph.blocked_now()
+
+if blocked:
+    st.warning(f"{len(blocked):,} activities need equipment that is down, "
+               f"or that depends on equipment that is down.")
+    st.dataframe(
+        [{"ActivityID": act, "Unusable equipment": ", ".join(str(e) for e in sorted(eqs))}
+         for act, eqs in sorted(blocked.items())[:MAX_BLOCKED_ROWS]],
+        use_container_width=True,
+    )
+else:
+    st.success("Every activity's equipment is usable.")
+
+with st.expander("🔎 Impact of an outage"):
+    impact_eq = pickers.entity_picker("equipment", "Equipment", key="impact_equipment")
+    if impact_eq is not None:
+        impacted = graph.impacted(impact_eq)
+        impacted_acts = graph.blocked_activities(impact_eq)
+        st.write(f"Taking equipment #{impact_eq} out of service also takes down **{len(impacted):,}** "
+                 f"dependent item(s) and blocks **{len(impacted_acts):,}** activity(ies).")
+        if impacted:
+            st.caption("Dependent equipment: " + ", ".join(f"#{e}" for e in sorted(impacted)[:MAX_BLOCKED_ROWS]))
+        if impacted_acts:
+            st.caption("Blocked activities: " + ", ".join(f"#{a}" for a in sorted(impacted_acts)[:MAX_BLOCKED_ROWS]))
+
+st.markdown("---")
+
+
 # =========================================================
 # PARTICIPANTS PER ACTIVITY
 # =========================================================
 st.subheader("🧍 Participants per Activity")
 
-act_df = pd.read_sql("""
-    SELECT a.ActivityName, COUNT(r.ParticipantID) AS ParticipantCount
-    FROM Activity a
-    LEFT JOIN Registers r ON a.ActivityID = r.ActivityID
-    GROUP BY a.ActivityID, a.ActivityName;
-""", conn)
+act_df = load_chart_data(queries.PARTICIPANTS_PER_ACTIVITY)
 
 if not act_df.empty:
-    fig = px.bar(
-        act_df,
-        x="ActivityName",
-        y="ParticipantCount",
-        template="plotly_dark",
-        title="Participant Distribution Across Activities",
-        text="ParticipantCount"
-    )
-    fig.update_traces(textposition="outside")
+    top_df = charts.top_n(act_df, "ActivityName", "ParticipantCount", other="Other activities")
+    fig = charts.cached_figure("participants_per_activity", top_df, activity_bar)
     st.plotly_chart(fig, use_container_width=True)
+    if len(top_df) < len(act_df):
+        st.caption(f"Showing the busiest {len(top_df) - 1} of {len(act_df):,} activities.")
 else:
     st.info("No participants registered yet.")
 
@@ -157,23 +227,13 @@ colA, colB = st.columns(2)
 # Recent Injuries
 with colA:
     st.markdown("### 🩹 Latest Injuries")
-    inj_recent = pd.read_sql("""
-        SELECT ParticipantID, ActivityID, InjuryName, Severity, InjuryDate
-        FROM Injury
-        ORDER BY InjuryDate DESC
-        LIMIT 5;
-    """, conn)
+    inj_recent = load_recent(queries.LATEST_INJURIES_SINCE, queries.LATEST_INJURIES)
     st.dataframe(inj_recent, use_container_width=True)
 
 # Recent Maintenance Logs
 with colB:
     st.markdown("### 🛠 Recent Maintenance Logs")
-    maint_recent = pd.read_sql("""
-        SELECT EquipmentID, MaintDate, Technician, Cost
-        FROM MaintenanceLog
-        ORDER BY MaintDate DESC
-        LIMIT 5;
-    """, conn)
+    maint_recent = load_recent(queries.RECENT_MAINTENANCE_SINCE, queries.RECENT_MAINTENANCE)
     st.dataframe(maint_recent, use_container_width=True)
 
 st.markdown("---")
@@ -1,51 +1,43 @@
 import streamlit as st
-import pandas as pd
-import mysql.connector
 import datetime
 import config
+from adventureguard import db
+from adventureguard import bulk_import
+from adventureguard import equipment_graph
+from adventureguard import layout
+from adventureguard import pickers
+from adventureguard import schedule
+from adventureguard import write_queue
 
 # ------------------------------------------------------
 # PAGE CONFIG
 # ------------------------------------------------------
-st.set_page_config(page_title="Add Data", page_icon="➕", layout="wide")
+layout.setup("Add Data", "➕")
 
 # ------------------------------------------------------
 # DB CONNECTION
 # ------------------------------------------------------
-def get_db_connection():
-    try:
-        conn = mysql.connector.connect(
-            host=config.DB_HOST,
-            user=config.DB_USER,
-            password=config.DB_PASSWORD,
-            database=config.DB_NAME,
-            port=config.DB_PORT
-        )
-        return conn
-    except mysql.connector.Error as err:
-        st.error(f"Database connection failed: {err}")
-        return None
-
-conn = get_db_connection()
-if not conn:
-    st.stop()
+db.ensure_connection()
 
 
 # Helper functions
-def execute_query(sql, params=None):
-    try:
-        cur = conn.cursor()
-        cur.execute(sql, params)
-        conn.commit()
-        cur.close()
+def execute_query(sql, params=None, message="✅ Saved."):
+    """
+    Insert one row and show ``message``; False if the database rejected it.
+    With ``config.WRITE_BEHIND`` the row is only queued: the acknowledgement
+    is immediate and a rejection is reported later by ``write_queue.outcomes``.
+    """
+    if config.WRITE_BEHIND:
+        ticket = write_queue.submit(sql, params, message)
+        st.info(f"⏳ Queued as #{ticket}; it will be committed within a moment.")
         return True
-    except mysql.connector.Error as e:
+    try:
+        db.execute(sql, params)
+    except db.Error as e:
         st.error(f"Error: {e}")
         return False
-
-
-def get_table(sql):
-    return pd.read_sql(sql, conn)
+    st.success(message)
+    return True
 
 
 # ======================================================
@@ -53,6 +45,8 @@ def get_table(sql):
 # ======================================================
 st.title("➕ Add Data")
 st.caption("Use this panel to insert Participants, Activities, Instructors, Injuries, Equipment, and Maintenance Logs.")
+if config.WRITE_BEHIND:
+    write_queue.outcomes()
 st.write("---")
 
 
@@ -73,13 +67,10 @@ with st.form("add_participant_form"):
         if len(p_contact) != 10 or len(p_emg_contact) != 10:
             st.error("❌ Contact numbers must be 10 digits.")
         else:
-            success = execute_query("""
+            execute_query("""
                 INSERT INTO Participant (Name, DOB, ContactNumber, EmergencyContactName, EmergencyContactNumber)
                 VALUES (%s, %s, %s, %s, %s)
-            """, (p_name, p_dob, p_contact, p_emg_name, p_emg_contact))
-
-            if success:
-                st.success("✅ Participant added successfully!")
+            """, (p_name, p_dob, p_contact, p_emg_name, p_emg_contact), "✅ Participant added successfully!")
 
 st.write("---")
 
@@ -100,13 +91,10 @@ with st.form("add_instructor_form"):
         if len(i_contact) != 10:
             st.error("❌ Contact number must be 10 digits.")
         else:
-            success = execute_query("""
+            execute_query("""
                 INSERT INTO Instructor (Name, ContactNumber, ExperienceYears, Expertise)
                 VALUES (%s, %s, %s, %s)
-            """, (i_name, i_contact, i_exp, i_expertise))
-
-            if success:
-                st.success("✅ Instructor added successfully!")
+            """, (i_name, i_contact, i_exp, i_expertise), "✅ Instructor added successfully!")
 
 st.write("---")
 
@@ -116,7 +104,7 @@ st.write("---")
 # ======================================================
 st.header("🧗 Add Activity")
 
-instructors = get_table("SELECT InstructorID, Name FROM Instructor")
+inst_id = pickers.entity_picker("instructor", "Assign Instructor", key="activity_instructor")
 
 with st.form("add_activity_form"):
     a_name = st.text_input("Activity Name")
@@ -137,20 +125,42 @@ with st.form("add_activity_form"):
     a_end = datetime.datetime.combine(end_date, end_time)
 
     a_fees = st.number_input("Fees (₹)", min_value=0.0)
-    a_inst = st.selectbox("Assign Instructor", instructors["Name"])
 
     submitted = st.form_submit_button("Add Activity")
 
-    if submitted:
-        inst_id = int(instructors[instructors["Name"] == a_inst]["InstructorID"].values[0])
-
-        success = execute_query("""
-            INSERT INTO Activity (ActivityName, ActivityType, StartDate, EndDate, Fees, InstructorID)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (a_name, a_type, a_start, a_end, a_fees, inst_id))
+    if submitted and inst_id is None:
+        st.error("❌ Pick an instructor first.")
+    elif submitted and a_end <= a_start:
+        st.error("❌ End time must be after the start time.")
+    elif submitted:
+        # Fast pre-check against the in-memory timelines; the V007 triggers
+        # still guard against a booking made concurrently
+        bookings = schedule.get_index()
+        clashes = bookings.conflicts(a_start, a_end, instructor=inst_id)
+        if clashes:
+            st.error("❌ The instructor is already booked in this window:\n\n" +
+                     "\n".join(f"- {schedule.describe(bookings, c)}" for c in clashes))
+        else:
+            execute_query("""
+                INSERT INTO Activity (ActivityName, ActivityType, StartDate, EndDate, Fees, InstructorID)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, (a_name, a_type, a_start, a_end, a_fees, inst_id), "✅ Activity added successfully!")
 
-        if success:
-            st.success("✅ Activity added successfully!")
+with st.expander("🗓 Find scheduling conflicts in a season"):
+    col1, col2 = st.columns(2)
+    season_start = col1.date_input("From", value=datetime.date.today().replace(month=1, day=1), key="season_start")
+    season_end = col2.date_input("Until (inclusive)", value=datetime.date.today().replace(month=12, day=31),
+                                 key="season_end")
+    if st.button("Scan for conflicts"):
+        bookings = schedule.get_index()
+        # all_conflicts takes an exclusive end; include the whole last day
+        found = bookings.all_conflicts(season_start, season_end + datetime.timedelta(days=1))
+        if found:
+            st.warning(f"{len(found):,} double booking(s) found:")
+            for conflict in found:
+                st.write(f"- {schedule.describe(bookings, conflict)}")
+        else:
+            st.success("No instructor or equipment is double-booked in this season.")
 
 st.write("---")
 
@@ -160,32 +170,21 @@ st.write("---")
 # ======================================================
 st.header("🛠 Add Equipment")
 
-equipment_list = get_table("SELECT EquipmentID, EquipmentType FROM Equipment")
+dep_id = pickers.entity_picker("equipment", "Depends on Equipment (optional)", key="equipment_depends",
+                               optional=True)
 
 with st.form("add_equipment_form"):
     e_type = st.text_input("Equipment Type")
     e_status = st.selectbox("Status", ["Working", "Under Maintenance", "Broken"])
     e_warranty = st.date_input("Warranty Expiry")
 
-    e_depends = st.selectbox(
-        "Depends on Equipment (optional)",
-        ["None"] + equipment_list["EquipmentType"].tolist()
-    )
-
     submitted = st.form_submit_button("Add Equipment")
 
     if submitted:
-        dep_id = None
-        if e_depends != "None":
-            dep_id = int(equipment_list[equipment_list["EquipmentType"] == e_depends]["EquipmentID"].values[0])
-
-        success = execute_query("""
+        execute_query("""
             INSERT INTO Equipment (EquipmentType, Status, WarrantyExpiry, DependsOnEquipmentID)
             VALUES (%s, %s, %s, %s)
-        """, (e_type, e_status, e_warranty, dep_id))
-
-        if success:
-            st.success("✅ Equipment added successfully!")
+        """, (e_type, e_status, e_warranty, dep_id), "✅ Equipment added successfully!")
 
 st.write("---")
 
@@ -195,10 +194,9 @@ st.write("---")
 # ======================================================
 st.header("🛠 Add Maintenance Log")
 
-equipment_list = get_table("SELECT EquipmentID, EquipmentType FROM Equipment")
+eq_id = pickers.entity_picker("equipment", "Equipment", key="maintenance_equipment")
 
 with st.form("add_maintenance_form"):
-    m_eq = st.selectbox("Equipment", equipment_list["EquipmentType"])
     m_date = st.date_input("Maintenance Date")
     m_desc = st.text_area("Description")
     m_tech = st.text_input("Technician Name")
@@ -206,16 +204,21 @@ with st.form("add_maintenance_form"):
 
     submitted = st.form_submit_button("Add Maintenance Log")
 
-    if submitted:
-        eq_id = int(equipment_list[equipment_list["EquipmentType"] == m_eq]["EquipmentID"].values[0])
-
+    if submitted and eq_id is None:
+        st.error("❌ Pick the equipment first.")
+    elif submitted:
         success = execute_query("""
             INSERT INTO MaintenanceLog (EquipmentID, MaintDate, Description, Technician, Cost)
             VALUES (%s, %s, %s, %s, %s)
-        """, (eq_id, m_date, m_desc, m_tech, m_cost))
+        """, (eq_id, m_date, m_desc, m_tech, m_cost),
+            "✅ Maintenance log added successfully! Trigger will update equipment status.")
 
         if success:
-            st.success("✅ Maintenance log added successfully! Trigger will update equipment status.")
+            graph = equipment_graph.get_graph()
+            impacted, blocked = graph.impacted(eq_id), graph.blocked_activities(eq_id)
+            if impacted or blocked:
+                st.warning(f"⚠️ While it is under maintenance, {len(impacted):,} dependent equipment item(s) "
+                           f"and {len(blocked):,} activity(ies) are affected.")
 
 st.write("---")
 
@@ -225,13 +228,13 @@ st.write("---")
 # ======================================================
 st.header("🩹 Add Injury")
 
-participants = get_table("SELECT ParticipantID, Name FROM Participant")
-activities = get_table("SELECT ActivityID, ActivityName FROM Activity")
+col1, col2 = st.columns(2)
+with col1:
+    pid = pickers.entity_picker("participant", "Participant", key="injury_participant")
+with col2:
+    aid = pickers.entity_picker("activity", "Activity", key="injury_activity")
 
 with st.form("add_injury_form"):
-    p_select = st.selectbox("Participant", participants["Name"])
-    a_select = st.selectbox("Activity", activities["ActivityName"])
-
     injury_name = st.text_input("Injury Name")
     injury_date = st.date_input("Injury Date")
     severity = st.selectbox("Severity", ["Low", "Medium", "High", "Critical"])
@@ -239,17 +242,56 @@ with st.form("add_injury_form"):
 
     submitted = st.form_submit_button("Add Injury")
 
-    if submitted:
-        pid = int(participants[participants["Name"] == p_select]["ParticipantID"].values[0])
-        aid = int(activities[activities["ActivityName"] == a_select]["ActivityID"].values[0])
-
-        success = execute_query("""
+    if submitted and (pid is None or aid is None):
+        st.error("❌ Pick both a participant and an activity first.")
+    elif submitted:
+        execute_query("""
             INSERT INTO Injury (ParticipantID, ActivityID, InjuryName, InjuryDate, Severity, Treatment)
             VALUES (%s, %s, %s, %s, %s, %s)
-        """, (pid, aid, injury_name, injury_date, severity, treatment))
+        """, (pid, aid, injury_name, injury_date, severity, treatment),
+            "✅ Injury added successfully! (Triggers validated the entry)")
 
-        if success:
-            st.success("✅ Injury added successfully! (Triggers validated the entry)")
+st.write("---")
+
+
+# ======================================================
+# BULK IMPORT — CSV / Parquet
+# ======================================================
+st.header("📥 Bulk Import")
+st.caption("Upload a CSV or Parquet file whose header matches the table's columns. "
+           "Rows are validated with the same rules as the forms and triggers, then inserted in batches.")
+
+b_table = st.selectbox("Table", list(bulk_import.TABLE_SPECS))
+st.caption("Columns: " + ", ".join(bulk_import.TABLE_SPECS[b_table]["columns"]))
+
+with st.form("bulk_import_form"):
+    b_file = st.file_uploader("Data file", type=["csv", "parquet"])
+    b_batch = st.select_slider("Rows per transaction", options=[100, 500, 1000, 5000], value=1000)
+
+    submitted = st.form_submit_button("Import")
+
+    if submitted:
+        if b_file is None:
+            st.error("❌ Please choose a file to import.")
+        else:
+            fmt = "parquet" if b_file.name.lower().endswith(".parquet") else "csv"
+            status = st.empty()
+
+            def show_progress(seen, inserted):
+                status.info(f"⏳ Processed {seen:,} rows — inserted {inserted:,}")
+
+            try:
+                report = bulk_import.import_file(
+                    b_table, b_file, fmt, batch_size=b_batch, progress=show_progress
+                )
+            except Exception as e:
+                st.error(f"Error: {e}")
+            else:
+                status.empty()
+                st.success(f"✅ Inserted {report.inserted:,} rows into {b_table}.")
+                if not report.rejects.empty:
+                    st.warning(f"⚠️ {len(report.rejects):,} rows were rejected.")
+                    st.dataframe(report.rejects, use_container_width=True)
 
 st.write("---")
 st.success("All forms loaded successfully. Add your data now!")
@@ -1,45 +1,27 @@
 import streamlit as st
-import pandas as pd
-import mysql.connector
-import config
+from adventureguard import db
+from adventureguard import export
+from adventureguard import layout
+from adventureguard import table_browser
 
 # -------------------------------------------
 #  STREAMLIT PAGE CONFIG
 # -------------------------------------------
-st.set_page_config(page_title="View Tables", layout="wide")
+layout.setup("View Tables")
 
 st.title("📄 View Database Tables")
 
 # -------------------------------------------
 #  CONNECT TO DATABASE
 # -------------------------------------------
-def get_db_connection():
-    try:
-        conn = mysql.connector.connect(
-            host=config.DB_HOST,
-            user=config.DB_USER,
-            password=config.DB_PASSWORD,
-            database=config.DB_NAME,
-            port=config.DB_PORT
-        )
-        return conn
-    except mysql.connector.Error as err:
-        st.error(f"Database connection failed: {err}")
-        return None
-
-
-conn = get_db_connection()
+db.ensure_connection()
 
 
 # -------------------------------------------
 #  FETCH TABLE NAMES
 # -------------------------------------------
 def get_tables():
-    cursor = conn.cursor()
-    cursor.execute("SHOW TABLES")
-    tables = [table[0] for table in cursor.fetchall()]
-    cursor.close()
-    return tables
+    return db.list_tables()
 
 
 tables = get_tables()
@@ -47,19 +29,50 @@ tables = get_tables()
 selected_table = st.selectbox("Select a table to view:", tables)
 
 # -------------------------------------------
-#  FETCH AND DISPLAY DATA FROM SELECTED TABLE
+#  BROWSE OPTIONS (pushed down to SQL)
+# -------------------------------------------
+columns = table_browser.get_columns(selected_table)
+
+with st.expander("🔎 Columns, Filter & Sort"):
+    shown_cols = st.multiselect("Columns", columns, default=columns)
+
+    f1, f2, f3 = st.columns([2, 1, 2])
+    filter_col = f1.selectbox("Filter column", ["(none)"] + columns)
+    filter_op = f2.selectbox("Operator", list(table_browser.FILTER_OPS))
+    filter_val = f3.text_input("Value")
+
+    s1, s2, s3 = st.columns([2, 1, 1])
+    sort_col = s1.selectbox("Sort by", ["(primary key)"] + columns)
+    descending = s2.checkbox("Descending")
+    page_size = s3.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+
+filters = []
+if filter_col != "(none)" and (filter_val or filter_op == "is empty"):
+    filters.append((filter_col, filter_op, filter_val))
+sort = None if sort_col == "(primary key)" else sort_col
+
+# Cursor stack: one "after" key per page visited; reset when the view changes
+view = (selected_table, tuple(shown_cols), tuple(filters), sort, descending, page_size)
+if st.session_state.get("browse_view") != view:
+    st.session_state.browse_view = view
+    st.session_state.browse_cursors = [None]
+cursors = st.session_state.browse_cursors
+
+# -------------------------------------------
+#  FETCH AND DISPLAY ONE PAGE OF THE SELECTED TABLE
 # -------------------------------------------
-def fetch_table_data(table_name):
+def fetch_table_page(table_name, after):
     try:
-        query = f"SELECT * FROM {table_name};"
-        df = pd.read_sql(query, conn)
-        return df
+        return table_browser.fetch_page(
+            table_name, shown_cols, filters, sort, descending,
+            after=after, page_size=page_size,
+        )
     except Exception as e:
         st.error(f"Error reading table '{table_name}': {e}")
-        return None
+        return None, None
 
 
-df = fetch_table_data(selected_table)
+df, next_cursor = fetch_table_page(selected_table, cursors[-1])
 
 if df is not None:
     st.subheader(f"🗂️ Showing data from: **{selected_table}**")
@@ -69,3 +82,31 @@ if df is not None:
     else:
         st.dataframe(df, use_container_width=True)
 
+    try:
+        approx = table_browser.approx_row_count(selected_table, filters)
+        st.caption(f"Page {len(cursors)} · ~{approx:,} rows (estimate)")
+    except Exception:
+        st.caption(f"Page {len(cursors)}")
+
+    b1, b2, b3 = st.columns(3)
+    if b1.button("⏮ First", disabled=len(cursors) == 1):
+        st.session_state.browse_cursors = [None]
+        st.rerun()
+    if b2.button("◀ Previous", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if b3.button("Next ▶", disabled=next_cursor is None):
+        cursors.append(next_cursor)
+        st.rerun()
+
+# -------------------------------------------
+#  EXPORT (whole filtered table, streamed)
+# -------------------------------------------
+with st.expander("⬇️ Export this table"):
+    st.caption("Exports every row matching the filter above (not just this page), "
+               "streamed from the database in chunks.")
+    try:
+        export_sql, export_params = table_browser.select_sql(selected_table, shown_cols, filters)
+        export.export_section(selected_table, export_sql, export_params, key=f"export_{selected_table}")
+    except ValueError as e:
+        st.error(str(e))
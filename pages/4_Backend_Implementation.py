@@ -1,13 +1,14 @@
 import streamlit as st
-import mysql.connector
-import config
 import textwrap
+from adventureguard import db
+from adventureguard import layout
+from adventureguard import schema_meta
 
 
 # ======================================================
 # PAGE CONFIG
 # ======================================================
-st.set_page_config(page_title="Backend Implementation", page_icon="⚙️", layout="wide")
+layout.setup("Backend Implementation", "⚙️")
 
 st.title("⚙️ Backend Implementation (SQL)")
 st.write("""
@@ -21,25 +22,7 @@ st.write("---")
 # ======================================================
 # DATABASE CONNECTION
 # ======================================================
-def get_db_connection():
-    try:
-        conn = mysql.connector.connect(
-            host=config.DB_HOST,
-            user=config.DB_USER,
-            password=config.DB_PASSWORD,
-            database=config.DB_NAME,
-            port=config.DB_PORT,
-            autocommit=False
-        )
-        return conn
-    except mysql.connector.Error as err:
-        st.error(f"Database connection failed: {err}")
-        return None
-
-
-conn = get_db_connection()
-if not conn:
-    st.stop()
+db.ensure_connection()
 
 
 # ======================================================
@@ -49,6 +32,16 @@ def short_explanation(name, obj_type):
     name_low = name.lower()
 
     if obj_type == "TRIGGER":
+        if name_low.startswith("trg_agg_"):
+            return "Keeps a running SUM/COUNT summary table in step with its base table."
+        if name_low.startswith("trg_search_"):
+            return "Keeps the global search index in step with its table."
+        if "window" in name_low or "booking" in name_low:
+            return "Rejects invalid activity windows and double-booked instructors or equipment."
+        if "cycle" in name_low:
+            return "Rejects equipment dependencies that would form a loop."
+        if "_refs_" in name_low or "restrict" in name_low:
+            return "Enforces a foreign-key rule the partitioned event tables cannot declare."
         if "equip" in name_low:
             return "Keeps equipment status synced with maintenance logs."
         if "participant" in name_low or "total" in name_low:
@@ -60,6 +53,12 @@ def short_explanation(name, obj_type):
         return "Trigger enforcing important safety/business rules."
 
     if obj_type == "PROCEDURE":
+        if "window" in name_low or "booking" in name_low:
+            return "Checks an activity or equipment booking against overlapping windows."
+        if "dependency" in name_low:
+            return "Walks the equipment dependency chain and rejects cycles."
+        if "aggregate" in name_low:
+            return "Reports drift in the summary tables and optionally rebuilds them."
         if "report" in name_low:
             return "Generates activity reports for admin use."
         if "add" in name_low:
@@ -86,65 +85,36 @@ def short_explanation(name, obj_type):
     return ""
 
 
+# ======================================================
+# LOAD METADATA (cached until the schema changes)
+# ======================================================
+try:
+    meta = schema_meta.get_schema_meta(refresh=st.session_state.pop("refresh_meta", False))
+except Exception as e:
+    st.error(f"Error loading schema metadata: {e}")
+    st.stop()
+
+
 # ======================================================
 # PRIMARY & FOREIGN KEYS + ENUMS
 # ======================================================
 st.header("🔐 Constraints & Integrity Rules")
 
 with st.expander("📌 Primary Keys & Foreign Keys"):
-    try:
-        cur = conn.cursor(dictionary=True)
-
-        # Primary keys
-        cur.execute("""
-            SELECT TABLE_NAME, GROUP_CONCAT(COLUMN_NAME) AS cols
-            FROM information_schema.KEY_COLUMN_USAGE
-            WHERE TABLE_SCHEMA=%s AND CONSTRAINT_NAME='PRIMARY'
-            GROUP BY TABLE_NAME;
-        """, (config.DB_NAME,))
-        pks = cur.fetchall()
-
-        st.subheader("Primary Keys")
-        for row in pks:
-            st.markdown(f"**{row['TABLE_NAME']}** → `{row['cols']}`")
+    st.subheader("Primary Keys")
+    for table, cols in meta.primary_keys.items():
+        st.markdown(f"**{table}** → `{','.join(cols)}`")
 
-        st.write("")
+    st.write("")
 
-        # Foreign keys
-        st.subheader("Foreign Keys")
-        cur.execute("""
-            SELECT TABLE_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
-            FROM information_schema.KEY_COLUMN_USAGE
-            WHERE TABLE_SCHEMA=%s AND REFERENCED_TABLE_NAME IS NOT NULL;
-        """, (config.DB_NAME,))
-        fks = cur.fetchall()
-
-        for fk in fks:
-            st.markdown(
-                f"**{fk['TABLE_NAME']}.{fk['COLUMN_NAME']}** → "
-                f"{fk['REFERENCED_TABLE_NAME']}.{fk['REFERENCED_COLUMN_NAME']}"
-            )
-
-        cur.close()
-
-    except Exception as e:
-        st.error(f"Error loading constraints: {e}")
+    st.subheader("Foreign Keys")
+    for table, column, ref_table, ref_column in meta.foreign_keys:
+        st.markdown(f"**{table}.{column}** → {ref_table}.{ref_column}")
 
 
 with st.expander("📌 ENUM Fields / Domain Constraints"):
-    try:
-        cur = conn.cursor(dictionary=True)
-        cur.execute("""
-            SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE
-            FROM information_schema.COLUMNS
-            WHERE TABLE_SCHEMA=%s AND COLUMN_TYPE LIKE 'enum(%%)';
-        """, (config.DB_NAME,))
-        enums = cur.fetchall()
-        for en in enums:
-            st.markdown(f"**{en['TABLE_NAME']}.{en['COLUMN_NAME']}** — `{en['COLUMN_TYPE']}`")
-        cur.close()
-    except Exception as e:
-        st.error(f"Error loading enums: {e}")
+    for table, column, column_type in meta.enums:
+        st.markdown(f"**{table}.{column}** — `{column_type}`")
 
 st.write("---")
 
@@ -154,31 +124,16 @@ st.write("---")
 # ======================================================
 st.header("🧨 Triggers (Live from DB)")
 
-try:
-    cur = conn.cursor(dictionary=True)
-    cur.execute(f"SHOW TRIGGERS FROM `{config.DB_NAME}`;")
-    triggers = cur.fetchall()
-    cur.close()
-
-    if triggers:
-        for trg in triggers:
-            name = trg["Trigger"]
-            timing = trg["Timing"]
-            event = trg["Event"]
-            tbl = trg["Table"]
-            sql_stmt = trg["Statement"]
-
-            explanation = short_explanation(name, "TRIGGER")
-
-            with st.expander(f"🔁 {name} — {timing} {event} ON {tbl}"):
-                if explanation:
-                    st.write(explanation)
-                st.code(textwrap.dedent(sql_stmt).strip(), language="sql")
-    else:
-        st.info("No triggers found.")
+if meta.triggers:
+    for trg in meta.triggers:
+        explanation = short_explanation(trg["name"], "TRIGGER")
 
-except Exception as e:
-    st.error(f"Error fetching triggers: {e}")
+        with st.expander(f"🔁 {trg['name']} — {trg['timing']} {trg['event']} ON {trg['table']}"):
+            if explanation:
+                st.write(explanation)
+            st.code(textwrap.dedent(trg["statement"]).strip(), language="sql")
+else:
+    st.info("No triggers found.")
 
 st.write("---")
 
@@ -188,41 +143,16 @@ st.write("---")
 # ======================================================
 st.header("📜 Stored Procedures (Live from DB)")
 
-try:
-    cur = conn.cursor(dictionary=True)
-    cur.execute("""
-        SELECT ROUTINE_NAME FROM information_schema.ROUTINES
-        WHERE ROUTINE_SCHEMA=%s AND ROUTINE_TYPE='PROCEDURE'
-        ORDER BY ROUTINE_NAME;
-    """, (config.DB_NAME,))
-    procedures = cur.fetchall()
-    cur.close()
-
-    if procedures:
-        for proc in procedures:
-            name = proc["ROUTINE_NAME"]
-
-            try:
-                c = conn.cursor()
-                c.execute(f"SHOW CREATE PROCEDURE `{config.DB_NAME}`.`{name}`;")
-                res = c.fetchone()
-                sql_text = res[2]
-                c.close()
-            except:
-                sql_text = "-- Could not load procedure"
-
-            explanation = short_explanation(name, "PROCEDURE")
-
-            with st.expander(f"🛠 PROCEDURE — {name}"):
-                if explanation:
-                    st.write(explanation)
-                st.code(textwrap.dedent(sql_text).strip(), language="sql")
-
-    else:
-        st.info("No stored procedures found.")
+if meta.procedures:
+    for name, sql_text in meta.procedures.items():
+        explanation = short_explanation(name, "PROCEDURE")
 
-except Exception as e:
-    st.error(f"Error loading procedures: {e}")
+        with st.expander(f"🛠 PROCEDURE — {name}"):
+            if explanation:
+                st.write(explanation)
+            st.code(textwrap.dedent(sql_text).strip(), language="sql")
+else:
+    st.info("No stored procedures found.")
 
 st.write("---")
 
@@ -232,41 +162,16 @@ st.write("---")
 # ======================================================
 st.header("🧮 SQL Functions (Live from DB)")
 
-try:
-    cur = conn.cursor(dictionary=True)
-    cur.execute("""
-        SELECT ROUTINE_NAME FROM information_schema.ROUTINES
-        WHERE ROUTINE_SCHEMA=%s AND ROUTINE_TYPE='FUNCTION'
-        ORDER BY ROUTINE_NAME;
-    """, (config.DB_NAME,))
-    functions = cur.fetchall()
-    cur.close()
-
-    if functions:
-        for fn in functions:
-            name = fn["ROUTINE_NAME"]
-
-            try:
-                c = conn.cursor()
-                c.execute(f"SHOW CREATE FUNCTION `{config.DB_NAME}`.`{name}`;")
-                res = c.fetchone()
-                sql_text = res[2]
-                c.close()
-            except:
-                sql_text = "-- Could not load function"
-
-            explanation = short_explanation(name, "FUNCTION")
-
-            with st.expander(f"📐 FUNCTION — {name}"):
-                if explanation:
-                    st.write(explanation)
-                st.code(textwrap.dedent(sql_text).strip(), language="sql")
-
-    else:
-        st.info("No SQL functions found.")
+if meta.functions:
+    for name, sql_text in meta.functions.items():
+        explanation = short_explanation(name, "FUNCTION")
 
-except Exception as e:
-    st.error(f"Error loading functions: {e}")
+        with st.expander(f"📐 FUNCTION — {name}"):
+            if explanation:
+                st.write(explanation)
+            st.code(textwrap.dedent(sql_text).strip(), language="sql")
+else:
+    st.info("No SQL functions found.")
 
 st.write("---")
 
@@ -280,21 +185,16 @@ col1, col2 = st.columns(2)
 
 with col1:
     if st.button("Show Tables"):
-        cur = conn.cursor()
-        cur.execute("SHOW TABLES;")
-        rows = cur.fetchall()
-        cur.close()
-        st.write(rows)
+        st.write(db.list_tables())
 
 with col2:
     if st.button("Count Triggers & Routines"):
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA=%s", (config.DB_NAME,))
-        tcount = c.fetchone()[0]
-        c.execute("SELECT COUNT(*) FROM information_schema.ROUTINES WHERE ROUTINE_SCHEMA=%s", (config.DB_NAME,))
-        rcount = c.fetchone()[0]
-        c.close()
-        st.write(f"Triggers: {tcount}, Procedures/Functions: {rcount}")
+        st.write(f"Triggers: {len(meta.triggers)}, "
+                 f"Procedures/Functions: {len(meta.procedures) + len(meta.functions)}")
+
+if st.button("🔄 Reload metadata"):
+    st.session_state["refresh_meta"] = True
+    st.rerun()
 
 
 st.success("Backend implementation loaded successfully.")
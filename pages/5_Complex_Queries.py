@@ -1,12 +1,17 @@
 import streamlit as st
-import pandas as pd
-import mysql.connector
 import config
+from adventureguard import db
+from adventureguard import export
+from adventureguard import layout
+from adventureguard import mirror
+from adventureguard import queries
+from adventureguard import report_refresh
+from adventureguard import report_runner
 
 # --------------------------------------------
 # PAGE CONFIG
 # --------------------------------------------
-st.set_page_config(page_title="Complex SQL Queries", page_icon="🧠", layout="wide")
+layout.setup("Complex SQL Queries", "🧠", name="Complex Queries")
 
 st.title("🧠 Complex SQL Queries (Advanced Reports)")
 st.caption("This page demonstrates complex SQL operations such as nested queries, aggregation, grouping, and multi-table joins.")
@@ -16,151 +21,115 @@ st.write("---")
 # --------------------------------------------
 # DB CONNECTION
 # --------------------------------------------
-def get_db_connection():
-    try:
-        conn = mysql.connector.connect(
-            host=config.DB_HOST,
-            user=config.DB_USER,
-            password=config.DB_PASSWORD,
-            database=config.DB_NAME,
-            port=config.DB_PORT
-        )
-        return conn
-    except:
-        st.error("Database connection failed.")
-        return None
-
-conn = get_db_connection()
-if not conn:
-    st.stop()
+db.ensure_connection()
 
 def run_query(sql):
     try:
-        df = pd.read_sql(sql, conn)
+        if engine is not None:
+            return engine(sql)
+        df = db.read_sql(report_runner.with_timeout(sql))
         return df
     except Exception as e:
         st.error(f"Query Error: {e}")
         return None
 
 
-# ================================================
-# QUERY 1 — Top Activities by Paid Participants
-# ================================================
-with st.expander("📌 Query 1: Top Activities by Paid Participants (GROUP BY + HAVING)"):
-    st.write("This query lists activities with more than **2 paid participants**, using grouping + filtering.")
-
-    query1 = """
-    SELECT a.ActivityName, COUNT(r.ParticipantID) AS PaidCount
-    FROM Activity a
-    JOIN Registers r ON a.ActivityID = r.ActivityID
-    WHERE r.PaymentStatus = 'Yes'
-    GROUP BY a.ActivityName
-    HAVING COUNT(r.ParticipantID) > 2
-    ORDER BY PaidCount DESC;
-    """
-
-    st.code(query1, language="sql")
-
-    if st.button("Run Query 1"):
-        df = run_query(query1)
-        if df is not None:
-            st.dataframe(df, use_container_width=True)
+def show_outcome(slot, run, report):
+    outcome = run.outcome(report.key)
+    with slot.container():
+        if outcome is None:
+            st.info("⏳ Running..." if run.running(report.key) else "🕒 Queued...")
+        elif outcome.status == "done":
+            st.caption(f"{len(outcome.frame):,} rows in {outcome.ms:,.0f} ms")
+            st.dataframe(outcome.frame, use_container_width=True)
+        elif outcome.status == "cancelled":
+            st.warning("Cancelled.")
+        elif outcome.status == "timed out":
+            st.warning(f"Timed out after {config.REPORT_TIMEOUT_MS / 1000:g} s.")
+        else:
+            st.error(f"Query Error: {outcome.error}")
 
 
 # ================================================
-# QUERY 2 — Most Injury-Prone Participants
+# SOURCE: base tables, materialized reports or mirror
 # ================================================
-with st.expander("📌 Query 2: Most Injury-Prone Participants (Nested Query + Count)"):
-    st.write("Shows participants with more injuries than the **average injury count**.")
-
-    query2 = """
-    SELECT p.Name, COUNT(i.InjuryName) AS InjuryCount
-    FROM Participant p
-    JOIN Injury i ON p.ParticipantID = i.ParticipantID
-    GROUP BY p.Name
-    HAVING InjuryCount > (
-        SELECT AVG(cnt)
-        FROM (
-            SELECT COUNT(*) AS cnt
-            FROM Injury
-            GROUP BY ParticipantID
-        ) AS injury_stats
-    );
-    """
-
-    st.code(query2, language="sql")
-
-    if st.button("Run Query 2"):
-        df = run_query(query2)
-        if df is not None:
-            st.dataframe(df, use_container_width=True)
+LIVE, MATERIALIZED, MIRROR = "Live tables", "Materialized reports", "Analytics mirror (DuckDB)"
+
+sources = [LIVE, MATERIALIZED] + ([MIRROR] if mirror.available() else [])
+source = st.radio("Data source", sources, horizontal=True,
+                  help="Materialized reports are refreshed incrementally from the change journal; "
+                       "the analytics mirror is a local Parquet copy queried in-process.")
+reports = queries.REPORTS
+engine = None
+if source == MIRROR:
+    st.caption(f"Analytics mirror {mirror.freshness()}.")
+    engine = mirror.runner()
+elif source == MATERIALIZED:
+    try:
+        result = report_refresh.refresh_now()
+        state = report_refresh.current_status()
+        st.caption(f"Applied {result.entries:,} journal entries. "
+                   f"Last refresh: {state.refreshed_at}; {state.pending:,} change(s) still pending.")
+        reports = [r._replace(sql=r.materialized_sql) for r in queries.REPORTS]
+    except Exception as e:
+        st.warning(f"Materialized reports unavailable ({e}); reading the base tables instead.")
+
+st.write("---")
 
 
 # ================================================
-# QUERY 3 — Equipment with Highest Maintenance Cost
+# RUN ALL (concurrently, results stream in)
 # ================================================
-with st.expander("📌 Query 3: Highest Maintenance Cost Equipment (Aggregation + Join)"):
-    st.write("Finds equipment items with total maintenance cost > 500.")
-
-    query3 = """
-    SELECT e.EquipmentType, SUM(m.Cost) AS TotalCost
-    FROM Equipment e
-    JOIN MaintenanceLog m ON e.EquipmentID = m.EquipmentID
-    GROUP BY e.EquipmentType
-    HAVING TotalCost > 500
-    ORDER BY TotalCost DESC;
-    """
+st.header("⚡ Run All Reports")
+st.caption(f"Runs every report at once, each on its own connection and limited to "
+           f"{config.REPORT_TIMEOUT_MS / 1000:g} s. Results appear as each query finishes.")
+
+if st.button("▶️ Run All"):
+    st.session_state["report_run"] = report_runner.start_run(reports, source=engine).id
+
+run = report_runner.get_run(st.session_state.get("report_run"))
+if run is not None:
+    slots = {}
+    for report in run.reports:
+        col1, col2 = st.columns([6, 1])
+        with col1:
+            st.markdown(f"**{report.title}**")
+            slots[report.key] = st.empty()
+        with col2:
+            # A click reruns the page; the run itself lives on in report_runner
+            if st.button("✖ Cancel", key=f"cancel_{run.id}_{report.key}"):
+                run.cancel(report.key)
+
+    shown = set()
+    while True:
+        for report in run.reports:
+            if report.key not in shown:
+                show_outcome(slots[report.key], run, report)
+                if run.outcome(report.key) is not None:
+                    shown.add(report.key)
+        if len(shown) == len(run.reports):
+            break
+        run.wait(timeout=0.5)
 
-    st.code(query3, language="sql")
-
-    if st.button("Run Query 3"):
-        df = run_query(query3)
-        if df is not None:
-            st.dataframe(df, use_container_width=True)
+st.write("---")
 
 
 # ================================================
-# QUERY 4 — Instructor Ratings Summary
+# QUERIES 1–5 (defined in adventureguard/queries.py)
 # ================================================
-with st.expander("📌 Query 4: Instructor Rating Summary (AVG + JOIN + Grouping)"):
-    st.write("Shows instructors with average rating ≥ 4.")
+for n, report in enumerate(reports, start=1):
+    with st.expander(report.title):
+        st.write(report.description)
 
-    query4 = """
-    SELECT i.Name AS Instructor, ROUND(AVG(r.RatingValue), 2) AS AvgRating
-    FROM Instructor i
-    JOIN Rating r ON i.InstructorID = r.InstructorID
-    GROUP BY i.Name
-    HAVING AvgRating >= 4
-    ORDER BY AvgRating DESC;
-    """
+        st.code(report.sql, language="sql")
 
-    st.code(query4, language="sql")
+        if st.button(f"Run Query {n}"):
+            df = run_query(report.sql)
+            if df is not None:
+                st.dataframe(df, use_container_width=True)
 
-    if st.button("Run Query 4"):
-        df = run_query(query4)
-        if df is not None:
-            st.dataframe(df, use_container_width=True)
-
-
-# ================================================
-# QUERY 5 — Activities without Any Injuries
-# ================================================
-with st.expander("📌 Query 5: Activities with Zero Injuries (LEFT JOIN + NULL CHECK)"):
-    st.write("Shows safe activities with **no injuries recorded**.")
-
-    query5 = """
-    SELECT a.ActivityName
-    FROM Activity a
-    LEFT JOIN Injury i ON a.ActivityID = i.ActivityID
-    WHERE i.InjuryName IS NULL;
-    """
-
-    st.code(query5, language="sql")
-
-    if st.button("Run Query 5"):
-        df = run_query(query5)
-        if df is not None:
-            st.dataframe(df, use_container_width=True)
+        # Exports always read the database (live or materialized), never the mirror
+        export.export_section(report.key, report.sql, key=f"export_{report.key}")
 
 
 st.write("---")
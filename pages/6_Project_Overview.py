@@ -1,6 +1,7 @@
 import streamlit as st
+from adventureguard import layout
 
-st.set_page_config(page_title="Project Overview", page_icon="📘", layout="wide")
+layout.setup("Project Overview", "📘")
 
 st.title("📘 Project Overview – AdventureGuard DBMS")
 st.write("""
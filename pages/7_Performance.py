@@ -0,0 +1,134 @@
+import streamlit as st
+from adventureguard import db
+from adventureguard import layout
+from adventureguard.lazy import lazy_import
+
+pd = lazy_import("pandas")
+px = lazy_import("plotly.express")
+
+# =========================================================
+# PAGE SETTINGS
+# =========================================================
+layout.setup("Performance", "⏱️")
+
+st.title("⏱️ Query Performance")
+st.write("Every query issued by the app is timed. This page shows the most recent "
+         "records from the in-memory query log (shared by all sessions).")
+st.markdown("---")
+
+
+# =========================================================
+# LOAD RECORDS
+# =========================================================
+log = db.get_query_log()
+records = pd.DataFrame(log.records())
+
+col1, col2 = st.columns([3, 1])
+with col2:
+    if st.button("🧹 Clear log"):
+        log.clear()
+        st.rerun()
+
+if records.empty:
+    st.info("No queries recorded yet. Open a few pages and come back.")
+    st.stop()
+
+records["time"] = pd.to_datetime(records["ts"], unit="s")
+with col1:
+    pages = st.multiselect("Pages", sorted(records["page"].unique()), default=sorted(records["page"].unique()))
+records = records[records["page"].isin(pages)]
+
+
+# =========================================================
+# SUMMARY METRICS
+# =========================================================
+m1, m2, m3, m4, m5 = st.columns(5)
+m1.metric("Queries", f"{len(records):,}")
+m2.metric("Total time (ms)", f"{records['ms'].sum():,.1f}")
+m3.metric("p95 (ms)", f"{records['ms'].quantile(0.95):,.2f}" if len(records) else "0")
+cached = records[records["cache"] != "off"]
+m4.metric("Cache hit rate", f"{(cached['cache'] == 'hit').mean():.0%}" if len(cached) else "—")
+m5.metric("Errors", int(records["error"].notna().sum()))
+
+st.markdown("---")
+
+
+# =========================================================
+# SLOWEST QUERIES
+# =========================================================
+st.subheader("🐢 Slowest Queries")
+
+slowest = records.sort_values("ms", ascending=False).head(20)
+st.dataframe(
+    slowest[["time", "page", "kind", "ms", "rows", "bytes", "cache", "sql", "error"]],
+    use_container_width=True,
+)
+
+st.markdown("---")
+
+
+# =========================================================
+# PER-PAGE TOTALS
+# =========================================================
+st.subheader("📄 Per-Page Totals")
+
+per_page = records.groupby("page").agg(
+    Queries=("ms", "size"),
+    TotalMs=("ms", "sum"),
+    MeanMs=("ms", "mean"),
+    MaxMs=("ms", "max"),
+    Rows=("rows", "sum"),
+    CacheHits=("cache", lambda c: int((c == "hit").sum())),
+    Errors=("error", lambda e: int(e.notna().sum())),
+).sort_values("TotalMs", ascending=False).reset_index()
+
+st.dataframe(per_page.round(2), use_container_width=True)
+
+fig = px.bar(
+    per_page,
+    x="page",
+    y="TotalMs",
+    template="plotly_dark",
+    title="Total Query Time per Page (ms)",
+    text="Queries"
+)
+st.plotly_chart(fig, use_container_width=True)
+
+st.markdown("---")
+
+
+# =========================================================
+# PER-STATEMENT TOTALS
+# =========================================================
+st.subheader("🧾 Per-Statement Totals")
+
+per_sql = records.groupby("sql").agg(
+    Calls=("ms", "size"),
+    TotalMs=("ms", "sum"),
+    MeanMs=("ms", "mean"),
+    P95Ms=("ms", lambda s: s.quantile(0.95)),
+).sort_values("TotalMs", ascending=False).reset_index()
+
+st.dataframe(per_sql.round(2), use_container_width=True)
+
+st.markdown("---")
+
+
+# =========================================================
+# LATENCY HISTOGRAM
+# =========================================================
+st.subheader("📊 Latency Distribution")
+
+fig = px.histogram(
+    records,
+    x="ms",
+    color="page",
+    nbins=50,
+    log_y=True,
+    template="plotly_dark",
+    title="Query Latency (ms)"
+)
+st.plotly_chart(fig, use_container_width=True)
+
+st.markdown("---")
+st.success("Performance data loaded successfully!")
@@ -0,0 +1,50 @@
+import time
+
+import streamlit as st
+import config
+from adventureguard import db
+from adventureguard import layout
+from adventureguard import search
+
+# --------------------------------------------
+# PAGE CONFIG
+# --------------------------------------------
+layout.setup("Search", "🔍")
+
+st.title("🔍 Search")
+st.caption("Participants (name, phone, emergency contact), instructors (name, expertise), "
+           "injuries (name, treatment) and maintenance notes (description, technician).")
+
+db.ensure_connection()
+
+# --------------------------------------------
+# SEARCH BOX
+# --------------------------------------------
+col1, col2 = st.columns([3, 2])
+text = col1.text_input("Search", placeholder="Name, phone number, injury, technician...")
+kinds = col2.multiselect("Only", list(search.KINDS), placeholder="All types")
+
+if text:
+    if not search.terms(text):
+        st.info(f"Type at least one word of {config.SEARCH_MIN_TERM}+ characters.")
+        st.stop()
+
+    start = time.perf_counter()
+    try:
+        hits = search.search(text, kinds)
+    except db.Error as e:
+        st.error(f"Search failed: {e}")
+        st.stop()
+    ms = (time.perf_counter() - start) * 1000
+
+    if not hits:
+        st.warning("No matches.")
+    else:
+        st.caption(f"{len(hits)} hit(s) in {ms:,.0f} ms")
+        for hit in hits:
+            st.markdown(f"{search.ICONS[hit.kind]} **{hit.title or '(no name)'}** · {hit.kind} #{hit.entity_id}")
+            if hit.kind == "Participant":
+                # The incident case: the emergency contact, right in the hit
+                st.markdown(f"🚑 {hit.detail}")
+            else:
+                st.caption(" · ".join(part for part in (hit.detail, hit.snippet) if part))
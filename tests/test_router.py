@@ -0,0 +1,146 @@
+"""
+Unit tests for read-replica routing (``adventureguard.router`` and
+``db.read_route``). No database is needed: the lag probe and the pools are
+injected.
+
+    python -m unittest discover tests
+
+``ReadYourWritesTest`` imports ``adventureguard.db``. While ``config.py``
+still holds its DB_* placeholders (it fails to import), an in-process
+stand-in is installed as ``config`` first; no database is connected to.
+"""
+
+import sys
+import time
+import types
+import unittest
+from unittest import mock
+
+from adventureguard.router import ReplicaRouter
+
+
+class FakeProbe:
+    """``probe(index)`` returning scripted lags; an Exception value is raised."""
+
+    def __init__(self, lags):
+        self.lags = dict(lags)
+        self.calls = []
+
+    def __call__(self, index):
+        self.calls.append(index)
+        lag = self.lags[index]
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+
+class ReplicaRouterTest(unittest.TestCase):
+    def test_round_robin_over_healthy_replicas(self):
+        router = ReplicaRouter(3, FakeProbe({0: 0, 1: 1, 2: 2}), max_lag=5, interval=60)
+        self.assertEqual([router.choose() for _ in range(6)], [0, 1, 2, 0, 1, 2])
+
+    def test_lagging_replicas_fall_back_to_primary(self):
+        router = ReplicaRouter(2, FakeProbe({0: 30, 1: 6}), max_lag=5, interval=60)
+        self.assertIsNone(router.choose())
+        self.assertEqual(router.status(), {0: (False, 30), 1: (False, 6)})
+
+    def test_lag_at_the_limit_is_still_healthy(self):
+        router = ReplicaRouter(1, FakeProbe({0: 5}), max_lag=5, interval=60)
+        self.assertEqual(router.choose(), 0)
+
+    def test_unhealthy_replicas_are_skipped(self):
+        probe = FakeProbe({0: ConnectionError("down"), 1: 0, 2: None})    # None = not replicating
+        router = ReplicaRouter(3, probe, max_lag=5, interval=60)
+        self.assertEqual({router.choose() for _ in range(5)}, {1})
+        self.assertEqual(router.status(), {0: (False, None), 1: (True, 0), 2: (False, None)})
+
+    def test_no_replicas(self):
+        router = ReplicaRouter(0, FakeProbe({}))
+        self.assertIsNone(router.choose())
+
+    def test_health_is_cached_for_the_interval(self):
+        probe = FakeProbe({0: 0})
+        router = ReplicaRouter(1, probe, max_lag=5, interval=60)
+        for _ in range(3):
+            router.choose()
+        self.assertEqual(probe.calls, [0])
+
+    def test_stale_health_is_reprobed(self):
+        probe = FakeProbe({0: 0})
+        router = ReplicaRouter(1, probe, max_lag=5, interval=60)
+        self.assertEqual(router.choose(), 0)
+        probe.lags[0] = 30
+        with mock.patch("adventureguard.router.time.monotonic", return_value=time.monotonic() + 61):
+            self.assertIsNone(router.choose())
+        self.assertEqual(probe.calls, [0, 0])
+
+    def test_mark_down_until_next_check(self):
+        router = ReplicaRouter(2, FakeProbe({0: 0, 1: 0}), max_lag=5, interval=60)
+        router.choose()
+        router.mark_down(0)
+        self.assertEqual({router.choose() for _ in range(4)}, {1})
+        with mock.patch("adventureguard.router.time.monotonic", return_value=time.monotonic() + 61):
+            self.assertEqual({router.choose() for _ in range(4)}, {0, 1})
+
+
+def import_db():
+    """``adventureguard.db``, importing it against a stand-in ``config`` if need be."""
+    try:
+        import config  # noqa: F401
+    except NameError:                   # DB_PORT = DB_PORT placeholder
+        sys.modules["config"] = types.SimpleNamespace(
+            DB_ENGINE="mysql", DB_HOST="primary", DB_USER="", DB_PASSWORD="", DB_NAME="", DB_PORT=3306,
+            DB_POOL_NAME="test", DB_POOL_SIZE=1, DB_POOL_TIMEOUT=0,
+            DB_REPLICAS=[], REPLICA_MAX_LAG=5, REPLICA_HEALTH_INTERVAL=60, READ_YOUR_WRITES_WINDOW=60,
+            SQLITE_PATH=":memory:", SQLITE_SAMPLE_DATA=False,
+        )
+    from adventureguard import db
+    return db
+
+
+class ReadYourWritesTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_db()
+
+    def setUp(self):
+        db = self.db
+        self.router = ReplicaRouter(2, FakeProbe({0: 0, 1: 0}), max_lag=5, interval=60)
+        for patch in (
+            mock.patch.object(db.config, "DB_ENGINE", "mysql"),
+            mock.patch.object(db.config, "DB_REPLICAS", [{}, {}]),
+            mock.patch.object(db.config, "READ_YOUR_WRITES_WINDOW", 60),
+            mock.patch.object(db, "get_pool", lambda: "primary"),
+            mock.patch.object(db, "get_replica_pool", lambda index: f"replica{index}"),
+            mock.patch.object(db, "get_router", lambda: self.router),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+        db.st.session_state.pop(db._STICKY_KEY, None)
+        self.addCleanup(db.st.session_state.pop, db._STICKY_KEY, None)
+
+    def test_reads_go_to_a_replica(self):
+        route = self.db.read_route()
+        self.assertEqual(route.pool, "replica0")
+        self.assertEqual(route.replica, 0)
+
+    def test_reads_after_a_write_are_pinned_to_the_primary(self):
+        self.db.mark_written()
+        self.assertTrue(self.db.reads_pinned())
+        route = self.db.read_route()
+        self.assertEqual(route.pool, "primary")
+        self.assertIsNone(route.replica)
+
+    def test_pin_expires_after_the_window(self):
+        self.db.mark_written()
+        with mock.patch("adventureguard.db.time.monotonic", return_value=time.monotonic() + 61):
+            self.assertFalse(self.db.reads_pinned())
+            self.assertEqual(self.db.read_route().pool, "replica0")
+
+    def test_all_replicas_lagging_falls_back_to_primary(self):
+        self.router.probe.lags.update({0: 30, 1: 30})
+        self.assertEqual(self.db.read_route().pool, "primary")
+
+
+if __name__ == "__main__":
+    unittest.main()